@@ -0,0 +1,204 @@
+"""
+Periodic background autosaving.
+
+A snapshot of the scene is taken on the GUI thread (cheap, as NodeGraphScene.toDict only re-serializes nodes that have
+changed), then encoded, compressed and written on a worker thread. Files are written to a temporary file and renamed
+into place, so an autosave is never left half written, and previous autosaves are kept as numbered copies.
+"""
+
+import concurrent.futures
+import logging
+import os
+import shutil
+import typing
+
+from PySide6 import QtCore, QtGui
+
+from radium.serialization import binary
+
+if typing.TYPE_CHECKING:
+    from radium.nodegraph.graph.scene import NodeGraphScene
+    from radium.model.graph import SceneDataDict
+
+logger = logging.getLogger(__name__)
+
+
+def rotate_copies(path: str, copies: int):
+    """
+    Shift path.1 -> path.2 ... keeping at most the given number of previous copies, then make path.1 a copy of path.
+    path itself is left in place, so a crash part way through never leaves it missing.
+    """
+    if copies <= 0:
+        return
+
+    for index in range(copies - 1, 0, -1):
+        source = f"{path}.{index}"
+        if os.path.exists(source):
+            os.replace(source, f"{path}.{index + 1}")
+
+    if os.path.exists(path):
+        link_or_copy(path, f"{path}.1")
+
+
+def link_or_copy(source: str, destination: str):
+    """
+    Replace destination with a hard link to source, or a copy where hard links aren't supported.
+    """
+    temp_path = f"{destination}.tmp"
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+
+    try:
+        os.link(source, temp_path)
+    except OSError:
+        shutil.copy2(source, temp_path)
+
+    os.replace(temp_path, destination)
+
+
+def write_atomic(path: str, data: "SceneDataDict", copies: int = 3):
+    """
+    Encode the data and write it to path via a temporary file and a rename.
+
+    The previous file is linked into the numbered copies before the new one is renamed over it, so path always holds
+    a complete autosave.
+    """
+    encoded = binary.dumps(data, compress=True)
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(encoded)
+        f.flush()
+        os.fsync(f.fileno())
+
+    rotate_copies(path, copies)
+    os.replace(temp_path, path)
+
+
+class AutosaveService(QtCore.QObject):
+    """
+    Autosaves a scene in the background.
+
+    A save is scheduled whenever the undo stack's index changes, and at most one save happens per interval. If a
+    write is still in flight when the interval elapses, the save is postponed until it completes.
+    """
+
+    saved = QtCore.Signal(str)
+    failed = QtCore.Signal(str)
+
+    # emitted from the worker thread, delivered on the GUI thread.
+    _writeFinished = QtCore.Signal(str, str)
+
+    def __init__(
+        self,
+        scene: "NodeGraphScene",
+        undo_stack: QtGui.QUndoStack,
+        interval: int = 30000,
+        copies: int = 3,
+        parent=None,
+    ):
+        super().__init__(parent=parent)
+        self.scene = scene
+        self.undo_stack = undo_stack
+        self.copies = copies
+
+        self.__path: typing.Optional[str] = None
+        self.__enabled = True
+        self.__pending = False
+        self.__writing = False
+
+        self.__executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="radium-autosave"
+        )
+
+        self.__timer = QtCore.QTimer(self)
+        self.__timer.setSingleShot(True)
+        self.__timer.setInterval(interval)
+        self.__timer.timeout.connect(self.__onTimeout)
+
+        self._writeFinished.connect(self.__onWriteFinished)
+        self.undo_stack.indexChanged.connect(self.__onIndexChanged)
+
+    def path(self) -> typing.Optional[str]:
+        return self.__path
+
+    def setPath(self, path: typing.Optional[str]):
+        self.__path = path
+
+    def interval(self) -> int:
+        return self.__timer.interval()
+
+    def setInterval(self, interval: int):
+        self.__timer.setInterval(interval)
+
+    def isEnabled(self) -> bool:
+        return self.__enabled
+
+    def setEnabled(self, enabled: bool):
+        self.__enabled = enabled
+        if not enabled:
+            self.__timer.stop()
+        elif self.__pending:
+            self.__timer.start()
+
+    def isWriting(self) -> bool:
+        return self.__writing
+
+    def saveNow(self):
+        """
+        Snapshot the scene and write it in the background, unless a write is already in flight.
+        """
+        if self.__path is None or self.__writing:
+            return
+
+        self.__pending = False
+        self.__writing = True
+
+        data = self.scene.toDict()
+        self.__executor.submit(self.__write, self.__path, data)
+
+    def shutdown(self):
+        """
+        Wait for any in flight write to complete.
+        """
+        self.__timer.stop()
+        self.__executor.shutdown(wait=True)
+
+    def __write(self, path: str, data: "SceneDataDict"):
+        # any failure is reported back to the GUI thread rather than being lost in the worker.
+        try:
+            write_atomic(path, data, copies=self.copies)
+        except Exception as e:  # noqa
+            logger.exception("autosave failed")
+            self._writeFinished.emit(path, str(e))
+        else:
+            self._writeFinished.emit(path, "")
+
+    @QtCore.Slot(int)
+    def __onIndexChanged(self, _):
+        self.__pending = True
+        if self.__enabled and not self.__timer.isActive():
+            self.__timer.start()
+
+    @QtCore.Slot()
+    def __onTimeout(self):
+        if self.__writing:
+            return  # rescheduled once the write completes.
+
+        self.saveNow()
+
+    @QtCore.Slot(str, str)
+    def __onWriteFinished(self, path: str, error: str):
+        self.__writing = False
+
+        if error:
+            self.failed.emit(error)
+        else:
+            self.saved.emit(path)
+
+        if self.__pending and self.__enabled and not self.__timer.isActive():
+            self.__timer.start()
@@ -0,0 +1,44 @@
+"""
+Compute callables for the demo's example nodes.
+"""
+
+from PySide6 import QtCore, QtGui
+
+from radium.evaluation import CookContext
+
+
+def constant(context: CookContext):
+    width = context.parameters["width"]
+    height = context.parameters["height"]
+
+    image = QtGui.QImage(width, height, QtGui.QImage.Format.Format_ARGB32)
+    image.fill(QtGui.QColor(*context.parameters["color"]))
+    return {"image": image}
+
+
+def load_image(context: CookContext):
+    filename = context.parameters["filename"]
+    if not filename:
+        return {"image": None}
+
+    image = QtGui.QImage(filename)
+    if image.isNull():
+        raise ValueError(f"unable to read image: {filename}")
+
+    return {"image": image}
+
+
+def merge(context: CookContext):
+    image_a = context.inputs["image_a"]
+    image_b = context.inputs["image_b"]
+
+    if image_a is None or image_b is None:
+        return {"image": image_a if image_b is None else image_b}
+
+    result = image_a.copy()
+    painter = QtGui.QPainter(result)
+    painter.setOpacity(context.parameters["blend"])
+    painter.drawImage(QtCore.QPoint(0, 0), image_b)
+    painter.end()
+
+    return {"image": result}
@@ -8,10 +8,19 @@ from PySide6 import QtWidgets, QtGui, QtCore
 
 from radium.nodegraph.graph import NodeGraphController
 from radium.nodegraph.graph.view import NodeGraphView
+from radium.nodegraph.graph.scene import Node
+from radium.nodegraph.graph.scene.commands import BudgetedUndoStack
 from radium.nodegraph.browser import NodeBrowserView
 from radium.nodegraph.factory import prototypes
 from radium.nodegraph.factory import NodeFactory
 from radium.nodegraph.parameters import ParameterEditorController, ParameterEditorView
+from radium.nodegraph.evaluation import EvaluationEngine
+from radium.demo import compute
+from radium.demo.loader import SceneFileLoader
+from radium.demo.autosave import AutosaveService
+from radium.model.io import write_scene_data
+
+FILE_FILTER = "Radium Graph (*.radium);;JSON Graph (*.json)"
 
 
 class MainController(QtCore.QObject):
@@ -24,7 +33,7 @@ class MainController(QtCore.QObject):
         super().__init__()
         self.__dirty = False
         self.settings = QtCore.QSettings("radium", "nodegraph.demo")
-        self.undo_stack = QtGui.QUndoStack()
+        self.undo_stack = BudgetedUndoStack()
         self.node_factory = NodeFactory()
 
         self.node_graph_view = NodeGraphView()
@@ -49,6 +58,39 @@ class MainController(QtCore.QObject):
         self.main_window = QtWidgets.QMainWindow()
         self.main_window.setCentralWidget(self.central_widget)
 
+        self.scene_loader = SceneFileLoader(
+            self.node_graph_controller.scene, self.node_factory, parent=self
+        )
+        self.scene_loader.progressChanged.connect(self.onLoadProgressChanged)
+        self.scene_loader.finished.connect(self.onLoadFinished)
+        self.scene_loader.failed.connect(self.onLoadFailed)
+        self.scene_loader.cancelled.connect(self.onLoadCancelled)
+
+        self.load_progress_bar = QtWidgets.QProgressBar()
+        self.load_progress_bar.setMaximumWidth(300)
+        self.load_cancel_button = QtWidgets.QPushButton("Cancel")
+        self.load_cancel_button.clicked.connect(self.scene_loader.cancel)
+        self.main_window.statusBar().addPermanentWidget(self.load_progress_bar)
+        self.main_window.statusBar().addPermanentWidget(self.load_cancel_button)
+        self.load_progress_bar.hide()
+        self.load_cancel_button.hide()
+
+        self.evaluation_engine = EvaluationEngine(
+            self.node_graph_controller.scene, self.node_factory, parent=self
+        )
+        self.evaluation_engine.nodeEvaluated.connect(self.onNodeEvaluated)
+        self.evaluation_engine.evaluationFailed.connect(self.onEvaluationFailed)
+        QtWidgets.QApplication.instance().aboutToQuit.connect(
+            self.evaluation_engine.shutdown
+        )
+
+        self.autosave = AutosaveService(
+            self.node_graph_controller.scene, self.undo_stack, parent=self
+        )
+        self.autosave.saved.connect(self.onAutosaved)
+        self.autosave.failed.connect(self.onAutosaveFailed)
+        QtWidgets.QApplication.instance().aboutToQuit.connect(self.autosave.shutdown)
+
         self.file_menu = self.main_window.menuBar().addMenu("&File")
         self.edit_menu = self.main_window.menuBar().addMenu("&Edit")
 
@@ -62,6 +104,7 @@ class MainController(QtCore.QObject):
 
         self.initMenuBar()
         self.initNodes()
+        self.updateAutosavePath()
 
         self.undo_stack.cleanChanged.connect(self.updateWindowTitle)
         self.node_graph_controller.scene.parameterChanged.connect(
@@ -69,6 +112,8 @@ class MainController(QtCore.QObject):
         )
 
         self.node_graph_controller.scene.nodeEdited.connect(self.onNodeEdited)
+        self.node_graph_controller.scene.itemRemoved.connect(self.onItemRemoved)
+        self.node_graph_controller.scene.itemsRemoved.connect(self.onItemsRemoved)
         self.node_graph_controller.scene.nodeSelected.connect(self.onNodeSelected)
 
     def onParameterChanged(self, node, parameter, previous, value):
@@ -77,12 +122,38 @@ class MainController(QtCore.QObject):
     def onNodeSelected(self, node):
         pass
 
+    def onNodeEvaluated(self, node, outputs):
+        image = outputs.get("image")
+        if image is None:
+            message = f"{node.name()}: no image"
+        else:
+            message = f"{node.name()}: {image.width()}x{image.height()} image"
+
+        timings = self.evaluation_engine.timings()
+        if timings:
+            total = sum(timings.values()) * 1000
+            message += f" (cooked {len(timings)} nodes in {total:.1f}ms)"
+
+        self.main_window.statusBar().showMessage(message, 5000)
+
+    def onEvaluationFailed(self, node, message):
+        self.main_window.statusBar().showMessage(f"Evaluation failed: {message}", 5000)
+
     def onNodeEdited(self, node):
         if node.isEdited():
             self.parameter_editor_controller.addNode(node)
         else:
             self.parameter_editor_controller.removeNode(node)
 
+    def onItemRemoved(self, item):
+        # removed nodes are rebuilt by undo, so the editor must not keep showing the old node's parameters.
+        if isinstance(item, Node):
+            self.parameter_editor_controller.removeNode(item)
+
+    def onItemsRemoved(self, items):
+        for item in items:
+            self.onItemRemoved(item)
+
     def initNodes(self):
         """
         Register some basic example nodes. Nodes prototypes must be registered
@@ -112,6 +183,7 @@ class MainController(QtCore.QObject):
                         datatype="float",
                     )
                 },
+                compute=compute.merge,
             )
         )
         self.node_factory.registerNodeType(
@@ -140,6 +212,7 @@ class MainController(QtCore.QObject):
                     ),
                 },
                 icon="fa.image",
+                compute=compute.constant,
             )
         )
 
@@ -159,6 +232,7 @@ class MainController(QtCore.QObject):
                         ),
                     )
                 },
+                compute=compute.load_image,
             )
         )
 
@@ -250,6 +324,9 @@ class MainController(QtCore.QObject):
         """
         When the reset action has triggered reset the graph.
         """
+        if self.scene_loader.isRunning():
+            self.scene_loader.cancel()
+
         if not self.undo_stack.isClean():
             reply = QtWidgets.QMessageBox.question(
                 self.main_window,
@@ -265,6 +342,7 @@ class MainController(QtCore.QObject):
         self.node_graph_controller.scene.clear()
         self.undo_stack.clear()
         self.updateWindowTitle()
+        self.updateAutosavePath()
         return True
 
     @QtCore.Slot()
@@ -279,7 +357,7 @@ class MainController(QtCore.QObject):
             self.__current_filename, _ = QtWidgets.QFileDialog.getOpenFileName(
                 self.main_window,
                 "Open File",
-                filter="*.json file(*.json)",
+                filter="Graph Files (*.radium *.json);;" + FILE_FILTER,
                 dir=str(self.settings.value("last_open_directory", os.getcwd())),
             )
         else:
@@ -292,13 +370,76 @@ class MainController(QtCore.QObject):
             "last_open_directory", os.path.dirname(self.__current_filename)
         )
 
-        with open(self.__current_filename, "r") as f:
-            data = json.load(f)
+        self.node_graph_view.setEnabled(False)
+        self.autosave.setEnabled(False)
+        self.scene_loader.load(self.__current_filename)
+
+    @QtCore.Slot(int, int)
+    def onLoadProgressChanged(self, current: int, total: int):
+        """
+        Show the progress of the file being loaded in the status bar.
+        """
+        self.load_progress_bar.setRange(0, total)
+        self.load_progress_bar.setValue(current)
+        self.load_progress_bar.show()
+        self.load_cancel_button.show()
+        self.main_window.statusBar().showMessage(
+            f"Loading: {os.path.basename(self.__current_filename)}"
+        )
+
+    def __endLoad(self, message: str = ""):
+        self.load_progress_bar.hide()
+        self.load_cancel_button.hide()
+        self.node_graph_view.setEnabled(True)
+        self.autosave.setEnabled(True)
+        self.main_window.statusBar().showMessage(message, 5000)
 
+    @QtCore.Slot()
+    def onLoadFinished(self):
+        self.__endLoad(f"Loaded: {os.path.basename(self.__current_filename)}")
         self.__storeRecentFile(self.__current_filename)
+        self.updateWindowTitle()
+        self.updateAutosavePath()
+
+    @QtCore.Slot(str)
+    def onLoadFailed(self, message: str):
+        self.__endLoad()
+        self.__current_filename = None
+        self.node_graph_controller.scene.clear()
+        self.updateWindowTitle()
+        self.updateAutosavePath()
+        QtWidgets.QMessageBox.warning(self.main_window, "Unable to open file", message)
 
-        self.node_graph_controller.scene.loadDict(data, self.node_factory)
+    @QtCore.Slot()
+    def onLoadCancelled(self):
+        # a partially loaded graph isn't useful, so start again from an empty scene.
+        self.__endLoad("Loading cancelled")
+        self.__current_filename = None
+        self.node_graph_controller.scene.clear()
         self.updateWindowTitle()
+        self.updateAutosavePath()
+
+    def updateAutosavePath(self):
+        """
+        Autosave next to the current file, or into the applications data directory for unsaved files.
+        """
+        if self.__current_filename:
+            path = f"{self.__current_filename}.autosave"
+        else:
+            directory = QtCore.QStandardPaths.writableLocation(
+                QtCore.QStandardPaths.StandardLocation.AppDataLocation
+            )
+            path = os.path.join(directory, "autosave", "untitled.radium")
+
+        self.autosave.setPath(path)
+
+    @QtCore.Slot(str)
+    def onAutosaved(self, path: str):
+        self.main_window.statusBar().showMessage(f"Autosaved: {path}", 3000)
+
+    @QtCore.Slot(str)
+    def onAutosaveFailed(self, message: str):
+        self.main_window.statusBar().showMessage(f"Autosave failed: {message}", 5000)
 
     def updateWindowTitle(self):
         """
@@ -326,7 +467,7 @@ class MainController(QtCore.QObject):
             self.__current_filename, _ = QtWidgets.QFileDialog.getSaveFileName(
                 self.main_window,
                 "Save File",
-                filter="*.json file(*.json)",
+                filter=FILE_FILTER,
                 dir=str(self.settings.value("last_save_directory", os.getcwd())),
             )
 
@@ -338,20 +479,17 @@ class MainController(QtCore.QObject):
             )
 
         data = self.node_graph_controller.scene.toDict()
-        with open(self.__current_filename, "w") as f:
-            json.dump(data, f)
+        write_scene_data(self.__current_filename, data)
 
         self.undo_stack.setClean()
         self.__storeRecentFile(self.__current_filename)
         self.updateWindowTitle()
+        self.updateAutosavePath()
 
     @QtCore.Slot()
     def onDeleteAction(self):
         """
-        When the delete action has triggered delete the currently selected nodes.
+        When the delete action has triggered delete the currently selected items and their connections.
         """
-        selection = self.node_graph_controller.scene.selectedNodes()
-        self.undo_stack.beginMacro("Delete Selected Nodes")
-        for node in selection:
-            self.node_graph_controller.removeItem(node)
-        self.undo_stack.endMacro()
+        selection = self.node_graph_controller.scene.selectedItems()
+        self.node_graph_controller.removeItems(selection)
@@ -0,0 +1,253 @@
+"""
+Progressive loading of graph files.
+
+Files are read, parsed and validated on a worker thread. The scene is then populated on the GUI thread a chunk at a
+time, each chunk limited by a time budget so the event loop keeps running while large graphs open.
+"""
+
+import time
+import typing
+
+from PySide6 import QtCore
+
+from radium.model.io import read_scene_data
+
+if typing.TYPE_CHECKING:
+    from radium.nodegraph.graph.scene import NodeGraphScene
+    from radium.model.graph import SceneDataDict
+    from radium.nodegraph.factory import NodeFactory
+
+NODE_KEYS = (
+    "node_type",
+    "name",
+    "position",
+    "unique_id",
+    "inputs",
+    "outputs",
+    "parameters",
+)
+CONNECTION_KEYS = ("output_node", "output_port", "input_node", "input_port")
+PORT_KEYS = ("datatype", "name")
+PARAMETER_KEYS = ("name", "datatype", "value", "default", "metadata")
+
+
+def _validate_node_data(node_id: str, node_data: typing.Any):
+    if not isinstance(node_data, dict):
+        raise ValueError(f"node: {node_id} must be an object")
+
+    for key in NODE_KEYS:
+        if key not in node_data:
+            raise ValueError(f"node: {node_id} is missing key: {key}")
+
+    for key in ("node_type", "name", "unique_id"):
+        if not isinstance(node_data[key], str):
+            raise ValueError(f"node: {node_id} {key} must be a string")
+
+    position = node_data["position"]
+    if (
+        not isinstance(position, (list, tuple))
+        or len(position) != 2
+        or not all(isinstance(v, (int, float)) for v in position)
+    ):
+        raise ValueError(f"node: {node_id} position must be a pair of numbers")
+
+    for key, entry_keys in (
+        ("inputs", PORT_KEYS),
+        ("outputs", PORT_KEYS),
+        ("parameters", PARAMETER_KEYS),
+    ):
+        entries = node_data[key]
+        if not isinstance(entries, dict):
+            raise ValueError(f"node: {node_id} {key} must be an object")
+
+        for name, entry in entries.items():
+            if not isinstance(entry, dict):
+                raise ValueError(f"node: {node_id} {key}: {name} must be an object")
+
+            for entry_key in entry_keys:
+                if entry_key not in entry:
+                    raise ValueError(
+                        f"node: {node_id} {key}: {name} is missing key: {entry_key}"
+                    )
+
+            if not isinstance(entry["datatype"], str):
+                raise ValueError(
+                    f"node: {node_id} {key}: {name} datatype must be a string"
+                )
+
+        if key == "parameters":
+            for name, entry in entries.items():
+                if not isinstance(entry["metadata"], dict):
+                    raise ValueError(
+                        f"node: {node_id} parameters: {name} metadata must be an object"
+                    )
+
+
+def validate_scene_data(data: typing.Any) -> "SceneDataDict":
+    """
+    Check the structure of loaded scene data, raising a ValueError describing the first problem found.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("expected a json object at the top level")
+
+    nodes = data.get("nodes")
+    connections = data.get("connections")
+
+    if not isinstance(nodes, dict):
+        raise ValueError("'nodes' must be an object")
+
+    if not isinstance(connections, list):
+        raise ValueError("'connections' must be a list")
+
+    for node_id, node_data in nodes.items():
+        _validate_node_data(node_id, node_data)
+
+    for index, connection_data in enumerate(connections):
+        if not isinstance(connection_data, dict):
+            raise ValueError(f"connection: {index} must be an object")
+
+        for key in CONNECTION_KEYS:
+            if key not in connection_data:
+                raise ValueError(f"connection: {index} is missing key: {key}")
+
+        for key in ("output_node", "input_node"):
+            if connection_data[key] not in nodes:
+                raise ValueError(
+                    f"connection: {index} references unknown node: {connection_data[key]}"
+                )
+
+    return data
+
+
+class SceneFileReader(QtCore.QThread):
+    """
+    Reads, parses and validates a graph file off the GUI thread. Both JSON and radium binary files are supported.
+    """
+
+    parsed = QtCore.Signal(object)
+    failed = QtCore.Signal(str)
+
+    def __init__(self, filename: str, parent=None):
+        super().__init__(parent=parent)
+        self.filename = filename
+
+    def run(self):
+        # anything raised here would end the thread without a signal, leaving the loader waiting forever.
+        try:
+            data = validate_scene_data(read_scene_data(self.filename))
+        except Exception as e:
+            self.failed.emit(f"{self.filename}: {e}")
+            return
+
+        self.parsed.emit(data)
+
+
+class SceneFileLoader(QtCore.QObject):
+    """
+    Loads a graph file into a scene without blocking the event loop.
+
+    Parsing happens on a SceneFileReader thread, after which nodes and connections are created in chunks, each chunk
+    running for at most time_budget seconds per event loop iteration.
+    """
+
+    progressChanged = QtCore.Signal(int, int)
+    finished = QtCore.Signal()
+    failed = QtCore.Signal(str)
+    cancelled = QtCore.Signal()
+
+    def __init__(
+        self,
+        scene: "NodeGraphScene",
+        node_factory: "NodeFactory",
+        time_budget: float = 0.010,
+        parent=None,
+    ):
+        super().__init__(parent=parent)
+        self.scene = scene
+        self.node_factory = node_factory
+        self.time_budget = time_budget
+
+        self.__reader: typing.Optional[SceneFileReader] = None
+        self.__loader: typing.Optional[typing.Iterator[int]] = None
+        self.__total = 0
+
+        self.__timer = QtCore.QTimer(self)
+        self.__timer.setInterval(0)
+        self.__timer.timeout.connect(self.__onTimeout)
+
+    def isRunning(self) -> bool:
+        return self.__reader is not None or self.__loader is not None
+
+    def load(self, filename: str):
+        """
+        Begin loading the given file. Progress is reported via progressChanged, followed by one of finished, failed
+        or cancelled.
+        """
+        if self.isRunning():
+            raise RuntimeError("a file is already being loaded")
+
+        # the reader is parented to the loader so that it outlives a cancel while it is still parsing.
+        self.__reader = SceneFileReader(filename, parent=self)
+        self.__reader.parsed.connect(self.__onParsed)
+        self.__reader.failed.connect(self.__onFailed)
+        self.__reader.finished.connect(self.__reader.deleteLater)
+        self.progressChanged.emit(0, 0)
+        self.__reader.start()
+
+    def cancel(self):
+        """
+        Stop loading. Anything already added to the scene is left in place.
+        """
+        if not self.isRunning():
+            return
+
+        self.__reader = None
+        self.__stop()
+        self.cancelled.emit()
+
+    def __stop(self):
+        self.__timer.stop()
+        if self.__loader is not None:
+            self.__loader.close()
+            self.__loader = None
+
+    @QtCore.Slot(object)
+    def __onParsed(self, data: "SceneDataDict"):
+        if self.sender() is not self.__reader:
+            return  # cancelled while parsing
+
+        self.__reader = None
+        self.__total = len(data["nodes"]) + len(data["connections"])
+        self.__loader = self.scene.iterLoadDict(data, self.node_factory)
+        self.progressChanged.emit(0, self.__total)
+        self.__timer.start()
+
+    @QtCore.Slot(str)
+    def __onFailed(self, message: str):
+        if self.sender() is not self.__reader:
+            return
+
+        self.__reader = None
+        self.failed.emit(message)
+
+    @QtCore.Slot()
+    def __onTimeout(self):
+        deadline = time.perf_counter() + self.time_budget
+        count = 0
+
+        try:
+            while time.perf_counter() < deadline:
+                count = next(self.__loader)
+        except StopIteration:
+            self.__loader = None
+            self.__timer.stop()
+            self.progressChanged.emit(self.__total, self.__total)
+            self.finished.emit()
+            return
+        except Exception as e:
+            # closing the generator runs bulkLoad's cleanup, restoring the scene's signals and item index.
+            self.__stop()
+            self.failed.emit(str(e))
+            return
+
+        self.progressChanged.emit(count, self.__total)
@@ -0,0 +1,8 @@
+"""
+Graph evaluation. Like radium.model, nothing in this package may import Qt.
+"""
+
+from .context import *
+from .evaluator import *
+from .scheduler import *
+from .cache import *
@@ -0,0 +1,154 @@
+__all__ = ["ResultCache", "CacheStats", "estimate_size"]
+"""
+A memory bounded cache for node cook results.
+"""
+
+import collections
+import dataclasses
+import sys
+import threading
+import typing
+
+DEFAULT_MAX_BYTES = 1024**3
+
+
+def estimate_size(value: typing.Any) -> int:
+    """
+    Estimate the memory used by a cook result in bytes.
+
+    Arrays report nbytes (numpy) or sizeInBytes (QImage), buffers their length, and containers the sum of their
+    contents. Anything else falls back to sys.getsizeof, which doesn't account for referenced objects.
+    """
+    stack = [value]
+    total = 0
+
+    while stack:
+        current = stack.pop()
+
+        nbytes = getattr(current, "nbytes", None)
+        if isinstance(nbytes, int):
+            total += nbytes
+            continue
+
+        size_in_bytes = getattr(current, "sizeInBytes", None)
+        if callable(size_in_bytes):
+            total += size_in_bytes()
+            continue
+
+        if isinstance(current, (bytes, bytearray, str)):
+            total += len(current)
+        elif isinstance(current, dict):
+            total += sys.getsizeof(current)
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            total += sys.getsizeof(current)
+            stack.extend(current)
+        else:
+            total += sys.getsizeof(current)
+
+    return total
+
+
+@dataclasses.dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size: int
+    max_size: int
+
+
+class ResultCache:
+    """
+    A least recently used cache of node outputs with a limit on the estimated total size of its entries.
+
+    Entries are evicted, oldest first, whenever adding one takes the cache over max_bytes. An entry larger than the
+    whole budget is not stored at all. The cache is safe to use from multiple threads.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.__max_bytes = max_bytes
+        self.__entries: typing.OrderedDict[
+            typing.Hashable, typing.Tuple[typing.Dict[str, typing.Any], int]
+        ] = collections.OrderedDict()
+        self.__size = 0
+        self.__lock = threading.Lock()
+
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+    def maxBytes(self) -> int:
+        return self.__max_bytes
+
+    def setMaxBytes(self, max_bytes: int):
+        with self.__lock:
+            self.__max_bytes = max_bytes
+            self.__evict()
+
+    def size(self) -> int:
+        return self.__size
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __contains__(self, key: typing.Hashable) -> bool:
+        return key in self.__entries
+
+    def get(
+        self, key: typing.Hashable
+    ) -> typing.Optional[typing.Dict[str, typing.Any]]:
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                self.__misses += 1
+                return None
+
+            self.__hits += 1
+            self.__entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: typing.Hashable, outputs: typing.Dict[str, typing.Any]):
+        size = estimate_size(outputs)
+
+        with self.__lock:
+            previous = self.__entries.pop(key, None)
+            if previous is not None:
+                self.__size -= previous[1]
+
+            if size > self.__max_bytes:
+                self.__evictions += 1
+                return
+
+            self.__entries[key] = (outputs, size)
+            self.__size += size
+            self.__evict()
+
+    def discard(self, key: typing.Hashable):
+        with self.__lock:
+            entry = self.__entries.pop(key, None)
+            if entry is not None:
+                self.__size -= entry[1]
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+            self.__size = 0
+
+    def stats(self) -> CacheStats:
+        with self.__lock:
+            return CacheStats(
+                hits=self.__hits,
+                misses=self.__misses,
+                evictions=self.__evictions,
+                entries=len(self.__entries),
+                size=self.__size,
+                max_size=self.__max_bytes,
+            )
+
+    def __evict(self):
+        while self.__size > self.__max_bytes and self.__entries:
+            _, (_, size) = self.__entries.popitem(last=False)
+            self.__size -= size
+            self.__evictions += 1
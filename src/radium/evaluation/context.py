@@ -0,0 +1,51 @@
+__all__ = ["CookContext", "CancellationToken", "EvaluationCancelled"]
+
+import dataclasses
+import threading
+import typing
+
+
+class EvaluationCancelled(Exception):
+    """
+    Raised when an evaluation is stopped because its CancellationToken was cancelled.
+    """
+
+
+class CancellationToken:
+    """
+    Shared between an evaluation and whoever requested it, so that a newer request can stop an older one.
+
+    Cancellation is cooperative: the scheduler checks the token before cooking each node, and long running compute
+    callables should poll isCancelled() or call raiseIfCancelled() between chunks of work.
+    """
+
+    def __init__(self, generation: int = 0):
+        self.generation = generation
+        self.__event = threading.Event()
+
+    def cancel(self):
+        self.__event.set()
+
+    def isCancelled(self) -> bool:
+        return self.__event.is_set()
+
+    def raiseIfCancelled(self):
+        if self.__event.is_set():
+            raise EvaluationCancelled(f"generation {self.generation} was cancelled")
+
+
+@dataclasses.dataclass(frozen=True)
+class CookContext:
+    """
+    Everything a NodeType's compute callable is given to cook a node.
+
+    inputs maps each input name to the value of the output connected to it, or None if it is disconnected.
+    parameters maps each parameter name to its value when the evaluation was requested.
+    """
+
+    node: typing.Any
+    inputs: typing.Dict[str, typing.Any]
+    parameters: typing.Dict[str, typing.Any]
+    cancellation: CancellationToken = dataclasses.field(
+        default_factory=CancellationToken
+    )
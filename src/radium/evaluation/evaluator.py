@@ -0,0 +1,372 @@
+__all__ = ["Evaluator", "Evaluation", "CookStep", "CookError", "encode_value"]
+"""
+Pull based evaluation of a node graph with cached results.
+
+Cooking a node first cooks anything upstream of it whose outputs are not cached. Results are cached under a key
+derived from the node, its parameter values and the keys of its inputs. When something changes only the keys of the
+changed node and the nodes downstream of it are invalidated, so re-cooking after an edit only touches the affected
+path.
+
+The evaluator works with anything shaped like a graph: nodes need nodeType(), inputs(), outputs() and parameters(),
+ports need node(), and the graph needs getConnections(port) returning objects with output_port and input_port. Both
+GraphModel and NodeGraphScene fit.
+"""
+
+import dataclasses
+import hashlib
+import json
+import typing
+
+from radium.evaluation.cache import ResultCache
+from radium.evaluation.context import (
+    CancellationToken,
+    CookContext,
+    EvaluationCancelled,
+)
+from radium.evaluation.scheduler import Scheduler
+
+if typing.TYPE_CHECKING:
+    from radium.model.prototypes import NodeType
+
+NodeOutputs = typing.Dict[str, typing.Any]
+CacheKey = typing.Tuple[str, str]
+
+
+class CookError(Exception):
+    """
+    Raised when a nodes compute callable fails, the original exception is available as __cause__.
+    """
+
+    def __init__(self, node, message: str):
+        super().__init__(message)
+        self.node = node
+
+
+def encode_value(value: typing.Any) -> bytes:
+    """
+    Encode a parameter value for a cache key, completely so that different values never share a key.
+
+    Arrays (numpy) are encoded as their dtype, shape and raw bytes, buffers as their bytes, and anything else as
+    JSON. A TypeError is raised for values which can't be encoded this way.
+    """
+    if isinstance(value, (bytes, bytearray)):
+        return b"b" + bytes(value)
+
+    if isinstance(value, memoryview):
+        header = json.dumps([value.format, value.shape]).encode()
+        return b"m" + _frame(header) + value.tobytes()
+
+    dtype = getattr(value, "dtype", None)
+    if dtype is not None and hasattr(value, "shape") and hasattr(value, "tobytes"):
+        # arrays of python objects hold pointers rather than their values.
+        if getattr(dtype, "hasobject", False):
+            raise TypeError(f"can't encode an array of {dtype} for a cache key")
+
+        header = json.dumps([getattr(dtype, "str", str(dtype)), list(value.shape)])
+        return b"a" + _frame(header.encode()) + value.tobytes()
+
+    try:
+        encoded = json.dumps(value, sort_keys=True, separators=(",", ":"))
+    except (TypeError, ValueError) as e:
+        raise TypeError(
+            f"can't encode a value of type {type(value).__name__} for a cache key"
+        ) from e
+
+    return b"j" + encoded.encode()
+
+
+def _frame(data: bytes) -> bytes:
+    # length prefixed, so consecutive values can't run into each other.
+    return len(data).to_bytes(8, "little") + data
+
+
+class Evaluator:
+    def __init__(
+        self,
+        graph,
+        node_types: typing.Callable[[str], typing.Optional["NodeType"]],
+        scheduler: Scheduler = None,
+        cache: ResultCache = None,
+    ):
+        self.graph = graph
+        self.scheduler = scheduler or Scheduler()
+        self.cache = cache if cache is not None else ResultCache()
+        self.__node_types = node_types
+
+        # how long each node took to cook during the last call to evaluate.
+        self.__timings: typing.Dict[typing.Any, float] = {}
+
+        # each node's cache key. a key is only ever memoized if the keys of everything upstream of it are, so
+        # invalidation can stop descending as soon as it reaches a node without one.
+        self.__keys: typing.Dict[typing.Any, CacheKey] = {}
+
+    def isCached(self, node) -> bool:
+        key = self.__keys.get(node)
+        return key is not None and key in self.cache
+
+    def cachedOutputs(self, node) -> typing.Optional[NodeOutputs]:
+        key = self.__keys.get(node)
+        return None if key is None else self.cache.get(key)
+
+    def invalidate(self, node):
+        """
+        Forget the cache key of the node and everything downstream of it, so they are re-keyed on the next
+        evaluation. Results stored under the old keys stay in the cache, so e.g. undoing a change is a cache hit.
+        """
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if self.__keys.pop(current, None) is None:
+                continue
+
+            stack.extend(self.downstreamNodes(current))
+
+    def invalidateAll(self):
+        self.__keys.clear()
+        self.cache.clear()
+
+    def upstreamPort(self, port):
+        """
+        Return the output port feeding the given input port, or None if it is disconnected.
+        """
+        connections = self.graph.getConnections(port)
+        if not connections:
+            return None
+
+        return connections[0].output_port
+
+    def upstreamNodes(self, node) -> typing.Iterator:
+        for port in node.inputs().values():
+            source = self.upstreamPort(port)
+            if source is not None:
+                yield source.node()
+
+    def downstreamNodes(self, node) -> typing.Iterator:
+        for port in node.outputs().values():
+            for connection in self.graph.getConnections(port):
+                yield connection.input_port.node()
+
+    def key(self, node) -> CacheKey:
+        """
+        Return the nodes cache key: its unique id and a hash of its parameter values and the keys of its inputs.
+
+        Parameter values are encoded by encode_value, which raises TypeError for values it can't encode.
+        """
+        key = self.__keys.get(node)
+        if key is not None:
+            return key
+
+        for current in self.__walkUpstream(node, lambda n: n in self.__keys):
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(current.nodeType().encode())
+
+            for name, parameter in current.parameters().items():
+                digest.update(_frame(name.encode()))
+                digest.update(_frame(encode_value(parameter.value())))
+
+            for name, port in current.inputs().items():
+                source = self.upstreamPort(port)
+                if source is not None:
+                    source_key = self.__keys[source.node()]
+                    digest.update(repr((name, source_key, source.name())).encode())
+
+            self.__keys[current] = (current.uniqueId(), digest.hexdigest())
+
+        return self.__keys[node]
+
+    def plan(self, node) -> typing.List:
+        """
+        Return the nodes that must be cooked to evaluate node, in the order they must be cooked.
+        """
+        return [step.node for step in self.prepare(node).steps]
+
+    def prepare(self, node, token: CancellationToken = None) -> "Evaluation":
+        """
+        Plan the evaluation of node, snapshotting everything needed to cook it.
+
+        This reads the graph, so it must be called from the thread which owns it. The returned Evaluation can then be
+        executed on any thread, while the graph carries on changing.
+        """
+        self.key(node)
+        results = {}
+
+        def is_available(n):
+            if n in results:
+                return True
+
+            outputs = self.cache.get(self.__keys[n])
+            if outputs is None:
+                return False
+
+            # held by the evaluation, so the cache can't evict them before they are used.
+            results[n] = outputs
+            return True
+
+        plan = list(self.__walkUpstream(node, is_available))
+        planned = set(plan)
+        steps = []
+
+        for current in plan:
+            sources = {}
+            for name, port in current.inputs().items():
+                source = self.upstreamPort(port)
+                sources[name] = (
+                    None if source is None else (source.node(), source.name())
+                )
+
+            node_type = self.__node_types(current.nodeType())
+
+            steps.append(
+                CookStep(
+                    node=current,
+                    name=current.name(),
+                    key=self.__keys[current],
+                    compute=None if node_type is None else node_type.compute,
+                    parameters={k: v.value() for k, v in current.parameters().items()},
+                    sources=sources,
+                    dependencies=frozenset(
+                        s[0] for s in sources.values() if s and s[0] in planned
+                    ),
+                )
+            )
+
+        return Evaluation(node, steps, results, token or CancellationToken())
+
+    def __walkUpstream(
+        self, node, stop: typing.Callable[[typing.Any], bool]
+    ) -> typing.Iterator:
+        """
+        Yield the node and everything upstream of it in dependency order, not descending past nodes for which stop
+        returns True.
+        """
+        if stop(node):
+            return
+
+        visited = {node}
+        on_path = {node}
+        stack = [(node, iter(self.upstreamNodes(node)))]
+
+        while stack:
+            current, upstream = stack[-1]
+
+            for child in upstream:
+                if child in on_path:
+                    raise CookError(child, f"cycle detected at node: {child.name()}")
+
+                if child in visited or stop(child):
+                    continue
+
+                visited.add(child)
+                on_path.add(child)
+                stack.append((child, iter(self.upstreamNodes(child))))
+                break
+            else:
+                stack.pop()
+                on_path.discard(current)
+                yield current
+
+    def evaluate(self, node, token: CancellationToken = None) -> NodeOutputs:
+        """
+        Cook the node and anything upstream of it without a cached result, returning the nodes outputs.
+        """
+        evaluation = self.prepare(node, token=token)
+        try:
+            return self.execute(evaluation)
+        finally:
+            self.__timings = evaluation.timings
+
+    def execute(self, evaluation: "Evaluation") -> NodeOutputs:
+        """
+        Cook a prepared evaluation, returning the outputs of the requested node. This doesn't touch the graph, so it
+        is safe to call from a worker thread.
+
+        The plan is handed to the scheduler, which may cook independent nodes concurrently. EvaluationCancelled is
+        raised if the evaluations token is cancelled first; anything cooked before then is still cached.
+        """
+        for step, outputs, seconds in self.scheduler.execute(self, evaluation):
+            evaluation.results[step.node] = outputs
+            evaluation.timings[step.node] = seconds
+            self.cache.put(step.key, outputs)
+
+        return evaluation.results[evaluation.node]
+
+    def timings(self) -> typing.Dict[typing.Any, float]:
+        """
+        The time in seconds each node took to cook during the last call to evaluate.
+        """
+        return self.__timings.copy()
+
+    @staticmethod
+    def run(step: "CookStep", context: CookContext) -> NodeOutputs:
+        """
+        Run a steps compute callable with the given context.
+        """
+        if step.compute is None:
+            return {}
+
+        try:
+            outputs = step.compute(context)
+        except EvaluationCancelled:
+            raise
+        except Exception as e:
+            raise CookError(step.node, f"{step.name}: {e}") from e
+
+        return dict(outputs) if outputs else {}
+
+
+@dataclasses.dataclass(frozen=True)
+class CookStep:
+    """
+    A snapshot of everything needed to cook one node.
+    """
+
+    node: typing.Any
+    name: str
+    key: CacheKey
+    compute: typing.Optional[typing.Callable[[CookContext], typing.Any]]
+    parameters: typing.Dict[str, typing.Any]
+
+    # input name to the upstream node and output name feeding it, or None if it is disconnected.
+    sources: typing.Dict[str, typing.Optional[typing.Tuple[typing.Any, str]]]
+
+    # the upstream nodes which are cooked as part of the same evaluation.
+    dependencies: typing.FrozenSet
+
+
+class Evaluation:
+    """
+    A prepared request to evaluate a node, see Evaluator.prepare.
+    """
+
+    def __init__(
+        self,
+        node,
+        steps: typing.List[CookStep],
+        results: typing.Dict[typing.Any, NodeOutputs],
+        token: CancellationToken,
+    ):
+        self.node = node
+        self.steps = steps
+        self.token = token
+
+        # the outputs of every node the evaluation needs, filled in as steps complete.
+        self.results = results
+        self.timings: typing.Dict[typing.Any, float] = {}
+
+    def generation(self) -> int:
+        return self.token.generation
+
+    def context(self, step: CookStep) -> CookContext:
+        inputs = {}
+        for name, source in step.sources.items():
+            if source is None:
+                inputs[name] = None
+            else:
+                inputs[name] = self.results[source[0]].get(source[1])
+
+        return CookContext(
+            node=step.node,
+            inputs=inputs,
+            parameters=step.parameters,
+            cancellation=self.token,
+        )
@@ -0,0 +1,103 @@
+__all__ = ["Scheduler", "ThreadPoolScheduler"]
+"""
+Schedulers decide how the steps of an Evaluation are cooked.
+
+A scheduler's execute method is a generator yielding (step, outputs, seconds) as each node finishes. The evaluator
+caches each result as it is yielded, so by the time the generator resumes a finished node's outputs are available to
+the nodes downstream of it.
+"""
+
+import concurrent.futures
+import time
+import typing
+
+if typing.TYPE_CHECKING:
+    from radium.evaluation.evaluator import CookStep, Evaluation, Evaluator
+
+CookResult = typing.Tuple["CookStep", typing.Dict[str, typing.Any], float]
+
+
+def _timed(evaluator: "Evaluator", step: "CookStep", context):
+    start = time.perf_counter()
+    outputs = evaluator.run(step, context)
+    return outputs, time.perf_counter() - start
+
+
+class Scheduler:
+    """
+    Cooks the steps one at a time, in order, on the calling thread.
+    """
+
+    def execute(
+        self, evaluator: "Evaluator", evaluation: "Evaluation"
+    ) -> typing.Iterator[CookResult]:
+        for step in evaluation.steps:
+            evaluation.token.raiseIfCancelled()
+            outputs, seconds = _timed(evaluator, step, evaluation.context(step))
+            yield step, outputs, seconds
+
+    def shutdown(self):
+        pass
+
+
+class ThreadPoolScheduler(Scheduler):
+    """
+    Cooks independent nodes concurrently on a thread pool.
+
+    Each step is submitted as soon as everything it depends on within the evaluation has cooked. Contexts are built
+    by the thread running the evaluation, so only the compute callables run on the workers; computes which release
+    the GIL (e.g. numpy or file IO) run in parallel.
+    """
+
+    def __init__(self, max_workers: typing.Optional[int] = None):
+        self.__executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="radium-cook"
+        )
+
+    def execute(
+        self, evaluator: "Evaluator", evaluation: "Evaluation"
+    ) -> typing.Iterator[CookResult]:
+        token = evaluation.token
+        waiting: typing.Dict[typing.Any, int] = {}
+        dependents: typing.Dict[typing.Any, typing.List["CookStep"]] = {}
+
+        for step in evaluation.steps:
+            waiting[step.node] = len(step.dependencies)
+            for dependency in step.dependencies:
+                dependents.setdefault(dependency, []).append(step)
+
+        futures: typing.Dict[concurrent.futures.Future, "CookStep"] = {}
+
+        def submit(s):
+            token.raiseIfCancelled()
+            context = evaluation.context(s)
+            futures[self.__executor.submit(_timed, evaluator, s, context)] = s
+
+        try:
+            for step in evaluation.steps:
+                if not step.dependencies:
+                    submit(step)
+
+            while futures:
+                done, _ = concurrent.futures.wait(
+                    futures, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+
+                for future in done:
+                    step = futures.pop(future)
+                    outputs, seconds = future.result()
+                    yield step, outputs, seconds
+
+                    for dependent in dependents.get(step.node, ()):
+                        waiting[dependent.node] -= 1
+                        if not waiting[dependent.node]:
+                            submit(dependent)
+        finally:
+            # on failure or cancellation, drop anything not yet started and let running nodes finish.
+            for future in futures:
+                future.cancel()
+
+            concurrent.futures.wait(futures)
+
+    def shutdown(self):
+        self.__executor.shutdown(wait=True, cancel_futures=True)
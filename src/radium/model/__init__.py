@@ -0,0 +1,12 @@
+"""
+The Qt-free document model. Nothing in this package may import Qt, so that graphs can be loaded and edited headless.
+"""
+
+from .parameter import Observable, Parameter, ParameterDataDict
+from .prototypes import NodeType, ParameterPrototype, PortType
+from .adjacency import *
+from .compatibility import *
+from .topology import *
+from .graph import *
+from .factory import *
+from .io import load, save
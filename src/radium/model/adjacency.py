@@ -0,0 +1,127 @@
+__all__ = ["AdjacencyIndex"]
+
+import typing
+
+# anything with output_port and input_port attributes, whose ports have a node() method.
+Connection = typing.Any
+
+
+class AdjacencyIndex:
+    """
+    Connections indexed by port and by node, with constant time insertion and removal.
+
+    Each port maps to an insertion ordered dict used as a set of its connections, so removing one connection from a
+    port with thousands of them doesn't scan the rest. Each node maps to the nodes up and downstream of it, with a
+    count of the connections between them.
+    """
+
+    def __init__(self):
+        self.__connections: typing.Dict[Connection, None] = {}
+        self.__by_port: typing.Dict[typing.Any, typing.Dict[Connection, None]] = {}
+        self.__upstream: typing.Dict[typing.Any, typing.Dict[typing.Any, int]] = {}
+        self.__downstream: typing.Dict[typing.Any, typing.Dict[typing.Any, int]] = {}
+
+    def __len__(self):
+        return len(self.__connections)
+
+    def __iter__(self) -> typing.Iterator[Connection]:
+        return iter(self.__connections)
+
+    def __contains__(self, connection: Connection) -> bool:
+        return connection in self.__connections
+
+    def add(self, connection: Connection) -> bool:
+        """
+        Add the connection, returning False if it was already present.
+        """
+        if connection in self.__connections:
+            return False
+
+        self.__connections[connection] = None
+
+        output_port = connection.output_port
+        input_port = connection.input_port
+        self.__by_port.setdefault(output_port, {})[connection] = None
+        self.__by_port.setdefault(input_port, {})[connection] = None
+
+        source = output_port.node()
+        target = input_port.node()
+        downstream = self.__downstream.setdefault(source, {})
+        downstream[target] = downstream.get(target, 0) + 1
+        upstream = self.__upstream.setdefault(target, {})
+        upstream[source] = upstream.get(source, 0) + 1
+
+        return True
+
+    def remove(self, connection: Connection) -> bool:
+        """
+        Remove the connection, returning False if it wasn't present.
+        """
+        if connection not in self.__connections:
+            return False
+
+        del self.__connections[connection]
+
+        for port in (connection.output_port, connection.input_port):
+            connections = self.__by_port[port]
+            del connections[connection]
+            if not connections:
+                del self.__by_port[port]
+
+        source = connection.output_port.node()
+        target = connection.input_port.node()
+        self.__decrement(self.__downstream, source, target)
+        self.__decrement(self.__upstream, target, source)
+
+        return True
+
+    @staticmethod
+    def __decrement(index, key, other):
+        counts = index[key]
+        if counts[other] > 1:
+            counts[other] -= 1
+            return
+
+        del counts[other]
+        if not counts:
+            del index[key]
+
+    def clear(self):
+        self.__connections.clear()
+        self.__by_port.clear()
+        self.__upstream.clear()
+        self.__downstream.clear()
+
+    def connections(self, port=None) -> typing.Iterator[Connection]:
+        """
+        Iterate over the connections to the given port, or every connection if port is None. The index must not be
+        modified while iterating.
+        """
+        if port is None:
+            return iter(self.__connections)
+
+        return iter(self.__by_port.get(port, ()))
+
+    def connectionCount(self, port=None) -> int:
+        if port is None:
+            return len(self.__connections)
+
+        return len(self.__by_port.get(port, ()))
+
+    def nodes(self) -> typing.List:
+        """
+        Every node with at least one connection.
+        """
+        return list({**self.__upstream, **self.__downstream})
+
+    def upstreamNodes(self, node) -> typing.List:
+        """
+        The nodes with an output connected to one of the nodes inputs.
+        """
+        return list(self.__upstream.get(node, ()))
+
+    def downstreamNodes(self, node) -> typing.List:
+        """
+        The nodes with an input connected to one of the nodes outputs.
+        """
+        return list(self.__downstream.get(node, ()))
@@ -0,0 +1,101 @@
+__all__ = ["WILDCARD", "PortCompatibility"]
+"""
+Which port datatypes can be connected to each other.
+
+Datatype names are interned to small integer ids and the rules are compiled into a dense square table, so checking a
+pair of ports is a single index into a bytearray however many datatypes are registered.
+"""
+
+import typing
+
+# a datatype which can be connected to anything, e.g. the ports on a Dot.
+WILDCARD = "*"
+
+
+class PortCompatibility:
+    """
+    A registry of datatypes and the implicit conversions between them.
+
+    An output can be connected to an input when they have the same datatype, when either is the WILDCARD or when a
+    conversion from the output's datatype to the input's datatype has been registered. Conversions aren't transitive.
+    """
+
+    def __init__(self):
+        self.__ids: typing.Dict[str, int] = {}
+        self.__conversions: typing.Set[typing.Tuple[int, int]] = set()
+
+        self.__table = bytearray()
+        self.__size = 0
+        self.__dirty = True
+
+        self.typeId(WILDCARD)
+
+    def typeId(self, datatype: str) -> int:
+        """
+        The interned id of the given datatype, registering it if it hasn't been seen before.
+        """
+        type_id = self.__ids.get(datatype)
+        if type_id is None:
+            type_id = self.__ids[datatype] = len(self.__ids)
+            self.__dirty = True
+
+        return type_id
+
+    def datatypes(self) -> typing.List[str]:
+        return list(self.__ids)
+
+    def registerType(self, datatype: str) -> int:
+        return self.typeId(datatype)
+
+    def registerConversion(self, from_datatype: str, to_datatype: str):
+        """
+        Allow outputs of from_datatype to be connected to inputs of to_datatype.
+        """
+        key = (self.typeId(from_datatype), self.typeId(to_datatype))
+        if key not in self.__conversions:
+            self.__conversions.add(key)
+            self.__dirty = True
+
+    def canConvert(self, from_datatype: str, to_datatype: str) -> bool:
+        """
+        True if outputs of from_datatype can be connected to inputs of to_datatype.
+
+        This is called while dragging a connection, so unregistered datatypes aren't interned, they only match
+        themselves and the WILDCARD.
+        """
+        from_id = self.__ids.get(from_datatype)
+        to_id = self.__ids.get(to_datatype)
+        if from_id is None or to_id is None:
+            return (
+                from_datatype == to_datatype
+                or from_datatype == WILDCARD
+                or to_datatype == WILDCARD
+            )
+
+        return self.canConvertId(from_id, to_id)
+
+    def canConvertId(self, from_id: int, to_id: int) -> bool:
+        """
+        The same as canConvert, for ids returned by typeId.
+        """
+        if self.__dirty:
+            self.__compile()
+
+        return self.__table[from_id * self.__size + to_id] == 1
+
+    def __compile(self):
+        size = len(self.__ids)
+        table = bytearray(size * size)
+        wildcard = self.__ids[WILDCARD]
+
+        for type_id in range(size):
+            table[type_id * size + type_id] = 1
+            table[type_id * size + wildcard] = 1
+            table[wildcard * size + type_id] = 1
+
+        for from_id, to_id in self.__conversions:
+            table[from_id * size + to_id] = 1
+
+        self.__table = table
+        self.__size = size
+        self.__dirty = False
@@ -0,0 +1,115 @@
+__all__ = ["ModelFactory", "default_node_name"]
+
+import typing
+
+from radium.model.compatibility import PortCompatibility
+from radium.model.graph import NodeDataDict, NodeModel
+from radium.model.parameter import Parameter, ParameterDataDict
+from radium.model.prototypes import NodeType, PortType
+
+
+def default_node_name(node_type_name: str) -> str:
+    """
+    The name given to a node whose type is not registered, the last part of its type name.
+    """
+    return node_type_name.rpartition("/")[2]
+
+
+class ModelFactory:
+    """
+    Creates NodeModels from registered NodeTypes. This is the Qt-free counterpart of NodeFactory.
+    """
+
+    def __init__(self):
+        self.__node_types: typing.Dict[str, NodeType] = {}
+        self.__port_types: typing.Dict[str, PortType] = {}
+        self.__port_compatibility = PortCompatibility()
+
+    def registerPortType(self, port_type: PortType, exists_ok=False):
+        if port_type.type_name in self.__port_types:
+            if not exists_ok:
+                raise ValueError(f"Port Type: {port_type.type_name} already registered")
+
+        self.__port_types[port_type.type_name] = port_type
+        self.__port_compatibility.registerType(port_type.type_name)
+
+        for datatype in port_type.converts_to:
+            self.__port_compatibility.registerConversion(port_type.type_name, datatype)
+
+    def registerPortConversion(self, from_datatype: str, to_datatype: str):
+        """
+        Allow outputs of from_datatype to be connected to inputs of to_datatype.
+        """
+        self.__port_compatibility.registerConversion(from_datatype, to_datatype)
+
+    def portCompatibility(self) -> PortCompatibility:
+        return self.__port_compatibility
+
+    def registerNodeType(self, prototype: NodeType, exists_ok=False):
+        if prototype.type_name in self.__node_types:
+            if not exists_ok:
+                raise ValueError(f"NodePrototype: {prototype} already registered")
+
+        self.__node_types[prototype.type_name] = prototype
+
+    def hasNodeType(self, name: str) -> bool:
+        return name in self.__node_types
+
+    def getNodeType(self, name: str) -> typing.Optional[NodeType]:
+        return self.__node_types.get(name)
+
+    def hasPortType(self, name: str) -> bool:
+        return name in self.__port_types
+
+    def getPortType(self, name: str) -> typing.Optional[PortType]:
+        return self.__port_types.get(name)
+
+    def createNode(self, node_type_name: str, data: NodeDataDict = None) -> NodeModel:
+        node_type = self.getNodeType(node_type_name)
+
+        if node_type is None:
+            name = default_node_name(node_type_name)
+        else:
+            name = node_type.name
+
+        instance = NodeModel(node_type_name, name=name)
+
+        if node_type is not None:
+            for name, datatype in node_type.inputs.items():
+                instance.addInput(name, datatype)
+
+            for name, datatype in node_type.outputs.items():
+                instance.addOutput(name, datatype)
+
+            for name, prototype in node_type.parameters.items():
+                if prototype.datatype is None:
+                    default = prototype.value
+                else:
+                    default = prototype.default
+
+                instance.addParameter(
+                    self.createParameter(
+                        name,
+                        prototype.datatype,
+                        prototype.value,
+                        default,
+                        prototype.metadata,
+                    )
+                )
+
+        if data:
+            instance.loadDict(data)
+
+        return instance
+
+    @staticmethod
+    def createParameter(
+        name, datatype, value, default, metadata, data: ParameterDataDict = None
+    ) -> Parameter:
+        default = default if default is None else value
+        instance = Parameter(name, datatype, value, default, **metadata)
+
+        if data:
+            instance.loadDict(data)
+
+        return instance
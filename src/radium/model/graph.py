@@ -0,0 +1,374 @@
+__all__ = [
+    "PortDataDict",
+    "NodeDataDict",
+    "ConnectionDataDict",
+    "SceneDataDict",
+    "PortModel",
+    "NodeModel",
+    "ConnectionModel",
+    "GraphModel",
+]
+"""
+A Qt-free document model for node graphs.
+
+These classes hold the same data as the graphics items in radium.nodegraph.graph.scene and read and write the same
+SceneDataDict, without any of the cost of pens, brushes, fonts or scene indexing. They are intended for headless use
+e.g. batch jobs which only need to read or modify parameters.
+"""
+
+import typing
+import uuid
+
+from radium.model.adjacency import AdjacencyIndex
+from radium.model.parameter import Parameter, ParameterDataDict
+from radium.model.topology import TopologicalOrder
+
+if typing.TYPE_CHECKING:
+    from radium.model.factory import ModelFactory
+
+
+class PortDataDict(typing.TypedDict):
+    datatype: str
+    name: str
+
+
+class NodeDataDict(typing.TypedDict):
+    node_type: str
+    name: str
+    position: typing.Tuple[float, float]
+    unique_id: str
+    inputs: typing.Dict[str, PortDataDict]
+    outputs: typing.Dict[str, PortDataDict]
+    parameters: typing.Dict[str, ParameterDataDict]
+
+
+class ConnectionDataDict(typing.TypedDict):
+    output_node: str
+    output_port: str
+    input_node: str
+    input_port: str
+
+
+class SceneDataDict(typing.TypedDict):
+    nodes: typing.Dict[str, NodeDataDict]
+    connections: typing.List[ConnectionDataDict]
+
+
+class PortModel:
+    """
+    A named input or output on a node.
+    """
+
+    __slots__ = ("__node", "__name", "__datatype", "__is_output", "__weakref__")
+
+    def __init__(self, node: "NodeModel", name: str, datatype: str, is_output: bool):
+        self.__node = node
+        self.__name = name
+        self.__datatype = datatype
+        self.__is_output = is_output
+
+    def node(self) -> "NodeModel":
+        return self.__node
+
+    def name(self) -> str:
+        return self.__name
+
+    def datatype(self) -> str:
+        return self.__datatype
+
+    def isOutput(self) -> bool:
+        return self.__is_output
+
+    def isInput(self) -> bool:
+        return not self.__is_output
+
+    def toDict(self) -> PortDataDict:
+        return PortDataDict(datatype=self.__datatype, name=self.__name)
+
+    def loadDict(self, data: PortDataDict):
+        self.__name = data["name"]
+        self.__datatype = data["datatype"]
+
+
+class NodeModel:
+    """
+    A node, its ports and its parameters.
+    """
+
+    __slots__ = (
+        "__node_type",
+        "__name",
+        "__unique_id",
+        "__position",
+        "__inputs",
+        "__outputs",
+        "__parameters",
+        "__weakref__",
+    )
+
+    def __init__(self, type_name: str, name: str = None):
+        self.__node_type = type_name
+        self.__name = name or type_name
+        self.__unique_id = uuid.uuid4().hex
+        self.__position = (0.0, 0.0)
+
+        self.__inputs: typing.Dict[str, PortModel] = {}
+        self.__outputs: typing.Dict[str, PortModel] = {}
+        self.__parameters: typing.Dict[str, Parameter] = {}
+
+    def nodeType(self) -> str:
+        return self.__node_type
+
+    def uniqueId(self) -> str:
+        return self.__unique_id
+
+    def name(self) -> str:
+        return self.__name
+
+    def setName(self, name: str):
+        self.__name = name
+
+    def position(self) -> typing.Tuple[float, float]:
+        return self.__position
+
+    def setPosition(self, x: float, y: float):
+        self.__position = (x, y)
+
+    def inputs(self) -> typing.Dict[str, PortModel]:
+        return self.__inputs.copy()
+
+    def outputs(self) -> typing.Dict[str, PortModel]:
+        return self.__outputs.copy()
+
+    def hasInput(self, name: str) -> bool:
+        return name in self.__inputs
+
+    def hasOutput(self, name: str) -> bool:
+        return name in self.__outputs
+
+    def input(self, name: str) -> typing.Optional[PortModel]:
+        return self.__inputs.get(name)
+
+    def output(self, name: str) -> typing.Optional[PortModel]:
+        return self.__outputs.get(name)
+
+    def addInput(self, name: str, datatype: str) -> PortModel:
+        if name in self.__inputs:
+            raise ValueError(f"input: {name} already exists")
+
+        port = self.__inputs[name] = PortModel(self, name, datatype, False)
+        return port
+
+    def addOutput(self, name: str, datatype: str) -> PortModel:
+        if name in self.__outputs:
+            raise ValueError(f"output: {name} already exists")
+
+        port = self.__outputs[name] = PortModel(self, name, datatype, True)
+        return port
+
+    def parameters(self) -> typing.Dict[str, Parameter]:
+        return self.__parameters.copy()
+
+    def parameter(self, name: str) -> typing.Optional[Parameter]:
+        return self.__parameters.get(name)
+
+    def hasParameter(self, name: str) -> bool:
+        return name in self.__parameters
+
+    def addParameter(self, parameter: Parameter):
+        self.__parameters[parameter.name()] = parameter
+
+    def toDict(self) -> NodeDataDict:
+        return NodeDataDict(
+            node_type=self.__node_type,
+            name=self.__name,
+            position=self.__position,
+            unique_id=self.__unique_id,
+            inputs={k: v.toDict() for k, v in self.__inputs.items()},
+            outputs={k: v.toDict() for k, v in self.__outputs.items()},
+            parameters={k: v.toDict() for k, v in self.__parameters.items()},
+        )
+
+    def loadDict(self, data: NodeDataDict):
+        self.__node_type = data["node_type"]
+        self.__name = data["name"]
+        self.__position = (float(data["position"][0]), float(data["position"][1]))
+        self.__unique_id = data["unique_id"]
+
+        for port_name, port_data in data["inputs"].items():
+            if port_name not in self.__inputs:
+                self.addInput(port_name, port_data["datatype"])
+
+        for port_name, port_data in data["outputs"].items():
+            if port_name not in self.__outputs:
+                self.addOutput(port_name, port_data["datatype"])
+
+        for parameter_name, parameter_data in data["parameters"].items():
+            parameter = self.__parameters.get(parameter_name)
+            if parameter is not None:
+                parameter.loadDict(parameter_data)
+            else:
+                self.addParameter(
+                    Parameter(
+                        parameter_data["name"],
+                        parameter_data["datatype"],
+                        parameter_data["value"],
+                        parameter_data["default"],
+                        **parameter_data["metadata"],
+                    )
+                )
+
+
+class ConnectionModel:
+    """
+    A connection from an output port to an input port.
+    """
+
+    __slots__ = ("output_port", "input_port")
+
+    def __init__(self, output_port: PortModel, input_port: PortModel):
+        self.output_port = output_port
+        self.input_port = input_port
+
+    def toDict(self) -> ConnectionDataDict:
+        return ConnectionDataDict(
+            output_node=self.output_port.node().uniqueId(),
+            output_port=self.output_port.name(),
+            input_node=self.input_port.node().uniqueId(),
+            input_port=self.input_port.name(),
+        )
+
+    @classmethod
+    def fromDict(
+        cls,
+        data: ConnectionDataDict,
+        id_to_node_map: typing.Mapping[str, NodeModel],
+    ):
+        output_node = id_to_node_map[data["output_node"]]
+        output_port = output_node.output(data["output_port"])
+        input_node = id_to_node_map[data["input_node"]]
+        input_port = input_node.input(data["input_port"])
+
+        if output_port is None:
+            raise KeyError(data["output_port"])
+
+        if input_port is None:
+            raise KeyError(data["input_port"])
+
+        return cls(output_port, input_port)
+
+
+class GraphModel:
+    """
+    A collection of nodes and the connections between them.
+
+    This mirrors the graph held by a NodeGraphScene, and is loaded from and saved to the same SceneDataDict, so a
+    graph can be read and edited without a QApplication. Use NodeGraphScene.loadModel and NodeGraphScene.toModel to
+    move a graph between the two.
+    """
+
+    def __init__(self):
+        self.__nodes: typing.Dict[str, NodeModel] = {}
+        self.__adjacency = AdjacencyIndex()
+        self.__order = TopologicalOrder(self.__adjacency)
+
+    def clear(self):
+        self.__nodes.clear()
+        self.__adjacency.clear()
+        self.__order.clear()
+
+    def nodes(self) -> typing.List[NodeModel]:
+        return list(self.__nodes.values())
+
+    def nodeById(self, unique_id: str) -> typing.Optional[NodeModel]:
+        return self.__nodes.get(unique_id)
+
+    def nodeCount(self) -> int:
+        return len(self.__nodes)
+
+    def addNode(self, node: NodeModel):
+        if node.uniqueId() in self.__nodes:
+            raise ValueError(f"node: {node.uniqueId()} already exists")
+
+        self.__nodes[node.uniqueId()] = node
+
+    def removeNode(self, node: NodeModel):
+        """
+        Remove the node and any connections to or from it.
+        """
+        for port in (*node.inputs().values(), *node.outputs().values()):
+            for connection in self.getConnections(port):
+                self.removeConnection(connection)
+
+        del self.__nodes[node.uniqueId()]
+        self.__order.discard(node)
+
+    def connections(self) -> typing.List[ConnectionModel]:
+        return list(self.__adjacency)
+
+    def getConnections(self, port: PortModel) -> typing.List[ConnectionModel]:
+        return list(self.__adjacency.connections(port))
+
+    def iterConnections(
+        self, port: PortModel = None
+    ) -> typing.Iterator[ConnectionModel]:
+        """
+        Iterate over the connections to the given port, or every connection if port is None, without copying them.
+        The graph must not be modified while iterating.
+        """
+        return self.__adjacency.connections(port)
+
+    def connectionCount(self, port: PortModel = None) -> int:
+        return self.__adjacency.connectionCount(port)
+
+    def upstreamNodes(self, node: NodeModel) -> typing.List[NodeModel]:
+        return self.__adjacency.upstreamNodes(node)
+
+    def downstreamNodes(self, node: NodeModel) -> typing.List[NodeModel]:
+        return self.__adjacency.downstreamNodes(node)
+
+    def wouldCreateCycle(self, output_port: PortModel, input_port: PortModel) -> bool:
+        return self.__order.wouldCreateCycle(output_port.node(), input_port.node())
+
+    def connect(self, output_port: PortModel, input_port: PortModel):
+        connection = ConnectionModel(output_port, input_port)
+        self.addConnection(connection)
+        return connection
+
+    def addConnection(self, connection: ConnectionModel):
+        """
+        Add the connection, raising CycleError if it would make the graph cyclic.
+        """
+        self.__order.insertEdge(
+            connection.output_port.node(), connection.input_port.node()
+        )
+        self.__adjacency.add(connection)
+
+    def removeConnection(self, connection: ConnectionModel):
+        if not self.__adjacency.remove(connection):
+            raise KeyError(connection)
+
+    def toDict(self) -> SceneDataDict:
+        return SceneDataDict(
+            nodes={k: v.toDict() for k, v in self.__nodes.items()},
+            connections=[c.toDict() for c in self.__adjacency],
+        )
+
+    def loadDict(self, data: SceneDataDict, factory: "ModelFactory"):
+        """
+        Add the nodes and connections in data to the graph.
+
+        Connections are added as they were saved, without checking for cycles.
+        """
+        nodes = {}
+        for node_id, node_data in data["nodes"].items():
+            node = nodes[node_id] = factory.createNode(
+                node_data["node_type"], data=node_data
+            )
+            self.addNode(node)
+
+        for connection_data in data["connections"]:
+            self.__adjacency.add(ConnectionModel.fromDict(connection_data, nodes))
+
+        # cheaper to rebuild the order once than to update it per connection.
+        self.__order.invalidate()
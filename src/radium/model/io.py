@@ -0,0 +1,49 @@
+"""
+Reading and writing graph files, in either the JSON or radium binary format.
+"""
+
+__all__ = ["read_scene_data", "write_scene_data", "load", "save"]
+
+import json
+import typing
+
+from radium.model.graph import GraphModel, SceneDataDict
+from radium.serialization import binary
+
+if typing.TYPE_CHECKING:
+    from radium.model.factory import ModelFactory
+
+
+def read_scene_data(filename: str) -> SceneDataDict:
+    """
+    Read a graph file, detecting the binary format by its magic number and falling back to JSON.
+    """
+    with open(filename, "rb") as f:
+        raw = f.read()
+
+    if binary.is_binary(raw):
+        return binary.loads(raw)
+
+    return json.loads(raw)
+
+
+def write_scene_data(filename: str, data: SceneDataDict):
+    """
+    Write a graph file. Files ending in .json are written as JSON, anything else in the binary format.
+    """
+    if filename.endswith(".json"):
+        with open(filename, "w") as f:
+            json.dump(data, f)
+    else:
+        with open(filename, "wb") as f:
+            binary.dump(data, f)
+
+
+def load(filename: str, factory: "ModelFactory") -> GraphModel:
+    model = GraphModel()
+    model.loadDict(read_scene_data(filename), factory)
+    return model
+
+
+def save(filename: str, model: GraphModel):
+    write_scene_data(filename, model.toDict())
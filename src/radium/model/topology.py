@@ -0,0 +1,205 @@
+__all__ = ["CycleError", "TopologicalOrder"]
+"""
+An incrementally maintained topological order, used to reject connections which would create a cycle.
+
+The order follows Pearce & Kelly, "A Dynamic Topological Sort Algorithm for Directed Acyclic Graphs": every node
+connected to something has an integer position such that each connection runs from a lower to a higher position.
+Adding a connection which already respects the order costs nothing, otherwise only the nodes positioned between its
+two ends are searched and re-ordered, so the cost depends on the affected region rather than the size of the graph.
+"""
+
+import typing
+
+from radium.model.adjacency import AdjacencyIndex
+
+
+class CycleError(ValueError):
+    """
+    Raised when adding a connection would make the graph cyclic.
+    """
+
+
+class TopologicalOrder:
+    """
+    A topological order over the nodes in an AdjacencyIndex.
+
+    insertEdge must be called before a connection is added to the index; removing connections never invalidates the
+    order, so there is nothing to do on removal. Callers which add many connections at once (e.g. loading a file) can
+    add them to the index directly and call invalidate, the order is then rebuilt from scratch the next time it is
+    used.
+    """
+
+    def __init__(self, adjacency: AdjacencyIndex):
+        self.__adjacency = adjacency
+        self.__order: typing.Dict[typing.Any, int] = {}
+
+        # nodes without a position have no connections, so they can be placed before or after everything else.
+        self.__next_low = -1
+        self.__next_high = 0
+
+        self.__stale = False
+        self.__acyclic = True
+
+    def clear(self):
+        self.__order.clear()
+        self.__next_low = -1
+        self.__next_high = 0
+        self.__stale = False
+        self.__acyclic = True
+
+    def invalidate(self):
+        """
+        Rebuild the order the next time it is used.
+        """
+        self.__stale = True
+
+    def discard(self, node):
+        """
+        Forget the position of a node which has been removed from the graph.
+        """
+        self.__order.pop(node, None)
+
+    def isAcyclic(self) -> bool:
+        """
+        False if the connections in the index already contain a cycle, e.g. one loaded from a file.
+        """
+        self.__ensureOrder()
+        return self.__acyclic
+
+    def position(self, node) -> typing.Optional[int]:
+        self.__ensureOrder()
+        return self.__order.get(node)
+
+    def wouldCreateCycle(self, source, target) -> bool:
+        """
+        True if connecting an output of source to an input of target would create a cycle.
+        """
+        if source is target:
+            return True
+
+        self.__ensureOrder()
+
+        source_position = self.__order.get(source)
+        target_position = self.__order.get(target)
+        if source_position is None or target_position is None:
+            return False
+
+        if self.__acyclic and source_position < target_position:
+            return False
+
+        return self.__searchDownstream(target, source) is None
+
+    def insertEdge(self, source, target):
+        """
+        Update the order for a new connection from source to target, raising CycleError if it would create a cycle.
+        """
+        if source is target:
+            raise CycleError(f"{source} can't be connected to itself")
+
+        self.__ensureOrder()
+
+        if source not in self.__order:
+            self.__order[source] = self.__next_low
+            self.__next_low -= 1
+
+        if target not in self.__order:
+            self.__order[target] = self.__next_high
+            self.__next_high += 1
+
+        lower_bound = self.__order[target]
+        if self.__acyclic and self.__order[source] < lower_bound:
+            return
+
+        downstream = self.__searchDownstream(target, source)
+        if downstream is None:
+            raise CycleError(f"connecting {source} to {target} would create a cycle")
+
+        if not self.__acyclic:
+            # the existing order can't be trusted, re-ordering would only move the problem elsewhere.
+            return
+
+        upstream = self.__searchUpstream(source, lower_bound)
+
+        # the upstream region must now come before the downstream region, reuse their positions to keep the rest of
+        # the order untouched.
+        upstream.sort(key=self.__order.__getitem__)
+        downstream.sort(key=self.__order.__getitem__)
+        nodes = upstream + downstream
+        positions = sorted(self.__order[node] for node in nodes)
+
+        for node, position in zip(nodes, positions):
+            self.__order[node] = position
+
+    def __searchDownstream(self, start, stop) -> typing.Optional[typing.List]:
+        """
+        The nodes reachable from start which are positioned at or before stop, or None if stop is reachable.
+        """
+        upper_bound = self.__order[stop] if self.__acyclic else None
+        visited = {start: None}
+        stack = [start]
+
+        while stack:
+            for node in self.__adjacency.downstreamNodes(stack.pop()):
+                if node is stop:
+                    return None
+
+                if node in visited:
+                    continue
+
+                if upper_bound is not None and self.__order[node] > upper_bound:
+                    continue
+
+                visited[node] = None
+                stack.append(node)
+
+        return list(visited)
+
+    def __searchUpstream(self, start, lower_bound: int) -> typing.List:
+        """
+        The nodes which reach start and are positioned after lower_bound.
+        """
+        visited = {start: None}
+        stack = [start]
+
+        while stack:
+            for node in self.__adjacency.upstreamNodes(stack.pop()):
+                if node in visited or self.__order[node] <= lower_bound:
+                    continue
+
+                visited[node] = None
+                stack.append(node)
+
+        return list(visited)
+
+    def __ensureOrder(self):
+        if not self.__stale:
+            return
+
+        self.__stale = False
+        self.__order.clear()
+        self.__next_low = -1
+
+        # kahn's algorithm over every connected node.
+        nodes = self.__adjacency.nodes()
+        waiting = {node: len(self.__adjacency.upstreamNodes(node)) for node in nodes}
+        ready = [node for node, count in waiting.items() if not count]
+        position = 0
+
+        while ready:
+            node = ready.pop()
+            self.__order[node] = position
+            position += 1
+
+            for downstream in self.__adjacency.downstreamNodes(node):
+                waiting[downstream] -= 1
+                if not waiting[downstream]:
+                    ready.append(downstream)
+
+        # anything left is part of, or downstream of, a cycle.
+        self.__acyclic = len(self.__order) == len(nodes)
+        for node in nodes:
+            if node not in self.__order:
+                self.__order[node] = position
+                position += 1
+
+        self.__next_high = position
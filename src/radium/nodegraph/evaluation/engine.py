@@ -0,0 +1,249 @@
+__all__ = ["SceneEvaluator", "EvaluationEngine"]
+
+import concurrent.futures
+import logging
+import typing
+
+from PySide6 import QtCore
+
+from radium.evaluation import (
+    CancellationToken,
+    CookError,
+    Evaluation,
+    EvaluationCancelled,
+    Evaluator,
+    ThreadPoolScheduler,
+)
+from radium.nodegraph.graph.scene import NodeGraphScene
+from radium.nodegraph.graph.scene.connection import Connection
+from radium.nodegraph.graph.scene.dot import Dot
+from radium.nodegraph.graph.scene.node import Node
+from radium.nodegraph.graph.scene.port import Port
+
+if typing.TYPE_CHECKING:
+    from radium.nodegraph.factory import NodeFactory
+
+logger = logging.getLogger(__name__)
+
+
+class SceneEvaluator(Evaluator):
+    """
+    An Evaluator for the nodes in a NodeGraphScene. Dots are not cooked, values pass straight through them.
+    """
+
+    def upstreamPort(self, port: Port):
+        source = super().upstreamPort(port)
+        visited = set()
+
+        while source is not None and isinstance(source.node(), Dot):
+            dot = source.node()
+            if dot in visited:
+                return None
+
+            visited.add(dot)
+            source = super().upstreamPort(dot.input)
+
+        return source
+
+    def downstreamNodes(self, node: Node) -> typing.Iterator[Node]:
+        return self.__downstreamOfPorts(list(node.outputs().values()))
+
+    def invalidate(self, item):
+        if isinstance(item, Dot):
+            for node in self.__downstreamOfPorts([item.output]):
+                super().invalidate(node)
+        else:
+            super().invalidate(item)
+
+    def __downstreamOfPorts(self, ports: typing.List[Port]) -> typing.Iterator[Node]:
+        visited = set()
+
+        while ports:
+            for connection in self.graph.getConnections(ports.pop()):
+                target = connection.input_port.node()
+                if not isinstance(target, Dot):
+                    yield target
+                elif target not in visited:
+                    visited.add(target)
+                    ports.append(target.output)
+
+
+class EvaluationEngine(QtCore.QObject):
+    """
+    Keeps the viewed nodes of a scene cooked.
+
+    Parameter and connection changes invalidate only the affected nodes, then the viewed nodes are re-cooked on the
+    next event loop iteration, so a burst of changes results in a single cook.
+
+    Evaluations are planned on the GUI thread and cooked on a background thread. Each request starts a new
+    generation and cancels the previous one, so while e.g. a slider is dragged an edit waits for at most the node
+    currently cooking rather than for every earlier edit, and results from superseded generations are discarded.
+    """
+
+    nodeEvaluated = QtCore.Signal(Node, object)
+    evaluationFailed = QtCore.Signal(Node, str)
+
+    # emitted from the evaluation thread, delivered on the GUI thread.
+    _evaluationFinished = QtCore.Signal(object, object, str)
+
+    def __init__(
+        self,
+        scene: NodeGraphScene,
+        node_factory: "NodeFactory",
+        max_workers: typing.Optional[int] = None,
+        parent=None,
+    ):
+        super().__init__(parent=parent)
+        self.scene = scene
+        self.evaluator = SceneEvaluator(
+            scene,
+            node_factory.getNodeType,
+            scheduler=ThreadPoolScheduler(max_workers=max_workers),
+        )
+
+        self.__generation = 0
+        self.__token = CancellationToken()
+        self.__pending = 0
+        self.__timings: typing.Dict[Node, float] = {}
+
+        # evaluations run one at a time, superseded ones are cancelled so they give way quickly.
+        self.__runner = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="radium-evaluate"
+        )
+
+        self.__timer = QtCore.QTimer(self)
+        self.__timer.setSingleShot(True)
+        self.__timer.setInterval(0)
+        self.__timer.timeout.connect(self.evaluate)
+
+        self._evaluationFinished.connect(self.__onEvaluationFinished)
+
+        scene.parameterChanged.connect(self.onParameterChanged)
+        scene.connectionAdded.connect(self.onConnectionChanged)
+        scene.connectionRemoved.connect(self.onConnectionChanged)
+        scene.nodeViewed.connect(self.onNodeViewed)
+        scene.itemsAdded.connect(self.onItemsAdded)
+        scene.itemRemoved.connect(self.onItemRemoved)
+        scene.itemsRemoved.connect(self.onItemsRemoved)
+        scene.cleared.connect(self.onCleared)
+
+    def generation(self) -> int:
+        return self.__generation
+
+    def isEvaluating(self) -> bool:
+        return self.__pending > 0
+
+    def timings(self) -> typing.Dict[Node, float]:
+        """
+        The time in seconds each node took to cook in the most recently delivered evaluation.
+        """
+        return self.__timings.copy()
+
+    def shutdown(self):
+        """
+        Cancel any evaluation in progress and stop the worker threads, waiting for running cooks to finish.
+        """
+        self.__timer.stop()
+        self.__token.cancel()
+        self.__runner.shutdown(wait=True, cancel_futures=True)
+        self.evaluator.scheduler.shutdown()
+
+    def cancel(self):
+        """
+        Cancel the current generation, its results will not be delivered.
+        """
+        self.__token.cancel()
+
+    def scheduleEvaluation(self):
+        # the current generation is superseded straight away, rather than when the timer fires.
+        self.__token.cancel()
+
+        if not self.__timer.isActive():
+            self.__timer.start()
+
+    @QtCore.Slot()
+    def evaluate(self):
+        """
+        Start a new generation, cooking the viewed nodes in the background.
+        """
+        self.__timer.stop()
+        self.__token.cancel()
+
+        self.__generation += 1
+        self.__token = CancellationToken(self.__generation)
+
+        for node in self.scene.viewedNodes():
+            try:
+                evaluation = self.evaluator.prepare(node, token=self.__token)
+            except CookError as e:
+                self.evaluationFailed.emit(node, str(e))
+                continue
+
+            self.__pending += 1
+            self.__runner.submit(self.__execute, evaluation)
+
+    def __execute(self, evaluation: Evaluation):
+        try:
+            outputs = self.evaluator.execute(evaluation)
+        except EvaluationCancelled:
+            self._evaluationFinished.emit(evaluation, None, "")
+        except CookError as e:
+            self._evaluationFinished.emit(evaluation, None, str(e))
+        except Exception as e:  # noqa
+            logger.exception("evaluation failed")
+            self._evaluationFinished.emit(evaluation, None, str(e))
+        else:
+            self._evaluationFinished.emit(evaluation, outputs, "")
+
+    @QtCore.Slot(object, object, str)
+    def __onEvaluationFinished(self, evaluation: Evaluation, outputs, error: str):
+        self.__pending -= 1
+
+        if (
+            evaluation.generation() != self.__generation
+            or evaluation.token.isCancelled()
+        ):
+            return  # superseded
+
+        if error:
+            self.evaluationFailed.emit(evaluation.node, error)
+        elif outputs is not None:
+            self.__timings = evaluation.timings.copy()
+            self.nodeEvaluated.emit(evaluation.node, outputs)
+
+    def onParameterChanged(self, node: Node, parameter, previous, value):
+        self.evaluator.invalidate(node)
+        self.scheduleEvaluation()
+
+    def onConnectionChanged(self, connection: Connection):
+        self.evaluator.invalidate(connection.input_port.node())
+        self.scheduleEvaluation()
+
+    def onNodeViewed(self, node: Node):
+        if node.isViewed():
+            self.scheduleEvaluation()
+
+    def onItemsAdded(self, items: list):
+        for item in items:
+            if isinstance(item, Connection):
+                self.evaluator.invalidate(item.input_port.node())
+
+        self.scheduleEvaluation()
+
+    def onItemRemoved(self, item):
+        if isinstance(item, Node):
+            self.evaluator.invalidate(item)
+            self.scheduleEvaluation()
+
+    def onItemsRemoved(self, items: list):
+        for item in items:
+            if isinstance(item, Node):
+                self.evaluator.invalidate(item)
+            elif isinstance(item, Connection):
+                self.evaluator.invalidate(item.input_port.node())
+
+        self.scheduleEvaluation()
+
+    def onCleared(self):
+        self.__token.cancel()
+        self.evaluator.invalidateAll()
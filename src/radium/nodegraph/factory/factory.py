@@ -7,16 +7,19 @@ import uuid
 import qtawesome
 
 from PySide6 import QtCore, QtGui
-from radium.nodegraph.factory.prototypes import (
+from radium.model.compatibility import PortCompatibility
+from radium.model.factory import ModelFactory, default_node_name
+from radium.model.graph import NodeDataDict, NodeModel, PortDataDict
+from radium.model.parameter import ParameterDataDict
+from radium.model.prototypes import (
     NodeType,
     PortType,
 )
 
-from radium.nodegraph.graph.scene.node_base import NodeDataDict
 from radium.nodegraph.graph.scene.node import Node
-from radium.nodegraph.graph.scene.port import PortDataDict, Port
+from radium.nodegraph.graph.scene.port import Port
+from radium.nodegraph.graph.scene.style import NodeStyle, PortStyle
 from radium.nodegraph.factory.model import NodePrototypeModel
-from radium.nodegraph.parameters.parameter import Parameter, ParameterDataDict
 
 
 class NodeFactory(QtCore.QObject):
@@ -26,6 +29,11 @@ class NodeFactory(QtCore.QObject):
         self.__port_types = {}
         self.__icon_cache = {}
 
+        # styles are resolved once per type and shared by every item created from it.
+        self.__node_styles: typing.Dict[str, NodeStyle] = {}
+        self.__port_styles: typing.Dict[str, PortStyle] = {}
+        self.__model_factory = ModelFactory()
+
         self.node_types_model = NodePrototypeModel()
 
     def registerPortType(self, port_type: PortType, exists_ok=False):
@@ -34,6 +42,20 @@ class NodeFactory(QtCore.QObject):
                 raise ValueError(f"Port Type: {port_type.type_name} already registered")
 
         self.__port_types[port_type.type_name] = port_type
+        self.__port_styles.pop(port_type.type_name, None)
+        self.__model_factory.registerPortType(port_type, exists_ok=True)
+
+    def registerPortConversion(self, from_datatype: str, to_datatype: str):
+        """
+        Allow outputs of from_datatype to be connected to inputs of to_datatype.
+        """
+        self.__model_factory.registerPortConversion(from_datatype, to_datatype)
+
+    def portCompatibility(self) -> PortCompatibility:
+        """
+        The datatype compatibility shared by every port this factory creates.
+        """
+        return self.__model_factory.portCompatibility()
 
     def registerNodeType(self, prototype: NodeType, exists_ok=False):
         if prototype.type_name in self.__node_types:
@@ -43,6 +65,8 @@ class NodeFactory(QtCore.QObject):
                 self.node_types_model.removePrototype(prototype.type_name)
 
         self.__node_types[prototype.type_name] = prototype
+        self.__node_styles.pop(prototype.type_name, None)
+        self.__model_factory.registerNodeType(prototype, exists_ok=True)
         self.node_types_model.addPrototype(prototype)
 
     def hasNodeType(self, name: str) -> bool:
@@ -52,11 +76,50 @@ class NodeFactory(QtCore.QObject):
         return self.__node_types.get(name)
 
     def hasPortType(self, name: str) -> bool:
-        return name in self.__node_types
+        return name in self.__port_types
 
     def getPortType(self, name):
         return self.__port_types.get(name)
 
+    def nodeStyle(self, node_type: NodeType) -> NodeStyle:
+        """
+        The style shared by every node of the given type.
+        """
+        style = self.__node_styles.get(node_type.type_name)
+        if style is None:
+            style = self.__node_styles[
+                node_type.type_name
+            ] = NodeStyle.default().replace(
+                pen=createPen(node_type.outline_color),
+                brush=createBrush(node_type.color),
+            )
+
+        return style
+
+    def portStyle(self, port_type: PortType) -> PortStyle:
+        """
+        The style shared by every port of the given type.
+        """
+        style = self.__port_styles.get(port_type.type_name)
+        if style is None:
+            style = self.__port_styles[port_type.type_name] = PortStyle(
+                pen=createPen(port_type.outline_color),
+                brush=createBrush(port_type.color),
+            )
+
+        return style
+
+    def modelFactory(self) -> ModelFactory:
+        """
+        A Qt-free factory sharing this factory's registered types, used to create NodeModels.
+        """
+        return self.__model_factory
+
+    def createNodeModel(
+        self, node_type_name: str, data: NodeDataDict = None
+    ) -> NodeModel:
+        return self.__model_factory.createNode(node_type_name, data=data)
+
     def cloneNode(self, node: Node) -> Node:
         data = node.toDict()
         data["unique_id"] = uuid.uuid4().hex
@@ -66,17 +129,14 @@ class NodeFactory(QtCore.QObject):
         node_type = self.getNodeType(node_type_name)
 
         if node_type is None:
-            if "/" in node_type_name:
-                name = node_type_name[node_type_name.rindex("/") :]
-            else:
-                name = node_type_name
+            name = default_node_name(node_type_name)
         else:
             name = node_type.name
 
         instance = Node(self, node_type_name, name=name)
 
         if node_type is not None:
-            applyItemStyle(node_type, instance)
+            instance.setStyle(self.nodeStyle(node_type))
 
             for name, datatype in node_type.inputs.items():
                 instance.addInput(name, datatype)
@@ -107,10 +167,11 @@ class NodeFactory(QtCore.QObject):
         self, cls: typing.Type[Port], name, port_type: str, data: PortDataDict = None
     ):
         instance = cls(name, port_type)
+        instance.setCompatibility(self.portCompatibility())
 
         port_type = self.getPortType(port_type)
         if port_type is not None:
-            applyItemStyle(port_type, instance)
+            instance.setStyle(self.portStyle(port_type))
 
         if data:
             instance.loadDict(data)
@@ -120,20 +181,9 @@ class NodeFactory(QtCore.QObject):
     def createParameter(
         self, name, datatype, value, default, metadata, data: ParameterDataDict = None
     ):
-        default = default if default is None else value
-        instance = Parameter(name, datatype, value, default, **metadata)
-
-        if data:
-            instance.loadDict(data)
-
-        return instance
-
-
-def applyItemStyle(type_class: typing.Union["NodeType", "PortType"], item):
-    pen = createPen(type_class.outline_color)
-    brush = createBrush(type_class.color)
-    item.setPen(pen)
-    item.setBrush(brush)
+        return self.__model_factory.createParameter(
+            name, datatype, value, default, metadata, data=data
+        )
 
 
 def createPen(data: typing.Tuple):
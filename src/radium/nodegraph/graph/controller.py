@@ -2,6 +2,8 @@ import typing
 import logging
 from PySide6 import QtCore, QtGui, QtWidgets
 
+from radium.model.topology import CycleError
+
 from radium.nodegraph.graph.scene.node import Node
 from radium.nodegraph.graph.scene.event_filter import SceneEventFilter
 from radium.nodegraph.graph.scene.backdrop import Backdrop
@@ -27,7 +29,7 @@ class NodeGraphController(QtCore.QObject):
         super().__init__(parent)
         self.scene = NodeGraphScene()
         self.node_factory = node_factory or NodeFactory()
-        self.undo_stack = undo_stack or QtGui.QUndoStack()
+        self.undo_stack = undo_stack or commands.BudgetedUndoStack()
 
         self.scene_event_filter = SceneEventFilter(
             self.scene,
@@ -65,7 +67,7 @@ class NodeGraphController(QtCore.QObject):
         cmd.setText(f"Create: {node_type}")
 
         self.undo_stack.push(cmd)
-        return cmd.node
+        return self.scene.nodeById(cmd.node_id)
 
     def createBackdrop(self, name):
         backdrop = Backdrop(name)
@@ -78,8 +80,16 @@ class NodeGraphController(QtCore.QObject):
         cmd.setText(f"Remove: {item}")
         self.undo_stack.push(cmd)
 
+    def removeItems(self, items):
+        """
+        Remove the items and their connections with a single undoable command.
+        """
+        cmd = commands.RemoveItemsCommand(self.scene, items)
+        if cmd.node_ids or cmd.items or cmd.connections:
+            self.undo_stack.push(cmd)
+
     def selectedNodes(self):
-        return [n for n in self.scene.selectedItems() if isinstance(n, Node)]
+        return self.scene.selectedNodes()
 
     def createConnection(
         self, output_port: OutputPort, input_port: InputPort
@@ -90,9 +100,14 @@ class NodeGraphController(QtCore.QObject):
         if not isinstance(input_port, InputPort):
             raise TypeError(f"Not an input port: {input_port}")
 
+        if self.scene.wouldCreateCycle(output_port, input_port):
+            raise CycleError(
+                f"Connecting {output_port} to {input_port} would create a cycle"
+            )
+
         cmd = commands.CreateConnectionCommand(self.scene, output_port, input_port)
         self.undo_stack.push(cmd)
-        return cmd.connection
+        return commands.find_connection(self.scene, cmd.record)
 
     @QtCore.Slot(str, QtCore.QPointF)
     def onNodeCreationRequested(self, node_type: str, position: QtCore.QPointF):
@@ -112,7 +127,7 @@ class NodeGraphController(QtCore.QObject):
         if isinstance(hovered_item, Node):
             hovered_item.setViewed(not hovered_item.isViewed())
 
-            for node in self.scene.nodes():
+            for node in self.scene.viewedNodes():
                 if node is hovered_item:
                     continue
                 node.setViewed(False)
@@ -134,7 +149,7 @@ class NodeGraphController(QtCore.QObject):
         if modifiers & QtCore.Qt.KeyboardModifier.ShiftModifier:
             return
 
-        for node in self.scene.nodes():
+        for node in self.scene.editedNodes():
             if node is hovered_item:
                 continue
             node.setEdited(False)
@@ -1,5 +1,7 @@
 from PySide6 import QtCore, QtGui, QtWidgets
 
+from radium.nodegraph.graph.scene.profiling import profiled_paint
+
 
 class BackdropHandle(QtWidgets.QGraphicsEllipseItem):
     def __init__(self, parent=None):
@@ -34,6 +36,7 @@ class Backdrop(QtWidgets.QGraphicsItem):
         self.__rect = QtCore.QRectF()
         self.__text_rect = self.__font_metrics.boundingRect(self._name)
 
+    @profiled_paint("Backdrop")
     def paint(self, painter, option, widget=...):
         painter.setBrush(self.__brush)
         painter.setPen(self.__pen)
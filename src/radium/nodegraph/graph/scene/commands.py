@@ -1,12 +1,24 @@
+"""
+Undoable edits to a NodeGraphScene.
+
+Commands don't keep removed nodes alive. They hold compact records instead: a node's NodeDataDict, and port
+references made of a node's unique id plus a port name. Items are rebuilt from these on undo and redo. Nodes are always
+looked up by unique id rather than held directly, so every command keeps working after another command has rebuilt a
+node it refers to.
+"""
+
+import copy
+import sys
 import typing
 import uuid
 
 from PySide6 import QtGui, QtWidgets, QtCore
 
+from radium.model.graph import NodeDataDict
 from radium.nodegraph.graph.scene import NodeGraphScene
 from radium.nodegraph.graph.scene.node import Node
 from radium.nodegraph.graph.scene.connection import Connection
-from radium.nodegraph.graph.scene.port import InputPort, OutputPort
+from radium.nodegraph.graph.scene.port import InputPort, OutputPort, Port
 
 if typing.TYPE_CHECKING:
     from radium.nodegraph.factory.prototypes import NodeType
@@ -15,27 +27,180 @@ if typing.TYPE_CHECKING:
 
 MOVE_NODES_COMMAND_ID = 1000
 
+# the approximate size of a command with no payload, and of any graphics item a command keeps alive.
+COMMAND_OVERHEAD = 256
+ITEM_SIZE = 4096
+
+# lists and tuples longer than this are sized from an evenly spaced sample of their items.
+SIZE_SAMPLE_COUNT = 32
+
+# a port on a node is referenced by (unique id, port name) so it can be resolved after the node is rebuilt. ports on
+# anything else, e.g. dots, are referenced directly.
+PortRef = typing.Union[typing.Tuple[str, str], Port]
+ConnectionRecord = typing.Tuple[PortRef, PortRef]
+
+
+def port_ref(port: Port) -> PortRef:
+    node = port.node()
+    if isinstance(node, Node):
+        return node.uniqueId(), port.name()
+
+    return port
+
+
+def resolve_port(
+    scene: "NodeGraphScene", ref: PortRef, is_input: bool
+) -> typing.Optional[Port]:
+    if isinstance(ref, Port):
+        return ref
+
+    node = scene.nodeById(ref[0])
+    if node is None:
+        return None
+
+    ports = node.inputs() if is_input else node.outputs()
+    return ports.get(ref[1])
+
+
+def connection_record(connection: Connection) -> ConnectionRecord:
+    return port_ref(connection.output_port), port_ref(connection.input_port)
+
+
+def find_connection(
+    scene: "NodeGraphScene", record: ConnectionRecord
+) -> typing.Optional[Connection]:
+    """
+    The connection in the scene matching the given record, or None.
+    """
+    output_port = resolve_port(scene, record[0], is_input=False)
+    input_port = resolve_port(scene, record[1], is_input=True)
+    if output_port is None or input_port is None:
+        return None
+
+    # inputs accept a single connection, so this is usually a one item search.
+    for connection in scene.iterConnections(input_port):
+        if connection.output_port is output_port:
+            return connection
+
+    return None
+
+
+def create_connection(
+    scene: "NodeGraphScene", record: ConnectionRecord
+) -> typing.Optional[Connection]:
+    output_port = resolve_port(scene, record[0], is_input=False)
+    input_port = resolve_port(scene, record[1], is_input=True)
+    if output_port is None or input_port is None:
+        return None
+
+    connection = Connection(output_port, input_port)
+    scene.addItem(connection)
+    return connection
+
+
+def approximate_size(value) -> int:
+    """
+    The approximate number of bytes used by a record made of dicts, lists, tuples, strings and numbers.
+    """
+    size = sys.getsizeof(value)
+
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += approximate_size(key) + approximate_size(item)
+    elif isinstance(value, (list, tuple)):
+        if len(value) > SIZE_SAMPLE_COUNT:
+            step = len(value) / SIZE_SAMPLE_COUNT
+            sample = [value[int(i * step)] for i in range(SIZE_SAMPLE_COUNT)]
+            size += sum(map(approximate_size, sample)) * len(value) // len(sample)
+        else:
+            for item in value:
+                size += approximate_size(item)
+    elif isinstance(value, QtWidgets.QGraphicsItem):
+        size += ITEM_SIZE
+
+    return size
+
+
+def command_size(command: QtGui.QUndoCommand) -> int:
+    """
+    The approximate memory held by a command and its children, see UndoCommand.approximateSize.
+    """
+    if isinstance(command, UndoCommand):
+        size = command.approximateSize()
+    else:
+        size = COMMAND_OVERHEAD
+
+    for i in range(command.childCount()):
+        size += command_size(command.child(i))
+
+    return size
 
-class CreateNodeCommand(QtGui.QUndoCommand):
+
+def discard_command(command: QtGui.QUndoCommand):
+    if isinstance(command, UndoCommand):
+        command.discard()
+
+    for i in range(command.childCount()):
+        discard_command(command.child(i))
+
+
+class UndoCommand(QtGui.QUndoCommand):
+    """
+    The base class of the scene's commands. Subclasses report the memory their undo/redo state holds, so
+    BudgetedUndoStack can discard old history, and release it in discard.
+    """
+
+    def approximateSize(self) -> int:
+        return COMMAND_OVERHEAD
+
+    def discard(self):
+        """
+        Release everything held for undo/redo. This is called once the command has been made obsolete, after which
+        it is never undone or redone.
+        """
+
+
+class CreateNodeCommand(UndoCommand):
     def __init__(self, scene: NodeGraphScene, node_type: str, factory: "NodeFactory"):
         super().__init__()
         self.setText("Create Node")
         self.scene = scene
         self.node_type = node_type
         self.factory = factory
-        self.node: typing.Optional[Node] = None
+
+        # the node is only referenced by id, so it isn't kept alive once removed by another command.
+        self.node_id: typing.Optional[str] = None
+
+        # the node's serialized form while it is undone.
+        self.data: typing.Optional[NodeDataDict] = None
 
     def redo(self):
-        if self.node is None:
-            self.node = self.factory.createNode(self.node_type)
+        if self.data is None:
+            node = self.factory.createNode(self.node_type)
+        else:
+            node = self.factory.createNode(self.node_type, data=self.data)
+            self.data = None
 
-        self.scene.addItem(self.node)
+        self.node_id = node.uniqueId()
+        self.scene.addItem(node)
 
     def undo(self):
-        self.scene.removeItem(self.node)
+        node = self.scene.nodeById(self.node_id)
+        self.data = node.toDict()
+
+        self.scene.removeItem(node)
+
+    def approximateSize(self) -> int:
+        if self.data is not None:
+            return COMMAND_OVERHEAD + approximate_size(self.data)
+
+        return COMMAND_OVERHEAD
+
+    def discard(self):
+        self.data = None
 
 
-class CreateConnectionCommand(QtGui.QUndoCommand):
+class CreateConnectionCommand(UndoCommand):
     def __init__(
         self,
         scene: "NodeGraphScene",
@@ -45,31 +210,42 @@ class CreateConnectionCommand(QtGui.QUndoCommand):
         super().__init__()
         self.setText("Create Connection")
         self.scene = scene
-        self.connection = Connection(output_port, input_port)
+        self.record = (port_ref(output_port), port_ref(input_port))
         self.sub_commands = []
 
-        input_connections = input_port.connections()
-
-        if len(input_connections) + 1 > input_port.maxConnections():
-            self.sub_commands.append(RemoveItemCommand(scene, input_connections[-1]))
-
-        output_connections = output_port.connections()
-
-        if len(output_connections) + 1 > output_port.maxConnections():
-            self.sub_commands.append(RemoveItemCommand(scene, output_connections[-1]))
+        # counting rather than copying keeps this cheap for outputs with a large fan-out.
+        for port in (input_port, output_port):
+            if scene.connectionCount(port) + 1 > port.maxConnections():
+                *_, last = scene.iterConnections(port)
+                self.sub_commands.append(RemoveItemCommand(scene, last))
 
     def redo(self):
-        self.scene.addItem(self.connection)
+        # displaced connections are removed first, so they can't be confused with the new one.
         for cmd in self.sub_commands:
             cmd.redo()
 
+        create_connection(self.scene, self.record)
+
     def undo(self):
-        self.scene.removeItem(self.connection)
-        for cmd in self.sub_commands:
+        connection = find_connection(self.scene, self.record)
+        if connection is not None:
+            self.scene.removeItem(connection)
+
+        for cmd in reversed(self.sub_commands):
             cmd.undo()
 
+    def approximateSize(self) -> int:
+        size = COMMAND_OVERHEAD + approximate_size(self.record)
+        for cmd in self.sub_commands:
+            size += cmd.approximateSize()
+
+        return size
+
+    def discard(self):
+        self.sub_commands = []
+
 
-class AddItemCommand(QtGui.QUndoCommand):
+class AddItemCommand(UndoCommand):
     def __init__(
         self,
         scene: "NodeGraphScene",
@@ -86,8 +262,22 @@ class AddItemCommand(QtGui.QUndoCommand):
     def undo(self):
         self.scene.removeItem(self.item)
 
+    def approximateSize(self) -> int:
+        return COMMAND_OVERHEAD + ITEM_SIZE
+
+    def discard(self):
+        self.item = None
+
+
+class RemoveItemCommand(UndoCommand):
+    """
+    Remove an item from the scene.
+
+    Nodes are removed along with their connections and only their serialized form is kept, the node is rebuilt by
+    undo. Connections are kept as a record of their ports. Other items, e.g. dots and backdrops, are kept as they are,
+    along with records of any connections to their ports.
+    """
 
-class RemoveItemCommand(QtGui.QUndoCommand):
     def __init__(
         self,
         scene: "NodeGraphScene",
@@ -96,16 +286,158 @@ class RemoveItemCommand(QtGui.QUndoCommand):
     ):
         super().__init__(parent)
         self.scene = scene
-        self.item = item
+        self.item: typing.Optional[QtWidgets.QGraphicsItem] = None
+        self.node_id: typing.Optional[str] = None
+        self.factory: typing.Optional["NodeFactory"] = None
+
+        # records filled in by redo.
+        self.data: typing.Optional[NodeDataDict] = None
+        self.connections: typing.List[ConnectionRecord] = []
+
+        if isinstance(item, Node):
+            self.node_id = item.uniqueId()
+            self.factory = item.factory()
+        elif isinstance(item, Connection):
+            self.connections = [connection_record(item)]
+        else:
+            self.item = item
 
     def redo(self):
-        self.scene.removeItem(self.item)
+        if self.node_id is not None:
+            node = self.scene.nodeById(self.node_id)
+            self.data = node.toDict()
+
+            connections = self.scene.attachedConnections([node])
+            self.connections = [connection_record(c) for c in connections]
+
+            # the scene removes the node's connections along with it.
+            self.scene.removeItem(node)
+
+        elif self.item is not None:
+            # any other item with ports, e.g. a dot, loses its connections too.
+            connections = self.scene.attachedConnections([self.item])
+            self.connections = [connection_record(c) for c in connections]
+            self.scene.removeItem(self.item)
+
+        else:
+            connection = find_connection(self.scene, self.connections[0])
+            if connection is not None:
+                self.scene.removeItem(connection)
 
     def undo(self):
-        self.scene.addItem(self.item)
+        if self.node_id is not None:
+            node = self.factory.createNode(self.data["node_type"], data=self.data)
+            self.scene.addItem(node)
+            self.data = None
+
+            for record in self.connections:
+                create_connection(self.scene, record)
+
+        elif self.item is not None:
+            self.scene.addItem(self.item)
+
+            for record in self.connections:
+                create_connection(self.scene, record)
+
+        else:
+            create_connection(self.scene, self.connections[0])
+
+    def approximateSize(self) -> int:
+        size = COMMAND_OVERHEAD + approximate_size(self.connections)
+        if self.data is not None:
+            size += approximate_size(self.data)
+        if self.item is not None:
+            size += ITEM_SIZE
+
+        return size
 
+    def discard(self):
+        self.item = None
+        self.data = None
+        self.connections = []
+
+
+class RemoveItemsCommand(UndoCommand):
+    """
+    Remove several items at once, along with every connection attached to them.
+
+    The items are removed with a single NodeGraphScene.removeItems call and restored by undo in a single bulk load,
+    so the scene updates and notifies once however many items there are. Nodes are kept as their serialized form and
+    connections as records of their ports, like RemoveItemCommand. Other items, e.g. dots and backdrops, are kept as
+    they are.
+    """
 
-class MoveNodesCommand(QtGui.QUndoCommand):
+    def __init__(
+        self,
+        scene: "NodeGraphScene",
+        items: typing.Iterable[QtWidgets.QGraphicsItem],
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.scene = scene
+
+        self.node_ids: typing.List[str] = []
+        self.factories: typing.Dict[str, "NodeFactory"] = {}
+        self.items: typing.List[QtWidgets.QGraphicsItem] = []
+        self.connections: typing.List[ConnectionRecord] = []
+
+        # records filled in by redo.
+        self.data: typing.List[NodeDataDict] = []
+
+        for item in dict.fromkeys(items):
+            if isinstance(item, Node):
+                self.node_ids.append(item.uniqueId())
+                self.factories[item.uniqueId()] = item.factory()
+            elif isinstance(item, Connection):
+                self.connections.append(connection_record(item))
+            else:
+                self.items.append(item)
+
+        self.setText(f"Remove ({len(self.node_ids) + len(self.items)}) Items")
+
+    def redo(self):
+        nodes = (self.scene.nodeById(node_id) for node_id in self.node_ids)
+        nodes = [node for node in nodes if node is not None]
+        connections = (find_connection(self.scene, r) for r in self.connections)
+        connections = [c for c in connections if c is not None]
+
+        self.data = [node.toDict() for node in nodes]
+
+        removed = self.scene.removeItems([*connections, *nodes, *self.items])
+        self.connections = [
+            connection_record(item) for item in removed if isinstance(item, Connection)
+        ]
+
+    def undo(self):
+        with self.scene.bulkLoad():
+            for data in self.data:
+                node = self.factories[data["unique_id"]].createNode(
+                    data["node_type"], data=data
+                )
+                self.scene.addItem(node)
+
+            for item in self.items:
+                self.scene.addItem(item)
+
+            for record in self.connections:
+                create_connection(self.scene, record)
+
+        self.data = []
+
+    def approximateSize(self) -> int:
+        size = COMMAND_OVERHEAD + approximate_size(self.node_ids)
+        size += approximate_size(self.connections) + approximate_size(self.data)
+        size += ITEM_SIZE * len(self.items)
+        return size
+
+    def discard(self):
+        self.factories = {}
+        self.items = []
+        self.connections = []
+        self.data = []
+
+
+class MoveNodesCommand(UndoCommand):
     def __init__(
         self,
         nodes: typing.Union[typing.List[Node], typing.Set[Node]],
@@ -115,7 +447,8 @@ class MoveNodesCommand(QtGui.QUndoCommand):
     ):
         super().__init__(parent=parent)
         self.setText(f"Move ({len(nodes)}) Nodes")
-        self.nodes = nodes
+        self.scene = next((node.scene() for node in nodes), None)
+        self.node_ids = [node.uniqueId() for node in nodes]
         self.drag_id = drag_id or uuid.uuid4().hex
         self.offset = offset
 
@@ -128,16 +461,29 @@ class MoveNodesCommand(QtGui.QUndoCommand):
     def id(self):
         return MOVE_NODES_COMMAND_ID
 
+    def nodes(self) -> typing.List[Node]:
+        if self.scene is None:
+            return []
+
+        nodes = (self.scene.nodeById(node_id) for node_id in self.node_ids)
+        return [node for node in nodes if node is not None]
+
     def redo(self):
-        for node in self.nodes:
+        for node in self.nodes():
             node.moveBy(self.offset.x(), self.offset.y())
 
     def undo(self):
-        for node in self.nodes:
+        for node in self.nodes():
             node.moveBy(-self.offset.x(), -self.offset.y())
 
+    def approximateSize(self) -> int:
+        return COMMAND_OVERHEAD + approximate_size(self.node_ids)
+
+    def discard(self):
+        self.node_ids = []
 
-class CloneNodeCommand(QtGui.QUndoCommand):
+
+class CloneNodeCommand(UndoCommand):
     def __init__(
         self,
         scene: "NodeGraphScene",
@@ -150,11 +496,166 @@ class CloneNodeCommand(QtGui.QUndoCommand):
         self.setText("Clone Node")
         self.scene = scene
         self.factory = factory
-        self.node = factory.cloneNode(node)
-        self.node.setPos(position if position is not None else node.pos())
+
+        position = position if position is not None else node.pos()
+
+        # toDict returns the node's cached data, which mustn't be shared with the command.
+        self.data = copy.deepcopy(node.toDict())
+        self.data["unique_id"] = uuid.uuid4().hex
+        self.data["position"] = (position.x(), position.y())
 
     def redo(self):
-        self.scene.addItem(self.node)
+        node = self.factory.createNode(self.data["node_type"], data=self.data)
+        self.scene.addItem(node)
 
     def undo(self):
-        self.scene.removeItem(self.node)
+        node = self.scene.nodeById(self.data["unique_id"])
+        if node is not None:
+            # keep any changes made to the clone since it was created.
+            self.data = copy.deepcopy(node.toDict())
+            self.scene.removeItem(node)
+
+    def approximateSize(self) -> int:
+        return COMMAND_OVERHEAD + approximate_size(self.data)
+
+    def discard(self):
+        self.data = None
+
+
+class BudgetedUndoStack(QtGui.QUndoStack):
+    """
+    A QUndoStack which discards its oldest history once the approximate memory held by its commands exceeds a budget.
+
+    Discarded commands release their state and are made obsolete. Qt deletes obsolete commands instead of undoing
+    them, so undoing into discarded history has no effect. Commands which aren't UndoCommands are counted at a fixed
+    COMMAND_OVERHEAD.
+
+    Each command is sized once when it is pushed and the total is kept up to date as commands are added and
+    discarded, so a push costs the same however long the history is.
+    """
+
+    def __init__(self, memory_budget: int = 64 * 1024 * 1024, parent=None):
+        super().__init__(parent)
+        self.__memory_budget = memory_budget
+        self.__macro_depth = 0
+
+        # the size of each command on the stack by index, discarded commands count as 0.
+        self.__sizes: typing.List[int] = []
+        self.__memory_usage = 0
+
+        # the commands below this index have been discarded.
+        self.__discarded_count = 0
+
+    def memoryBudget(self) -> int:
+        return self.__memory_budget
+
+    def setMemoryBudget(self, memory_budget: int):
+        self.__memory_budget = memory_budget
+        self.enforceBudget()
+
+    def memoryUsage(self) -> int:
+        """
+        The approximate memory held by the commands which haven't been discarded, as sized when they were pushed.
+        """
+        return self.__memory_usage
+
+    def push(self, cmd: QtGui.QUndoCommand):
+        if self.__macro_depth:
+            # commands pushed inside a macro are sized with it when it ends.
+            super().push(cmd)
+            return
+
+        self.__sync()
+        index = self.index()
+        super().push(cmd)
+
+        # qt deletes every command above the index before adding cmd, and may merge cmd into the one below instead.
+        self.__truncate(index)
+        if self.count() > index:
+            self.__append(command_size(self.command(index)))
+        elif index > self.__discarded_count:
+            self.__resize(index - 1)
+
+        self.enforceBudget()
+
+    def beginMacro(self, text: str):
+        if not self.__macro_depth:
+            self.__sync()
+            index = self.index()
+            super().beginMacro(text)
+            self.__truncate(index)
+            self.__append(0)
+        else:
+            super().beginMacro(text)
+
+        self.__macro_depth += 1
+
+    def endMacro(self):
+        super().endMacro()
+        self.__macro_depth -= 1
+
+        if not self.__macro_depth:
+            self.__sync()
+            if self.count() > self.__discarded_count:
+                self.__resize(self.count() - 1)
+
+            self.enforceBudget()
+
+    def clear(self):
+        super().clear()
+        self.__sizes.clear()
+        self.__memory_usage = 0
+        self.__discarded_count = 0
+
+    def enforceBudget(self):
+        """
+        Discard the oldest commands until the rest fit in the budget. Only commands below index() are discarded, as
+        the ones above it can still be redone, and the newest command is always kept.
+        """
+        self.__sync()
+
+        limit = min(self.index(), len(self.__sizes) - 1)
+        while (
+            self.__memory_usage > self.__memory_budget
+            and self.__discarded_count < limit
+        ):
+            index = self.__discarded_count
+            command = self.command(index)
+            discard_command(command)
+            command.setObsolete(True)
+            command.setText(f"{command.text()} (discarded)")
+
+            self.__memory_usage -= self.__sizes[index]
+            self.__sizes[index] = 0
+            self.__discarded_count += 1
+
+    def __append(self, size: int):
+        self.__sizes.append(size)
+        self.__memory_usage += size
+
+    def __resize(self, index: int):
+        size = command_size(self.command(index))
+        self.__memory_usage += size - self.__sizes[index]
+        self.__sizes[index] = size
+
+    def __truncate(self, count: int):
+        self.__memory_usage -= sum(self.__sizes[count:])
+        del self.__sizes[count:]
+
+    def __sync(self):
+        # qt deletes discarded commands as they are undone or redone, and those are always the oldest on the stack.
+        removed = len(self.__sizes) - self.count()
+        if 0 < removed <= self.__discarded_count:
+            del self.__sizes[:removed]
+            self.__discarded_count -= removed
+        elif removed:
+            # something else changed the stack, e.g. clear called from c++, so size everything again.
+            commands = [self.command(i) for i in range(self.count())]
+            self.__sizes = [
+                0 if command.isObsolete() else command_size(command)
+                for command in commands
+            ]
+            self.__memory_usage = sum(self.__sizes)
+            self.__discarded_count = sum(
+                1 for command in commands if command.isObsolete()
+            )
@@ -6,16 +6,28 @@ import typing
 
 from PySide6 import QtGui, QtWidgets, QtCore
 
+from radium.model.graph import ConnectionDataDict
+from radium.nodegraph.graph.scene.profiling import profiled_paint
+
 if typing.TYPE_CHECKING:
     from radium.nodegraph.graph.scene.port import InputPort, OutputPort, Port
     from radium.nodegraph.graph.scene.node import Node
 
 
-class ConnectionDataDict(typing.TypedDict):
-    output_node: str
-    output_port: str
-    input_node: str
-    input_port: str
+def wire_points(
+    x1: float, y1: float, x4: float, y4: float
+) -> typing.Tuple[float, float, float, float, float, float, float, float]:
+    """
+    The four corners of the wire drawn from an output at (x1, y1) to an input at (x4, y4), as x, y pairs. Wires leave
+    the output vertically, cross over horizontally half way down and enter the input vertically. Ports which are
+    nearly aligned are joined by a straight vertical line.
+    """
+    y_mid = y1 + (y4 - y1) * 0.5
+
+    if abs(x4 - x1) > 5:
+        return x1, y1, x1, y_mid, x4, y_mid, x4, y4
+
+    return x1, y1, x1, y_mid, x1, y_mid, x1, y4
 
 
 class Connection(QtWidgets.QGraphicsPathItem):
@@ -25,38 +37,27 @@ class Connection(QtWidgets.QGraphicsPathItem):
         self.input_port: "InputPort" = input_port
         self.output_port: "OutputPort" = output_port
         self.setPen(QtGui.QPen(QtGui.QColor(24, 24, 24, 255), 6))
-        self.updatePath()
 
+    @profiled_paint("Connection")
     def paint(self, painter, option, widget=...):
         painter.setPen(self.pen())
         super().paint(painter, option, widget)
 
     def updatePath(self):
-        path = QtGui.QPainterPath()
-
-        x1 = self.output_port.scenePos().x()
-        y1 = self.output_port.scenePos().y()
-
-        x4 = self.input_port.scenePos().x()
-        y4 = self.input_port.scenePos().y()
-
-        dx = x4 - x1
-        dy = y4 - y1
+        """
+        Rebuild the path between the output and input port. This is called by the scene when the connection is added
+        and whenever either port moves.
+        """
+        output_pos = self.output_port.scenePos()
+        input_pos = self.input_port.scenePos()
+        x1, y1, x2, y2, x3, y3, x4, y4 = wire_points(
+            output_pos.x(), output_pos.y(), input_pos.x(), input_pos.y()
+        )
 
+        path = QtGui.QPainterPath()
         path.moveTo(x1, y1)
-
-        if abs(dx) > 5:
-            x2 = x1
-            y2 = y1 + (dy * 0.5)
-
-            x3 = x4
-            y3 = y1 + (dy * 0.5)
-
-            path.lineTo(x2, y2)
-            path.lineTo(x3, y3)
-        else:
-            x4 = x1
-
+        path.lineTo(x2, y2)
+        path.lineTo(x3, y3)
         path.lineTo(x4, y4)
 
         self.setPath(path)
@@ -0,0 +1,263 @@
+__all__ = ["ConnectionLayer"]
+"""
+A single graphics item which draws every connection in a scene, see NodeGraphScene.setConnectionLayerEnabled.
+"""
+
+import array
+import math
+import typing
+
+from PySide6 import QtCore, QtGui, QtWidgets
+
+from radium.nodegraph.graph.scene.connection import Connection, wire_points
+from radium.nodegraph.graph.scene.profiling import profiled_paint
+
+Cell = typing.Tuple[int, int]
+
+# the number of floats stored per connection, the x, y of each of the four corners returned by wire_points.
+_STRIDE = 8
+
+
+class ConnectionLayer(QtWidgets.QGraphicsItem):
+    """
+    Draws connections without adding them to the scene.
+
+    The corners of every wire are stored in one flat array of doubles, and each of a wire's three straight segments
+    is bucketed into a uniform grid. Painting only visits the cells the exposed rect overlaps and draws every visible
+    segment with a single drawLines call; picking only tests the wires in the cells around the cursor.
+
+    All connections are drawn with the layer's pen, a Connection's own pen is ignored.
+    """
+
+    def __init__(self, cell_size: float = 256.0, parent=None):
+        super().__init__(parent)
+        self.setZValue(-2)
+        self.setFlag(self.GraphicsItemFlag.ItemUsesExtendedStyleOption)
+
+        self.__pen = QtGui.QPen(QtGui.QColor(24, 24, 24, 255), 6)
+        self.__cell_size = float(cell_size)
+
+        # connections and their corners, packed so that slot i's corners are __points[i * _STRIDE:(i + 1) * _STRIDE].
+        self.__connections: typing.List[Connection] = []
+        self.__slots: typing.Dict[Connection, int] = {}
+        self.__points = array.array("d")
+
+        self.__cells: typing.Dict[Cell, typing.Dict[Connection, None]] = {}
+        self.__connection_cells: typing.Dict[Connection, typing.List[Cell]] = {}
+
+        # grows to cover every wire added, it is only reset by clear.
+        self.__bounding_rect = QtCore.QRectF()
+
+    def __len__(self):
+        return len(self.__connections)
+
+    def __contains__(self, connection: Connection) -> bool:
+        return connection in self.__slots
+
+    def pen(self) -> QtGui.QPen:
+        return self.__pen
+
+    def setPen(self, pen: QtGui.QPen):
+        self.prepareGeometryChange()
+        self.__pen = pen
+
+    def boundingRect(self) -> QtCore.QRectF:
+        margin = self.__pen.widthF() * 0.5
+        return self.__bounding_rect.adjusted(-margin, -margin, margin, margin)
+
+    def contains(self, point: QtCore.QPointF) -> bool:
+        return self.connectionAt(point) is not None
+
+    def shape(self) -> QtGui.QPainterPath:
+        # the full shape would be every wire, picking is done with contains and connectionAt instead.
+        path = QtGui.QPainterPath()
+        path.addRect(self.boundingRect())
+        return path
+
+    def addConnection(self, connection: Connection):
+        if connection in self.__slots:
+            self.updateConnection(connection)
+            return
+
+        self.__slots[connection] = len(self.__connections)
+        self.__connections.append(connection)
+        self.__points.extend(self.__wirePoints(connection))
+        self.__index(connection)
+
+    def removeConnection(self, connection: Connection):
+        slot = self.__slots.pop(connection, None)
+        if slot is None:
+            return
+
+        self.__unindex(connection, slot)
+
+        # keep the array packed by moving the last connection into the freed slot.
+        last_slot = len(self.__connections) - 1
+        if slot != last_slot:
+            last = self.__connections[last_slot]
+            self.__connections[slot] = last
+            self.__slots[last] = slot
+            start = slot * _STRIDE
+            self.__points[start : start + _STRIDE] = self.__points[
+                last_slot * _STRIDE :
+            ]
+
+        del self.__connections[last_slot]
+        del self.__points[last_slot * _STRIDE :]
+
+    def updateConnection(self, connection: Connection):
+        """
+        Re-read the connection's port positions, e.g. after one of them has moved.
+        """
+        slot = self.__slots.get(connection)
+        if slot is None:
+            return
+
+        self.__unindex(connection, slot)
+        start = slot * _STRIDE
+        self.__points[start : start + _STRIDE] = array.array(
+            "d", self.__wirePoints(connection)
+        )
+        self.__index(connection)
+
+    def clear(self):
+        self.prepareGeometryChange()
+        self.__connections.clear()
+        self.__slots.clear()
+        self.__points = array.array("d")
+        self.__cells.clear()
+        self.__connection_cells.clear()
+        self.__bounding_rect = QtCore.QRectF()
+
+    def connections(self) -> typing.List[Connection]:
+        return list(self.__connections)
+
+    @staticmethod
+    def __wirePoints(connection: Connection):
+        output_pos = connection.output_port.scenePos()
+        input_pos = connection.input_port.scenePos()
+        return wire_points(output_pos.x(), output_pos.y(), input_pos.x(), input_pos.y())
+
+    def __corners(self, slot: int) -> typing.Sequence[float]:
+        start = slot * _STRIDE
+        return self.__points[start : start + _STRIDE]
+
+    def __segmentCells(self, x1, y1, x2, y2) -> typing.Iterator[Cell]:
+        size = self.__cell_size
+        min_x, max_x = math.floor(min(x1, x2) / size), math.floor(max(x1, x2) / size)
+        min_y, max_y = math.floor(min(y1, y2) / size), math.floor(max(y1, y2) / size)
+
+        for cell_x in range(min_x, max_x + 1):
+            for cell_y in range(min_y, max_y + 1):
+                yield cell_x, cell_y
+
+    def __index(self, connection: Connection):
+        x1, y1, x2, y2, x3, y3, x4, y4 = self.__corners(self.__slots[connection])
+
+        # wires are made of axis aligned segments, so each one only covers a single row or column of cells.
+        cells = {}
+        for segment in ((x1, y1, x2, y2), (x2, y2, x3, y3), (x3, y3, x4, y4)):
+            for cell in self.__segmentCells(*segment):
+                cells[cell] = None
+
+        for cell in cells:
+            self.__cells.setdefault(cell, {})[connection] = None
+
+        self.__connection_cells[connection] = list(cells)
+
+        rect = self.__wireRect(x1, y1, x4, y4, y2)
+        if not self.__bounding_rect.contains(rect):
+            self.prepareGeometryChange()
+            self.__bounding_rect = self.__bounding_rect.united(rect)
+
+        self.update(rect)
+
+    def __unindex(self, connection: Connection, slot: int):
+        for cell in self.__connection_cells.pop(connection, ()):
+            connections = self.__cells[cell]
+            del connections[connection]
+            if not connections:
+                del self.__cells[cell]
+
+        x1, y1, x2, y2, x3, y3, x4, y4 = self.__corners(slot)
+        self.update(self.__wireRect(x1, y1, x4, y4, y2))
+
+    def __wireRect(self, x1, y1, x4, y4, y_mid) -> QtCore.QRectF:
+        margin = self.__pen.widthF() * 0.5
+        left, right = min(x1, x4), max(x1, x4)
+        top, bottom = min(y1, y4, y_mid), max(y1, y4, y_mid)
+        return QtCore.QRectF(left, top, right - left, bottom - top).adjusted(
+            -margin, -margin, margin, margin
+        )
+
+    def connectionsIn(self, rect: QtCore.QRectF) -> typing.List[Connection]:
+        """
+        The connections with a segment in a grid cell overlapped by rect. This may include a few wires just outside
+        rect, but never misses one inside it.
+        """
+        size = self.__cell_size
+        min_x, max_x = math.floor(rect.left() / size), math.floor(rect.right() / size)
+        min_y, max_y = math.floor(rect.top() / size), math.floor(rect.bottom() / size)
+
+        found = {}
+        if (max_x - min_x + 1) * (max_y - min_y + 1) > len(self.__cells):
+            # zoomed out, it is cheaper to visit the occupied cells than every cell in rect.
+            for (cell_x, cell_y), connections in self.__cells.items():
+                if min_x <= cell_x <= max_x and min_y <= cell_y <= max_y:
+                    found.update(connections)
+        else:
+            for cell_x in range(min_x, max_x + 1):
+                for cell_y in range(min_y, max_y + 1):
+                    found.update(self.__cells.get((cell_x, cell_y), ()))
+
+        return list(found)
+
+    def connectionAt(
+        self, pos: QtCore.QPointF, tolerance: float = None
+    ) -> typing.Optional[Connection]:
+        """
+        The connection whose wire is nearest pos, if it is within tolerance. This defaults to half the pen width
+        plus a couple of units so thin wires are still easy to click.
+        """
+        if tolerance is None:
+            tolerance = self.__pen.widthF() * 0.5 + 2.0
+
+        x, y = pos.x(), pos.y()
+        rect = QtCore.QRectF(x - tolerance, y - tolerance, tolerance * 2, tolerance * 2)
+
+        nearest = None
+        nearest_distance = tolerance
+        for connection in self.connectionsIn(rect):
+            x1, y1, x2, y2, x3, y3, x4, y4 = self.__corners(self.__slots[connection])
+            for segment in ((x1, y1, x2, y2), (x2, y2, x3, y3), (x3, y3, x4, y4)):
+                distance = _distance_to_segment(x, y, *segment)
+                if distance <= nearest_distance:
+                    nearest = connection
+                    nearest_distance = distance
+
+        return nearest
+
+    @profiled_paint("ConnectionLayer")
+    def paint(self, painter: QtGui.QPainter, option, widget=None):
+        lines = []
+        for connection in self.connectionsIn(option.exposedRect):
+            x1, y1, x2, y2, x3, y3, x4, y4 = self.__corners(self.__slots[connection])
+            lines.append(QtCore.QLineF(x1, y1, x2, y2))
+            lines.append(QtCore.QLineF(x2, y2, x3, y3))
+            lines.append(QtCore.QLineF(x3, y3, x4, y4))
+
+        painter.setPen(self.__pen)
+        painter.drawLines(lines)
+
+
+def _distance_to_segment(x, y, x1, y1, x2, y2) -> float:
+    dx = x2 - x1
+    dy = y2 - y1
+    length_squared = dx * dx + dy * dy
+
+    if length_squared == 0:
+        t = 0.0
+    else:
+        t = max(0.0, min(1.0, ((x - x1) * dx + (y - y1) * dy) / length_squared))
+
+    return math.hypot(x - (x1 + t * dx), y - (y1 + t * dy))
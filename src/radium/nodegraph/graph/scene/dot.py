@@ -5,6 +5,7 @@ by adding corners to nodegraph connections.
 
 from PySide6 import QtCore, QtGui, QtWidgets
 from radium.nodegraph.graph.scene.port import InputPort, OutputPort
+from radium.nodegraph.graph.scene.profiling import profiled_paint
 
 
 class DotInputPort(InputPort):
@@ -48,3 +49,7 @@ class Dot(QtWidgets.QGraphicsEllipseItem):
 
         self.input = DotInputPort("input", self)
         self.output = DotOutputPort("output", self)
+
+    @profiled_paint("Dot")
+    def paint(self, painter, option, widget=None):
+        super().paint(painter, option, widget)
@@ -11,6 +11,7 @@ from radium.nodegraph.graph.scene import commands
 from radium.nodegraph.graph.scene.node import Node
 from radium.nodegraph.graph.scene.dot import Dot
 from radium.nodegraph.graph.scene.connection import Connection
+from radium.nodegraph.graph.scene.connection_layer import ConnectionLayer
 from radium.nodegraph.graph.scene.port import InputPort, OutputPort, Port
 from radium.nodegraph.factory import NodeFactory
 
@@ -27,6 +28,17 @@ def sort_ports(a, b):
     raise TypeError(f"expected an input and an output port got: {a} & {b}")
 
 
+def can_connect(scene: "NodeGraphScene", start_port: Port, end_port: Port) -> bool:
+    """
+    True if the given ports are compatible and connecting them wouldn't create a cycle.
+    """
+    if end_port is None or not end_port.canConnectTo(start_port):
+        return False
+
+    output_port, input_port = sort_ports(start_port, end_port)
+    return not scene.wouldCreateCycle(output_port, input_port)
+
+
 def get_nearby_port(node: Node, pos: QtCore.QPointF, port_type):
     """
     Returns the port closest to the given position.
@@ -180,6 +192,9 @@ class ConnectionTool(Tool):
         - dragging between 2 ports to make a connection.
     """
 
+    # how close, in scene units, the cursor must be to a port to snap to it.
+    snap_radius = 24.0
+
     def __init__(self, controller: "SceneEventFilter"):
         super().__init__(controller)
         self.preview_line: PreviewLine = PreviewLine()
@@ -207,10 +222,34 @@ class ConnectionTool(Tool):
 
     def itemAt(self, pos: QtCore.QPointF):
         for item in self.controller.scene.items(pos):
-            if isinstance(item, PreviewLine):
+            if isinstance(item, (PreviewLine, PreviewRect)):
                 continue
             return item
 
+    def findEndPort(self, pos: QtCore.QPointF) -> typing.Optional[Port]:
+        """
+        The port a connection dragged to pos would be made to, or None if there isn't one it can connect to.
+
+        Ports within snap_radius of pos are found with the scene's port index, so the cursor doesn't need to be exactly
+        over a port. Otherwise the hovered dot or node is used.
+        """
+        scene = self.controller.scene
+
+        def predicate(port):
+            return can_connect(scene, self.start_port, port)
+
+        end_port = scene.nearestPort(pos, self.snap_radius, predicate)
+        if end_port is not None:
+            return end_port
+
+        scene_item = self.itemAt(pos)
+        if isinstance(scene_item, (Port, Dot, Node)):
+            end_port = get_potential_port(self.start_port, scene_item, pos)
+            if predicate(end_port):
+                return end_port
+
+        return None
+
     def mouseMoveEvent(self, event):
         """
         update the end point of the preview line
@@ -220,18 +259,12 @@ class ConnectionTool(Tool):
             QtCore.QLineF(self.start_port.scenePos(), event.scenePos())
         )
 
-        scene_item = self.itemAt(event.scenePos())
+        end_port = self.findEndPort(event.scenePos())
 
-        if isinstance(scene_item, (Port, Dot, Node)):
-            end_port = get_potential_port(self.start_port, scene_item, event.scenePos())
-            if end_port and end_port.canConnectTo(self.start_port):
-                self.preview_rect.setRect(
-                    end_port.boundingRect().adjusted(-5, -5, 5, 5)
-                )
-                self.preview_rect.setPos(end_port.scenePos())
-                self.preview_rect.show()
-            else:
-                self.preview_rect.hide()
+        if end_port is not None:
+            self.preview_rect.setRect(end_port.boundingRect().adjusted(-5, -5, 5, 5))
+            self.preview_rect.setPos(end_port.scenePos())
+            self.preview_rect.show()
         else:
             self.preview_rect.hide()
 
@@ -244,17 +277,15 @@ class ConnectionTool(Tool):
         self.controller.scene.removeItem(self.preview_line)
         self.controller.scene.removeItem(self.preview_rect)
 
-        scene_item = self.controller.scene.itemAt(event.scenePos(), QtGui.QTransform())
+        end_port = self.findEndPort(event.scenePos())
 
-        if isinstance(scene_item, (Port, Dot, Node)):
-            end_port = get_potential_port(self.start_port, scene_item, event.scenePos())
-            if end_port.canConnectTo(self.start_port):
-                output_port, input_port = sort_ports(self.start_port, end_port)
+        if end_port is not None:
+            output_port, input_port = sort_ports(self.start_port, end_port)
 
-                cmd = commands.CreateConnectionCommand(
-                    self.controller.scene, output_port, input_port
-                )
-                self.controller.undo_stack.push(cmd)
+            cmd = commands.CreateConnectionCommand(
+                self.controller.scene, output_port, input_port
+            )
+            self.controller.undo_stack.push(cmd)
 
         self.controller.clearTool()
         return True
@@ -456,9 +487,7 @@ class SelectAndMoveTool(Tool):
     def mousePressEvent(self, event: QtWidgets.QGraphicsSceneMouseEvent, item: Node):
         self.drag_id = uuid.uuid4().hex
 
-        selected = {
-            n for n in item.scene().items() if isinstance(n, Node) and n.isSelected()
-        }
+        selected = set(self.controller.scene.selectedNodes())
 
         shift_pressed = event.modifiers() & QtCore.Qt.KeyboardModifier.ShiftModifier
 
@@ -543,6 +572,10 @@ class SceneEventFilter(QtCore.QObject):
     def mousePressEvent(self, event):
         item = self.scene.itemAt(event.scenePos(), QtGui.QTransform())
 
+        # tools work with individual connections, not the layer drawing them.
+        if isinstance(item, ConnectionLayer):
+            item = item.connectionAt(event.scenePos())
+
         for tool in self.tools:
             if tool.match(event, item):
                 self._tool = tool
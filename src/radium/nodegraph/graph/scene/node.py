@@ -42,6 +42,7 @@ class Node(NodeBase):
         port = self.factory().createPort(InputPort, name, port_type)
         self.__inputs[name] = port
         port.setParentItem(self)
+        self.invalidateDataCache()
 
     def addOutput(self, name: str, datatype: str):
         if self.hasOutput(name):
@@ -50,3 +51,4 @@ class Node(NodeBase):
         port = self.factory().createPort(OutputPort, name, datatype)
         self.__outputs[name] = port
         port.setParentItem(self)
+        self.invalidateDataCache()
@@ -4,33 +4,37 @@ This module contains the base class for implementing nodes. The logic is split i
 to break down the class a little.
 """
 
+import itertools
+import math
 import typing
 import uuid
 import logging
 
 from PySide6 import QtCore, QtGui, QtWidgets
 
+from radium.model.graph import NodeDataDict
+from radium.model.parameter import Parameter
 from radium.nodegraph.graph.scene.port import InputPort, OutputPort
-from radium.nodegraph.parameters.parameter import Parameter
+from radium.nodegraph.graph.scene.profiling import profiled_paint
+from radium.nodegraph.graph.scene.style import NodeStyle
 
 if typing.TYPE_CHECKING:
-    from radium.nodegraph.graph.scene.port import PortDataDict
-    from radium.nodegraph.parameters.parameter import ParameterDataDict
     from radium.nodegraph.factory.factory import NodeFactory
 
 logger = logging.getLogger(__name__)
 
 MIN_NODE_WIDTH = 150.0
 
+_SELECTED_HAS_CHANGED = (
+    QtWidgets.QGraphicsItem.GraphicsItemChange.ItemSelectedHasChanged
+)
+_POSITION_HAS_CHANGED = (
+    QtWidgets.QGraphicsItem.GraphicsItemChange.ItemPositionHasChanged
+)
 
-class NodeDataDict(typing.TypedDict):
-    node_type: str
-    name: str
-    position: typing.Tuple[float, float]
-    unique_id: str
-    inputs: typing.Dict[str, "PortDataDict"]
-    outputs: typing.Dict[str, "PortDataDict"]
-    parameters: typing.Dict[str, "ParameterDataDict"]
+# cached node pixmaps are rendered at this many zoom levels per doubling of the level of detail.
+_RENDER_CACHE_STEPS = 2
+_render_cache_ids = itertools.count()
 
 
 class _NodeBase(QtWidgets.QGraphicsItem):
@@ -43,6 +47,9 @@ class _NodeBase(QtWidgets.QGraphicsItem):
     ):
         super().__init__(parent=parent)
         self.setFlag(QtWidgets.QGraphicsItem.GraphicsItemFlag.ItemIsMovable, True)
+        self.setFlag(
+            QtWidgets.QGraphicsItem.GraphicsItemFlag.ItemSendsGeometryChanges, True
+        )
 
         self.__name = name or type_name
         self.__node_type = type_name
@@ -52,6 +59,10 @@ class _NodeBase(QtWidgets.QGraphicsItem):
         self.__factory = factory
 
         self.__parameters: typing.Dict[str, Parameter] = {}
+        self.__parameter_callbacks: typing.Dict[str, typing.Callable] = {}
+
+        # the result of toDict is cached until something it depends on changes, see invalidateDataCache.
+        self.__data_cache: typing.Optional[NodeDataDict] = None
 
     def factory(self):
         return self.__factory
@@ -93,20 +104,29 @@ class _NodeBase(QtWidgets.QGraphicsItem):
         instance = self.__factory.createParameter(
             name, datatype, value, default, metadata
         )
-        scene = self.scene()
 
-        def callback(previous, current, i=instance, s=scene):
-            s.parameterChanged(self, i, previous, current)
+        def callback(previous, current, i=instance):
+            self.invalidateDataCache()
+            scene = self.scene()
+            if hasattr(scene, "parameterChanged"):
+                scene.parameterChanged.emit(self, i, previous, current)  # noqa
 
+        # observers are weakly referenced so the node holds on to the callback for the parameters lifetime.
+        self.__parameter_callbacks[name] = callback
         instance.valueChanged.subscribe(callback)
 
         self.__parameters[name] = instance
+        self.invalidateDataCache()
 
     def isEdited(self):
         return self.__edited
 
     def setEdited(self, edited: bool):
+        if edited == self.__edited:
+            return
+
         self.__edited = edited
+        self.__notifyStateChanged()
         if hasattr(self.scene(), "nodeEdited"):
             self.scene().nodeEdited.emit(self)  # noqa
 
@@ -116,34 +136,86 @@ class _NodeBase(QtWidgets.QGraphicsItem):
         return self.__viewed
 
     def setViewed(self, viewed: bool):
+        if viewed == self.__viewed:
+            return
+
         self.__viewed = viewed
+        self.__notifyStateChanged()
+        if hasattr(self.scene(), "nodeViewed"):
+            self.scene().nodeViewed.emit(self)  # noqa
+
         self.update()
 
     def setSelected(self, selected: bool):
+        if selected == self.isSelected():
+            return
+
         super().setSelected(selected)
         if hasattr(self.scene(), "nodeSelected"):
             self.scene().nodeSelected.emit(self)  # noqa
 
         self.update()
 
+    def itemChange(self, change: QtWidgets.QGraphicsItem.GraphicsItemChange, value):
+        # selection can also be changed by the scene directly e.g. clearSelection() so it is tracked here rather
+        # than in setSelected.
+        if change == _SELECTED_HAS_CHANGED:
+            self.__notifyStateChanged()
+        elif change == _POSITION_HAS_CHANGED:
+            self.invalidateDataCache()
+
+            scene = self.scene()
+            if hasattr(scene, "nodeMoved"):
+                scene.nodeMoved(self)  # noqa
+
+        return super().itemChange(change, value)
+
+    def __notifyStateChanged(self):
+        scene = self.scene()
+        if hasattr(scene, "updateNodeState"):
+            scene.updateNodeState(self)  # noqa
+
     def setName(self, label: str):
         self.__name = label
+        self.invalidateDataCache()
 
     def name(self):
         return self.__name
 
-    def toDict(self):
-        return NodeDataDict(
-            node_type=self.nodeType(),
-            name=self.name(),
-            position=(self.pos().x(), self.pos().y()),
-            unique_id=self.uniqueId(),
-            inputs={k: v.toDict() for k, v in self.inputs().items()},
-            outputs={k: v.toDict() for k, v in self.outputs().items()},
-            parameters={k: v.toDict() for k, v in self.parameters().items()},
-        )
+    def invalidateDataCache(self):
+        """
+        Discard the cached result of toDict. This must be called whenever anything that toDict serializes changes.
+        """
+        if self.__data_cache is None:
+            return
+
+        self.__data_cache = None
+
+        scene = self.scene()
+        if hasattr(scene, "invalidateNodeData"):
+            scene.invalidateNodeData(self)  # noqa
+
+    def toDict(self) -> NodeDataDict:
+        """
+        Serialize the node. The result is cached until the node changes, so the nested port and parameter dicts are
+        shared between calls and must be treated as read-only.
+        """
+        if self.__data_cache is None:
+            self.__data_cache = NodeDataDict(
+                node_type=self.nodeType(),
+                name=self.name(),
+                position=(self.pos().x(), self.pos().y()),
+                unique_id=self.uniqueId(),
+                inputs={k: v.toDict() for k, v in self.inputs().items()},
+                outputs={k: v.toDict() for k, v in self.outputs().items()},
+                parameters={k: v.toDict() for k, v in self.parameters().items()},
+            )
+
+        return self.__data_cache.copy()
 
     def loadDict(self, data: NodeDataDict) -> None:
+        self.invalidateDataCache()
+
         self.__node_type = data["node_type"]
         self.__name = data["name"]
         self.setPos(QtCore.QPointF(data["position"][0], data["position"][1]))
@@ -173,6 +245,8 @@ class _NodeBase(QtWidgets.QGraphicsItem):
                     **parameter_data["metadata"],
                 )
 
+        self.invalidateDataCache()
+
 
 class _DrawableNode(_NodeBase):
     """
@@ -199,49 +273,78 @@ class _DrawableNode(_NodeBase):
         self.__min_width = 150.0
         self.__spacing = 10.0
 
-        self.__palette = QtGui.QPalette()
-
-        self.__pen = QtGui.QPen(QtGui.QPen(QtGui.QColor(24, 24, 24, 255), 4))
-        self.__brush = QtGui.QBrush(QtGui.QBrush(QtGui.QColor(64, 64, 64, 255)))
-
-        self.__edited_brush = QtGui.QBrush(QtGui.QColor(255, 64, 64, 255))
-        self.__viewed_brush = QtGui.QBrush(QtGui.QColor(64, 64, 255, 255))
-
-        self.__font = QtGui.QFont()
-        self.__font_metrics = QtGui.QFontMetrics(self.__font)
+        # shared with every other node of the same type, see NodeStyle.
+        self.__style = NodeStyle.default()
+
+        self.__static_text = QtGui.QStaticText()
+        self.__static_text_pos = QtCore.QPointF()
+
+        # see setRenderCacheEnabled. pixmaps are stored in the global QPixmapCache under a key which includes
+        # __render_version, so bumping it invalidates every zoom level at once.
+        self.__render_cache_enabled = False
+        self.__render_cache_key = f"radium.node.{next(_render_cache_ids)}"
+        self.__render_version = 0
+
+    def isRenderCacheEnabled(self) -> bool:
+        return self.__render_cache_enabled
+
+    def setRenderCacheEnabled(self, enabled: bool):
+        """
+        When enabled the node is rendered once per zoom level into a pixmap, which is then drawn until anything it
+        depends on changes. This trades memory, bounded by QPixmapCache.cacheLimit(), for much cheaper repaints e.g.
+        when panning. The selection outline is drawn on top of the pixmap so selecting doesn't re-render it.
+        """
+        self.__render_cache_enabled = enabled
+        self.invalidateRenderCache()
+
+    def invalidateRenderCache(self):
+        """
+        Discard the cached pixmaps. This must be called whenever anything drawn by paintNode changes.
+        """
+        self.__render_version += 1
+        self.update()
 
     def cornerRadius(self):
         return self.__corner_radius
 
     def setCornerRadius(self, value):
         self.__corner_radius = value
-        self.update()
+        self.invalidateRenderCache()
+
+    def style(self) -> NodeStyle:
+        return self.__style
+
+    def setStyle(self, style: NodeStyle):
+        """
+        Share the given style. The individual setters (setFont, setPen, setBrush) replace the node's style with a
+        modified copy, so they never affect other nodes.
+        """
+        self.__style = style
+        self.__layout_required = True
+        self.invalidateRenderCache()
 
     def palette(self):
-        return self.__palette
+        return self.__style.palette
 
     def setFont(self, font: QtGui.QFont):
-        self.__font = font
-        self.__font_metrics = QtGui.QFontMetrics(self.__font)
-        self.__layout_required = True
-        self.update()
+        self.setStyle(self.__style.replace(font=font))
 
     def font(self):
-        return self.__font
+        return self.__style.font
 
     def setPen(self, pen: QtGui.QPen):
-        self.__pen = pen
-        self.update()
+        self.__style = self.__style.replace(pen=pen)
+        self.invalidateRenderCache()
 
     def pen(self):
-        return self.__pen
+        return self.__style.pen
 
     def setBrush(self, brush: QtGui.QBrush):
-        self.__brush = brush
-        self.update()
+        self.__style = self.__style.replace(brush=brush)
+        self.invalidateRenderCache()
 
     def brush(self):
-        return self.__brush
+        return self.__style.brush
 
     def boundingRect(self):
         return self.__bounding_rect
@@ -249,7 +352,19 @@ class _DrawableNode(_NodeBase):
     def setName(self, name: str):
         super().setName(name)
         self.__layout_required = True
-        self.update()
+        self.invalidateRenderCache()
+
+    def setEdited(self, edited: bool):
+        if edited != self.isEdited():
+            self.__render_version += 1
+
+        super().setEdited(edited)
+
+    def setViewed(self, viewed: bool):
+        if viewed != self.isViewed():
+            self.__render_version += 1
+
+        super().setViewed(viewed)
 
     def invalidateLayout(self):
         self.__layout_required = True
@@ -263,9 +378,16 @@ class _DrawableNode(_NodeBase):
 
         # everything is driven by the nodes name. we first calculate the texts bounding rect and then use that to drive
         # the dimensions of the rest of the node.
-        self.__text_rect = self.__font_metrics.boundingRect(self.name())
+        self.__text_rect = self.__style.font_metrics.boundingRect(self.name())
         self.__text_rect.moveCenter(QtCore.QPoint(0, 0))
 
+        self.__static_text.setText(self.name())
+        self.__static_text.prepare(QtGui.QTransform(), self.__style.font)
+        text_size = self.__static_text.size()
+        self.__static_text_pos = QtCore.QPointF(
+            -text_size.width() * 0.5, -text_size.height() * 0.5
+        )
+
         # calculate the w/h of of the left/right indicator boxes
         indicator_rect_side = self.__text_rect.height()
 
@@ -318,12 +440,64 @@ class _DrawableNode(_NodeBase):
         )
 
         self.__layout_required = False
+        self.__render_version += 1
 
     def paint(self, painter: QtGui.QPainter, option, widget=None):
         self.calculateLayout()
 
         lod = option.levelOfDetailFromTransform(painter.transform())
 
+        if self.__render_cache_enabled:
+            self.__paintCached(painter, lod, widget)
+        else:
+            self.paintNode(painter, lod)
+
+    def __paintCached(self, painter: QtGui.QPainter, lod: float, widget=None):
+        # round the level of detail up to a zoom bucket, so zooming only re-renders when crossing into a new one and
+        # the pixmap is never drawn at more than its native resolution.
+        bucket = math.ceil(math.log2(max(lod, 1e-3)) * _RENDER_CACHE_STEPS)
+        scale = 2.0 ** (bucket / _RENDER_CACHE_STEPS)
+        ratio = widget.devicePixelRatioF() if widget is not None else 1.0
+
+        # leave room for the half of the outline which is drawn outside the bounding rect.
+        margin = self.__style.pen.widthF() * 0.5
+        source_rect = self.__bounding_rect.adjusted(-margin, -margin, margin, margin)
+
+        key = f"{self.__render_cache_key}:{self.__render_version}:{bucket}:{ratio}"
+        pixmap = QtGui.QPixmapCache.find(key)
+
+        if pixmap is None:
+            size = source_rect.size() * scale * ratio
+            pixmap = QtGui.QPixmap(
+                max(1, math.ceil(size.width())), max(1, math.ceil(size.height()))
+            )
+            pixmap.fill(QtCore.Qt.GlobalColor.transparent)
+
+            pixmap_painter = QtGui.QPainter(pixmap)
+            pixmap_painter.setRenderHints(painter.renderHints())
+            pixmap_painter.scale(
+                pixmap.width() / source_rect.width(),
+                pixmap.height() / source_rect.height(),
+            )
+            pixmap_painter.translate(-source_rect.topLeft())
+            self.paintNode(pixmap_painter, scale)
+            pixmap_painter.end()
+
+            QtGui.QPixmapCache.insert(key, pixmap)
+
+        smooth = QtGui.QPainter.RenderHint.SmoothPixmapTransform
+        was_smooth = painter.testRenderHint(smooth)
+        painter.setRenderHint(smooth, True)
+        painter.drawPixmap(source_rect, pixmap, QtCore.QRectF(pixmap.rect()))
+        painter.setRenderHint(smooth, was_smooth)
+
+    def paintNode(self, painter: QtGui.QPainter, lod: float):
+        """
+        Draw the node at the given level of detail.
+        """
+        style = self.__style
+        palette = style.palette
+
         # create a clipping rect for the node with round corners if the border radius is above 0
         if self.__corner_radius and lod > 0.5:
             path = QtGui.QPainterPath()
@@ -334,19 +508,19 @@ class _DrawableNode(_NodeBase):
 
         # draw the nodes background
         painter.setPen(QtCore.Qt.PenStyle.NoPen)
-        painter.setBrush(self.__brush)
+        painter.setBrush(style.brush)
         painter.drawRect(self.__bounding_rect)
 
         if self.isEdited():
-            painter.setBrush(self.__edited_brush)
+            painter.setBrush(style.edited_brush)
             painter.drawRect(self.__edited_rect)
 
         if self.isViewed():
-            painter.setBrush(self.__viewed_brush)
+            painter.setBrush(style.viewed_brush)
             painter.drawRect(self.__viewed_rect)
 
         if lod > 0.6:
-            painter.setPen(self.__palette.color(self.__palette.ColorRole.Window))
+            painter.setPen(palette.color(palette.ColorRole.Window))
             painter.drawLine(
                 self.__edited_rect.topLeft(), self.__edited_rect.bottomLeft()
             )
@@ -356,16 +530,15 @@ class _DrawableNode(_NodeBase):
 
         if lod > 0.3:
             painter.setOpacity(lod)
-            painter.setPen(self.__palette.color(self.__palette.ColorRole.Text))
-            painter.drawText(
-                self.__text_rect, self.name(), QtCore.Qt.AlignmentFlag.AlignCenter
-            )
+            painter.setPen(palette.color(palette.ColorRole.Text))
+            painter.setFont(style.font)
+            painter.drawStaticText(self.__static_text_pos, self.__static_text)
 
         if lod > 0.4:
             painter.setClipping(False)
             painter.setBrush(QtCore.Qt.BrushStyle.NoBrush)
 
-            painter.setPen(self.__pen)
+            painter.setPen(style.pen)
             painter.drawRoundedRect(
                 self.__bounding_rect, self.__corner_radius, self.__corner_radius
             )
@@ -386,12 +559,7 @@ class _SelectableNode(_DrawableNode):
         super().__init__(factory, type_name, name=name, parent=parent)
         self.setFlag(QtWidgets.QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, True)
 
-        pal = self.palette()
-
         self.__selection_margin = 5.0
-        self.__selection_pen = QtGui.QPen(
-            pal.color(pal.ColorRole.Highlight), 2.0, QtCore.Qt.PenStyle.DotLine
-        )
         self.__bounding_rect = QtCore.QRectF()
         self.__shape = QtGui.QPainterPath()
 
@@ -423,11 +591,12 @@ class _SelectableNode(_DrawableNode):
     def shape(self):
         return self.__shape
 
+    @profiled_paint("Node")
     def paint(self, painter: QtGui.QPainter, option, widget=None):
         super().paint(painter, option, widget)
 
         if self.isSelected():
-            painter.setPen(self.__selection_pen)
+            painter.setPen(self.style().selection_pen)
             painter.setBrush(QtCore.Qt.BrushStyle.NoBrush)
             painter.drawRect(self.boundingRect())
 
@@ -7,13 +7,20 @@ import sys
 import typing
 from PySide6 import QtGui, QtWidgets, QtCore
 
+from radium.model.graph import PortDataDict
+from radium.nodegraph.graph.scene.profiling import profiled_paint
+from radium.nodegraph.graph.scene.style import PortStyle
+
 if typing.TYPE_CHECKING:
+    from radium.model.compatibility import PortCompatibility
     from radium.nodegraph.factory.prototypes import PortType
 
 
-class PortDataDict(typing.TypedDict):
-    datatype: str
-    name: str
+# resolved once, itemChange is called for every change on every port.
+_SCENE_POSITION_HAS_CHANGED = (
+    QtWidgets.QGraphicsItem.GraphicsItemChange.ItemScenePositionHasChanged
+)
+_SCENE_HAS_CHANGED = QtWidgets.QGraphicsItem.GraphicsItemChange.ItemSceneHasChanged
 
 
 class Port(QtWidgets.QGraphicsItem):
@@ -27,26 +34,47 @@ class Port(QtWidgets.QGraphicsItem):
         super().__init__(parent=parent)
         self.__index = 0
         self.__name = name
-        self.__pen = QtGui.QPen()
-        self.__brush = QtGui.QBrush()
+        self.__style = self.defaultStyle()
         self.__datatype = datatype
         self.__max_connections = 1 if max_connections is None else max_connections
 
+        # set by the factory, see datatypes_compatible.
+        self.__compatibility: typing.Optional["PortCompatibility"] = None
+        self.__type_id: typing.Optional[int] = None
+
         self.setFlag(self.GraphicsItemFlag.ItemNegativeZStacksBehindParent)
         self.setFlag(self.GraphicsItemFlag.ItemSendsScenePositionChanges)
         self.setZValue(-1)
 
+    @classmethod
+    def defaultStyle(cls) -> PortStyle:
+        """
+        The style shared by ports of this class which weren't created from a PortType.
+        """
+        return _DEFAULT_STYLE
+
+    def style(self) -> PortStyle:
+        return self.__style
+
+    def setStyle(self, style: PortStyle):
+        """
+        Share the given style. setPen and setBrush replace the port's style with a modified copy, so they never affect
+        other ports.
+        """
+        self.__style = style
+        self.update()
+
     def brush(self):
-        return self.__brush
+        return self.__style.brush
 
     def setBrush(self, brush):
-        self.__brush = brush
+        self.setStyle(self.__style.replace(brush=brush))
 
     def pen(self):
-        return self.__pen
+        return self.__style.pen
 
     def setPen(self, pen):
-        self.__pen = pen
+        self.setStyle(self.__style.replace(pen=pen))
 
     def setIndex(self, index: int):
         self.__index = index
@@ -55,14 +83,19 @@ class Port(QtWidgets.QGraphicsItem):
         return self.__index
 
     def itemChange(self, change: QtWidgets.QGraphicsItem.GraphicsItemChange, value):
-        if (
-            change
-            == QtWidgets.QGraphicsItem.GraphicsItemChange.ItemScenePositionHasChanged
-        ):
+        if change == _SCENE_POSITION_HAS_CHANGED:
             scene = self.scene()
             if hasattr(scene, "updatePortConnections"):
                 scene.updatePortConnections(self)
 
+            if hasattr(scene, "portMoved"):
+                scene.portMoved(self)
+
+        elif change == _SCENE_HAS_CHANGED:
+            # e.g. a port added to a node which is already in a scene.
+            if hasattr(value, "portMoved"):
+                value.portMoved(self)
+
         return super().itemChange(change, value)
 
     def maxConnections(self):
@@ -89,6 +122,25 @@ class Port(QtWidgets.QGraphicsItem):
     def datatype(self):
         return self.__datatype
 
+    def compatibility(self) -> typing.Optional["PortCompatibility"]:
+        return self.__compatibility
+
+    def setCompatibility(self, compatibility: typing.Optional["PortCompatibility"]):
+        self.__compatibility = compatibility
+        self.__updateTypeId()
+
+    def typeId(self) -> typing.Optional[int]:
+        """
+        The interned id of this port's datatype in its compatibility table.
+        """
+        return self.__type_id
+
+    def __updateTypeId(self):
+        if self.__compatibility is None:
+            self.__type_id = None
+        else:
+            self.__type_id = self.__compatibility.typeId(self.__datatype)
+
     def name(self):
         return self.__name
 
@@ -101,6 +153,11 @@ class Port(QtWidgets.QGraphicsItem):
     def loadDict(self, data: PortDataDict):
         self.__name = data["name"]
         self.__datatype = data["datatype"]
+        self.__updateTypeId()
+
+        node = self.parentItem()
+        if hasattr(node, "invalidateDataCache"):
+            node.invalidateDataCache()  # noqa
 
     @classmethod
     def fromPrototype(
@@ -112,6 +169,27 @@ class Port(QtWidgets.QGraphicsItem):
         return instance
 
 
+def datatypes_compatible(output_port: Port, input_port: Port) -> bool:
+    """
+    True if the output's datatype can be connected to the input's datatype.
+
+    Ports sharing a compatibility table are checked with a single table lookup, ports created without a factory
+    (e.g. on a Dot) are checked against the other port's table, and if neither has one anything goes.
+    """
+    compatibility = output_port.compatibility()
+    if compatibility is not None and compatibility is input_port.compatibility():
+        return compatibility.canConvertId(output_port.typeId(), input_port.typeId())
+
+    compatibility = compatibility or input_port.compatibility()
+    if compatibility is None:
+        return True
+
+    return compatibility.canConvert(output_port.datatype(), input_port.datatype())
+
+
+_DEFAULT_STYLE = PortStyle(pen=QtGui.QPen(), brush=QtGui.QBrush())
+
+
 class OutputPort(Port):
     def __init__(self, name, datatype, parent=None):
         super().__init__(
@@ -120,9 +198,12 @@ class OutputPort(Port):
             max_connections=sys.maxsize,
             parent=parent,
         )
-        self.setBrush(QtGui.QColor(64, 64, 64))
         self.__bounding_rect = QtCore.QRectF(-10, -6, 20, 12)
 
+    @classmethod
+    def defaultStyle(cls) -> PortStyle:
+        return _DEFAULT_OUTPUT_STYLE
+
     def boundingRect(self):
         return self.__bounding_rect
 
@@ -130,8 +211,9 @@ class OutputPort(Port):
         if not isinstance(port, InputPort):
             return False
 
-        return super().canConnectTo(port)
+        return super().canConnectTo(port) and datatypes_compatible(self, port)
 
+    @profiled_paint("Port")
     def paint(self, painter, option, widget=None):
         painter.setPen(QtCore.Qt.PenStyle.NoPen)
         painter.setBrush(self.brush())
@@ -157,18 +239,22 @@ class OutputPort(Port):
 class InputPort(Port):
     def __init__(self, name, datatype, parent=None):
         super().__init__(name, datatype, max_connections=1, parent=parent)
-        self.setBrush(QtGui.QColor(127, 127, 150))
         self.__bounding_rect = QtCore.QRectF(-10, -6, 20, 12)
 
     def canConnectTo(self, port):
         if not isinstance(port, OutputPort):
             return False
 
-        return super().canConnectTo(port)
+        return super().canConnectTo(port) and datatypes_compatible(port, self)
+
+    @classmethod
+    def defaultStyle(cls) -> PortStyle:
+        return _DEFAULT_INPUT_STYLE
 
     def boundingRect(self):
         return self.__bounding_rect
 
+    @profiled_paint("Port")
     def paint(self, painter, option, widget=None):
         painter.setPen(QtCore.Qt.PenStyle.NoPen)
         painter.setBrush(self.brush())
@@ -190,3 +276,11 @@ class InputPort(Port):
         painter.drawArc(self.__bounding_rect, start_angle, span_angle)
         painter.drawLine(box_rect.topLeft(), box_rect.bottomLeft())
         painter.drawLine(box_rect.topRight(), box_rect.bottomRight())
+
+
+_DEFAULT_OUTPUT_STYLE = PortStyle(
+    pen=QtGui.QPen(), brush=QtGui.QBrush(QtGui.QColor(64, 64, 64))
+)
+_DEFAULT_INPUT_STYLE = PortStyle(
+    pen=QtGui.QPen(), brush=QtGui.QBrush(QtGui.QColor(127, 127, 150))
+)
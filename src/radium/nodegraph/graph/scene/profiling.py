@@ -0,0 +1,214 @@
+__all__ = ["PaintProfiler", "profiled_paint", "profiled_section"]
+"""
+Cheap timing of frames, item paints and other hot paths, see NodeGraphView.setProfilingEnabled.
+
+Paint methods and hot paths are wrapped with profiled_paint / profiled_section. While no profiler is enabled the
+wrappers only check a module global before calling through, so they can be left in place permanently.
+"""
+
+import collections
+import functools
+import json
+import math
+import time
+import typing
+
+# every enabled profiler, sections are recorded into all of them as they usually run outside of a paint.
+_enabled_profilers: typing.List["PaintProfiler"] = []
+
+# the profiler of the view which is currently painting, item paints are recorded into it.
+_painting_profiler: typing.Optional["PaintProfiler"] = None
+
+
+def profiled_paint(category: str):
+    """
+    Decorate a QGraphicsItem.paint method so its calls are counted and timed under the given category, e.g. "Node".
+    Only the outermost paint method of a class hierarchy should be decorated, otherwise calls are counted twice.
+    """
+
+    def decorator(paint):
+        @functools.wraps(paint)
+        def wrapper(self, painter, option, widget=None):
+            profiler = _painting_profiler
+            if profiler is None:
+                return paint(self, painter, option, widget)
+
+            start = time.perf_counter()
+            try:
+                return paint(self, painter, option, widget)
+            finally:
+                profiler.recordPaint(category, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+def profiled_section(name: str):
+    """
+    Decorate a function so its calls are counted and timed as the named section by every enabled profiler.
+    """
+
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled_profilers:
+                return function(*args, **kwargs)
+
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                for profiler in _enabled_profilers:
+                    profiler.recordSection(name, elapsed)
+
+        return wrapper
+
+    return decorator
+
+
+class PaintProfiler:
+    """
+    Collects frame times, the number of items painted per frame and the cumulative time spent painting each category
+    of item or running each section.
+
+    Frame times and item counts are kept for the last `window` frames, paint and section totals accumulate until
+    reset is called.
+    """
+
+    def __init__(self, window: int = 300):
+        self.__enabled = False
+
+        self.__frame_times: typing.Deque[float] = collections.deque(maxlen=window)
+        self.__frame_items: typing.Deque[int] = collections.deque(maxlen=window)
+        self.__frame_count = 0
+
+        # category -> [calls, seconds]
+        self.__paints: typing.Dict[str, typing.List] = {}
+        self.__sections: typing.Dict[str, typing.List] = {}
+
+        # state of the frame being painted, see beginFrame/endFrame.
+        self.__frame_start: typing.Optional[float] = None
+        self.__items_painted = 0
+        self.__previous_profiler: typing.Optional[PaintProfiler] = None
+
+    def isEnabled(self) -> bool:
+        return self.__enabled
+
+    def setEnabled(self, enabled: bool):
+        if enabled == self.__enabled:
+            return
+
+        self.__enabled = enabled
+        if enabled:
+            _enabled_profilers.append(self)
+        else:
+            _enabled_profilers.remove(self)
+
+    def reset(self):
+        self.__frame_times.clear()
+        self.__frame_items.clear()
+        self.__frame_count = 0
+        self.__paints.clear()
+        self.__sections.clear()
+
+    def beginFrame(self):
+        """
+        Start timing a frame, item paints are recorded into this profiler until endFrame is called.
+        """
+        global _painting_profiler
+
+        if not self.__enabled:
+            return
+
+        self.__previous_profiler = _painting_profiler
+        _painting_profiler = self
+
+        self.__items_painted = 0
+        self.__frame_start = time.perf_counter()
+
+    def endFrame(self):
+        global _painting_profiler
+
+        if self.__frame_start is None:
+            return
+
+        self.__frame_times.append(time.perf_counter() - self.__frame_start)
+        self.__frame_items.append(self.__items_painted)
+        self.__frame_count += 1
+        self.__frame_start = None
+
+        _painting_profiler = self.__previous_profiler
+        self.__previous_profiler = None
+
+    def recordPaint(self, category: str, seconds: float):
+        self.__items_painted += 1
+        self.__record(self.__paints, category, seconds)
+
+    def recordSection(self, name: str, seconds: float):
+        self.__record(self.__sections, name, seconds)
+
+    @staticmethod
+    def __record(totals: typing.Dict[str, typing.List], key: str, seconds: float):
+        total = totals.get(key)
+        if total is None:
+            totals[key] = [1, seconds]
+        else:
+            total[0] += 1
+            total[1] += seconds
+
+    def frameTime(self, percentile: float) -> float:
+        """
+        The given percentile (0-100) of the recent frame times, in seconds.
+        """
+        return _percentile(self.__frame_times, percentile)
+
+    def stats(self) -> typing.Dict[str, typing.Any]:
+        """
+        A JSON serializable summary of everything recorded. Times are in milliseconds.
+        """
+        return {
+            "frames": self.__frame_count,
+            "frame_time_ms": {
+                "p50": _percentile(self.__frame_times, 50) * 1000.0,
+                "p95": _percentile(self.__frame_times, 95) * 1000.0,
+                "max": max(self.__frame_times, default=0.0) * 1000.0,
+            },
+            "items_per_frame": {
+                "p50": _percentile(self.__frame_items, 50),
+                "p95": _percentile(self.__frame_items, 95),
+                "last": self.__frame_items[-1] if self.__frame_items else 0,
+            },
+            "paint": _summarize(self.__paints),
+            "sections": _summarize(self.__sections),
+        }
+
+    def toJson(self, indent: int = 2) -> str:
+        return json.dumps(self.stats(), indent=indent)
+
+    def saveJson(self, path: str):
+        with open(path, "w") as f:
+            f.write(self.toJson())
+
+
+def _percentile(values: typing.Iterable[float], percentile: float) -> float:
+    values = sorted(values)
+    if not values:
+        return 0
+
+    # nearest rank.
+    rank = max(math.ceil(percentile / 100.0 * len(values)), 1)
+    return values[rank - 1]
+
+
+def _summarize(totals: typing.Dict[str, typing.List]) -> typing.Dict[str, dict]:
+    summary = {}
+    for key, (calls, seconds) in sorted(totals.items()):
+        summary[key] = {
+            "calls": calls,
+            "total_ms": seconds * 1000.0,
+            "mean_us": seconds / calls * 1e6,
+        }
+
+    return summary
@@ -1,25 +1,41 @@
+import contextlib
+import types
 import typing
 from PySide6 import QtWidgets, QtCore
 
-from radium.nodegraph.graph.scene.connection import Connection, ConnectionDataDict
+from radium.model.adjacency import AdjacencyIndex
+from radium.model.graph import (
+    ConnectionDataDict,
+    GraphModel,
+    NodeDataDict,
+    SceneDataDict,
+)
+from radium.model.parameter import Parameter
+from radium.model.topology import TopologicalOrder
+from radium.nodegraph.graph.scene.connection import Connection
+from radium.nodegraph.graph.scene.connection_layer import ConnectionLayer
 from radium.nodegraph.graph.scene.port import Port
-from radium.nodegraph.graph.scene.node import Node, NodeDataDict
-from radium.nodegraph.parameters.parameter import Parameter
+from radium.nodegraph.graph.scene.profiling import profiled_section
+from radium.nodegraph.graph.scene.node import Node
+from radium.nodegraph.graph.scene.spatial import SpatialHash
 
 if typing.TYPE_CHECKING:
     from radium.nodegraph.factory import NodeFactory
 
 
-class SceneDataDict(typing.TypedDict):
-    nodes: typing.Dict[str, NodeDataDict]
-    connections: typing.List[ConnectionDataDict]
-
-
 class NodeGraphScene(QtWidgets.QGraphicsScene):
     itemAdded = QtCore.Signal(QtWidgets.QGraphicsItem)
     itemRemoved = QtCore.Signal(QtWidgets.QGraphicsItem)
+    itemsAdded = QtCore.Signal(list)
+    itemsRemoved = QtCore.Signal(list)
+    nodesMoved = QtCore.Signal(list)
+    cleared = QtCore.Signal()
+
+    connectionAdded = QtCore.Signal(Connection)
+    connectionRemoved = QtCore.Signal(Connection)
 
     nodeEdited = QtCore.Signal(Node)
+    nodeViewed = QtCore.Signal(Node)
     nodeSelected = QtCore.Signal(Node)
 
     selectionChanged = QtCore.Signal()
@@ -28,87 +44,608 @@ class NodeGraphScene(QtWidgets.QGraphicsScene):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setSceneRect(-10000, -10000, 20000, 20000)
-        self.__port_to_connections: typing.Dict[Port, typing.List[Connection]] = {}
+
+        # connections indexed by port and node, see AdjacencyIndex.
+        self.__adjacency = AdjacencyIndex()
+
+        # keeps connections acyclic, see TopologicalOrder.
+        self.__order = TopologicalOrder(self.__adjacency)
+
+        # every connection in the scene, mapped to its serialized form once toDict has been called.
+        self.__connections: typing.Dict[
+            Connection, typing.Optional[ConnectionDataDict]
+        ] = {}
+
+        # nodes are tracked incrementally as they are added/removed so that lookups don't need to scan items().
+        self.__nodes: typing.Dict[str, Node] = {}
+        self.__viewed_nodes: typing.Set[Node] = set()
+        self.__edited_nodes: typing.Set[Node] = set()
+        self.__selected_nodes: typing.Set[Node] = set()
+
+        # serialized node data keyed by unique id, only nodes in __dirty_node_data are re-serialized by toDict.
+        self.__node_data: typing.Dict[str, NodeDataDict] = {}
+        self.__dirty_node_data: typing.Set[Node] = set()
+
+        # connections whose ports have moved are rebuilt at most once per frame, see flushConnectionUpdates.
+        self.__dirty_connections: typing.Set[Connection] = set()
+        self.__flush_timer = QtCore.QTimer(self)
+        self.__flush_timer.setSingleShot(True)
+        self.__flush_timer.setInterval(0)
+        self.__flush_timer.timeout.connect(self.flushConnectionUpdates)
+
+        # nodes moved since nodesMoved was last emitted, see nodeMoved.
+        self.__moved_nodes: typing.Dict[Node, None] = {}
+        self.__moved_nodes_timer = QtCore.QTimer(self)
+        self.__moved_nodes_timer.setSingleShot(True)
+        self.__moved_nodes_timer.setInterval(0)
+        self.__moved_nodes_timer.timeout.connect(self.__emitNodesMoved)
+
+        # the scene position of every port on a node, re-bucketed lazily by __flushPortIndex. see nearestPort.
+        self.__port_index = SpatialHash(cell_size=64.0)
+        self.__moved_ports: typing.Set[Port] = set()
+
+        # when set, connections are drawn by this item instead of being added to the scene. see setConnectionLayerEnabled.
+        self.__connection_layer: typing.Optional[ConnectionLayer] = None
+
+        # state used while bulk loading, see beginBulkLoad/endBulkLoad.
+        self.__bulk_load_depth = 0
+        self.__bulk_items: typing.List[QtWidgets.QGraphicsItem] = []
+        self.__bulk_index_method = self.itemIndexMethod()
+        self.__bulk_signals_blocked = False
 
     def addItem(self, item):
         if isinstance(item, Connection):
             self.addConnection(item)
         else:
             super().addItem(item)
-        self.itemAdded.emit(item)
+            if isinstance(item, Node):
+                self.__registerNode(item)
+
+        if self.__bulk_load_depth:
+            self.__bulk_items.append(item)
+        else:
+            self.itemAdded.emit(item)
 
     def removeItem(self, item):
+        """
+        Remove the item from the scene. Removing a node or dot removes the connections attached to it first.
+        """
         if isinstance(item, Connection):
             self.removeConnection(item)
         else:
+            for connection in self.attachedConnections([item]):
+                self.removeConnection(connection)
+
             super().removeItem(item)
+            self.__unregisterItem(item)
 
         self.itemRemoved.emit(item)
 
-    def nodes(self):
-        return [n for n in self.items() if isinstance(n, Node)]
+    def removeItems(
+        self, items: typing.Iterable[QtWidgets.QGraphicsItem]
+    ) -> typing.List[QtWidgets.QGraphicsItem]:
+        """
+        Remove the items and every connection attached to them in one pass.
+
+        Signals are blocked while removing, then itemsRemoved is emitted once with everything removed instead of
+        itemRemoved/connectionRemoved per item. Returns the removed items, connections first.
+        """
+        # connections drawn by the connection layer aren't scene items, so they are looked up instead.
+        connections = {}
+        others = []
+        for item in dict.fromkeys(items):
+            if isinstance(item, Connection):
+                if item in self.__connections:
+                    connections[item] = None
+            elif item.scene() is self:
+                others.append(item)
+
+        connections.update(self.attachedConnections(others))
+        removed = [*connections, *others]
+        if not removed:
+            return []
+
+        # removing an item from the bsp tree costs roughly as much as re-indexing thirty, so when a large part of the
+        # scene is removed the index is dropped and rebuilt in one pass afterwards.
+        index_method = self.itemIndexMethod()
+        rebuild_index = (
+            index_method != QtWidgets.QGraphicsScene.ItemIndexMethod.NoIndex
+            and len(removed) * 30 > len(self.__nodes) + len(self.__connections)
+        )
+        if rebuild_index:
+            self.setItemIndexMethod(QtWidgets.QGraphicsScene.ItemIndexMethod.NoIndex)
+
+        signals_blocked = self.blockSignals(True)
+        try:
+            for connection in connections:
+                self.__detachConnection(connection)
+
+            for item in others:
+                super().removeItem(item)
+                self.__unregisterItem(item)
+        finally:
+            self.blockSignals(signals_blocked)
+            if rebuild_index:
+                self.setItemIndexMethod(index_method)
+
+        self.itemsRemoved.emit(removed)
+        return removed
+
+    def attachedConnections(
+        self, items: typing.Iterable[QtWidgets.QGraphicsItem]
+    ) -> typing.Dict[Connection, None]:
+        """
+        The connections to any port of the given nodes or dots, as an insertion ordered dict used as a set.
+        """
+        connections = {}
+        connection_count = self.__adjacency.connectionCount
+        port_connections = self.__adjacency.connections
+
+        for item in items:
+            if isinstance(item, Connection):
+                continue
+
+            for port in self.__itemPorts(item):
+                if connection_count(port):
+                    connections.update(dict.fromkeys(port_connections(port)))
+
+        return connections
+
+    def clear(self):
+        connection_layer_enabled = self.isConnectionLayerEnabled()
+        self.__connection_layer = None
+
+        super().clear()
+        self.__adjacency.clear()
+        self.__order.clear()
+        self.__port_index.clear()
+        self.__moved_ports.clear()
+        self.__moved_nodes.clear()
+        self.__connections.clear()
+        self.__dirty_connections.clear()
+        self.__nodes.clear()
+        self.__node_data.clear()
+        self.__dirty_node_data.clear()
+        self.__viewed_nodes.clear()
+        self.__edited_nodes.clear()
+        self.__selected_nodes.clear()
+
+        # the layer item was deleted along with everything else.
+        if connection_layer_enabled:
+            self.setConnectionLayerEnabled(True)
+
+        self.cleared.emit()
+
+    def isBulkLoading(self) -> bool:
+        return self.__bulk_load_depth > 0
+
+    def beginBulkLoad(self):
+        """
+        Begin a bulk load. Until the matching endBulkLoad signals are blocked, the spatial index is disabled and
+        connection paths / node layouts are deferred. Calls may be nested.
+        """
+        self.__bulk_load_depth += 1
+        if self.__bulk_load_depth > 1:
+            return
+
+        self.__bulk_items = []
+        self.__bulk_index_method = self.itemIndexMethod()
+        self.__bulk_signals_blocked = self.blockSignals(True)
+        self.setItemIndexMethod(QtWidgets.QGraphicsScene.ItemIndexMethod.NoIndex)
+
+    def endBulkLoad(self):
+        """
+        End a bulk load. Lays out the added nodes, builds the added connections, rebuilds the spatial index once and
+        emits itemsAdded with every item added during the load.
+        """
+        if self.__bulk_load_depth == 0:
+            raise RuntimeError("endBulkLoad called without a matching beginBulkLoad")
+
+        self.__bulk_load_depth -= 1
+        if self.__bulk_load_depth > 0:
+            return
+
+        items = self.__bulk_items
+        self.__bulk_items = []
+
+        for item in items:
+            if isinstance(item, Node):
+                item.calculateLayout()
+            elif isinstance(item, Connection):
+                self.__dirty_connections.add(item)
+
+        self.flushConnectionUpdates()
+
+        # restoring the index method rebuilds the index in a single pass.
+        self.setItemIndexMethod(self.__bulk_index_method)
+        self.blockSignals(self.__bulk_signals_blocked)
+
+        if items:
+            self.itemsAdded.emit(items)
+
+    @contextlib.contextmanager
+    def bulkLoad(self):
+        """
+        A context manager wrapping beginBulkLoad/endBulkLoad.
+        """
+        self.beginBulkLoad()
+        try:
+            yield
+        finally:
+            self.endBulkLoad()
+
+    def __registerNode(self, node: Node):
+        self.__nodes[node.uniqueId()] = node
+        self.__dirty_node_data.add(node)
+        self.__moved_ports.update(node.inputs().values())
+        self.__moved_ports.update(node.outputs().values())
+        self.updateNodeState(node)
+
+    @staticmethod
+    def __itemPorts(item: QtWidgets.QGraphicsItem) -> typing.Iterable[Port]:
+        if isinstance(item, Node):
+            return (*item.inputs().values(), *item.outputs().values())
+
+        return [c for c in item.childItems() if isinstance(c, Port)]
+
+    def __unregisterItem(self, item: QtWidgets.QGraphicsItem):
+        # any item with ports (e.g. a dot) is a vertex of the order and has its ports in the port index.
+        self.__order.discard(item)
+
+        for port in self.__itemPorts(item):
+            self.__moved_ports.discard(port)
+            self.__port_index.remove(port)
+
+        if isinstance(item, Node):
+            self.__unregisterNode(item)
+
+    def __unregisterNode(self, node: Node):
+        if self.__nodes.get(node.uniqueId()) is node:
+            del self.__nodes[node.uniqueId()]
+            self.__node_data.pop(node.uniqueId(), None)
+
+        self.__dirty_node_data.discard(node)
+        self.__moved_nodes.pop(node, None)
+
+        self.__viewed_nodes.discard(node)
+        self.__edited_nodes.discard(node)
+        self.__selected_nodes.discard(node)
+
+    def invalidateNodeData(self, node: Node):
+        """
+        Called by nodes when their serialized data changes, so the next toDict re-serializes them.
+        """
+        if self.__nodes.get(node.uniqueId()) is node:
+            self.__dirty_node_data.add(node)
+
+    def updateNodeState(self, node: Node):
+        """
+        Called by nodes when their viewed/edited/selected state changes, so the tracked sets stay in sync.
+        """
+        if self.__nodes.get(node.uniqueId()) is not node:
+            return
+
+        for tracked, state in (
+            (self.__viewed_nodes, node.isViewed()),
+            (self.__edited_nodes, node.isEdited()),
+            (self.__selected_nodes, node.isSelected()),
+        ):
+            if state:
+                tracked.add(node)
+            else:
+                tracked.discard(node)
+
+    def nodes(self) -> typing.List[Node]:
+        return list(self.__nodes.values())
+
+    def nodeById(self, unique_id: str) -> typing.Optional[Node]:
+        return self.__nodes.get(unique_id)
+
+    def nodeCount(self) -> int:
+        return len(self.__nodes)
+
+    def nodeRegistry(self) -> typing.Mapping[str, Node]:
+        """
+        A read-only view of the nodes in the scene keyed by their unique id.
+        """
+        return types.MappingProxyType(self.__nodes)
 
-    def selectedNodes(self):
-        return [n for n in self.selectedItems() if isinstance(n, Node)]
+    def viewedNodes(self) -> typing.FrozenSet[Node]:
+        return frozenset(self.__viewed_nodes)
 
-    def getConnections(self, port):
-        return self.__port_to_connections.get(port, [])
+    def editedNodes(self) -> typing.FrozenSet[Node]:
+        return frozenset(self.__edited_nodes)
+
+    def selectedNodes(self) -> typing.List[Node]:
+        return list(self.__selected_nodes)
+
+    def getConnections(self, port: Port) -> typing.List[Connection]:
+        return list(self.__adjacency.connections(port))
+
+    def iterConnections(self, port: Port = None) -> typing.Iterator[Connection]:
+        """
+        Iterate over the connections to the given port, or every connection in the scene if port is None, without
+        copying them. Connections must not be added or removed while iterating.
+        """
+        return self.__adjacency.connections(port)
+
+    def connectionCount(self, port: Port = None) -> int:
+        return self.__adjacency.connectionCount(port)
+
+    def upstreamNodes(self, node: QtWidgets.QGraphicsItem) -> typing.List:
+        """
+        The items (nodes or dots) with an output connected to one of the given items inputs.
+        """
+        return self.__adjacency.upstreamNodes(node)
+
+    def downstreamNodes(self, node: QtWidgets.QGraphicsItem) -> typing.List:
+        """
+        The items (nodes or dots) with an input connected to one of the given items outputs.
+        """
+        return self.__adjacency.downstreamNodes(node)
+
+    def wouldCreateCycle(self, output_port: Port, input_port: Port) -> bool:
+        """
+        True if connecting the given ports would create a cycle. This only searches the part of the graph between the
+        two nodes, so it is cheap enough to call on every mouse move.
+        """
+        return self.__order.wouldCreateCycle(output_port.node(), input_port.node())
 
     def addConnection(self, connection: Connection):
-        if connection.scene() is self:
+        """
+        Add the connection to the scene, raising CycleError if it would create a cycle.
+
+        Connections added while bulk loading aren't checked, the order is rebuilt once the load has finished.
+        """
+        if connection in self.__connections:
             return
 
-        super().addItem(connection)
+        if self.__bulk_load_depth:
+            self.__order.invalidate()
+        else:
+            self.__order.insertEdge(
+                connection.output_port.node(), connection.input_port.node()
+            )
 
-        self.__port_to_connections.setdefault(connection.input_port, []).append(
-            connection
-        )
-        self.__port_to_connections.setdefault(connection.output_port, []).append(
-            connection
-        )
+        if self.__connection_layer is None:
+            super().addItem(connection)
+
+        self.__adjacency.add(connection)
+        self.__connections[connection] = None
+
+        # while bulk loading the ports haven't been laid out yet, so the path is built in endBulkLoad.
+        if self.__bulk_load_depth:
+            self.__bulk_items.append(connection)
+        else:
+            self.__updateConnectionGeometry(connection)
+
+        self.connectionAdded.emit(connection)
         return connection
 
     def removeConnection(self, connection: Connection):
-        super().removeItem(connection)
-        self.__port_to_connections[connection.input_port].remove(connection)
-        self.__port_to_connections[connection.output_port].remove(connection)
+        self.__detachConnection(connection)
+        self.connectionRemoved.emit(connection)
 
+    def __detachConnection(self, connection: Connection):
+        if self.__connection_layer is None:
+            super().removeItem(connection)
+        else:
+            self.__connection_layer.removeConnection(connection)
+
+        self.__adjacency.remove(connection)
+        self.__connections.pop(connection, None)
+        self.__dirty_connections.discard(connection)
+
+    @profiled_section("updatePortConnections")
     def updatePortConnections(self, port: Port):
-        connections = {
-            connection for connection in self.__port_to_connections.get(port, [])
-        }
+        """
+        Mark the connections attached to the given port as needing their path rebuilt.
+
+        The rebuild is deferred until flushConnectionUpdates is called, either by the next event loop iteration or
+        by a view before it paints, so a connection is rebuilt once however many of its ports moved.
+        """
+        if not self.__adjacency.connectionCount(port):
+            return
+
+        self.__dirty_connections.update(self.__adjacency.connections(port))
+
+        if not self.__flush_timer.isActive():
+            self.__flush_timer.start()
+
+    def nodeMoved(self, node: Node):
+        """
+        Called by nodes when their position changes. nodesMoved is emitted once per event loop iteration with every
+        node that moved, so listeners aren't called for each step of a drag of many nodes.
+
+        Nodes positioned while bulk loading aren't reported, they are included in itemsAdded.
+        """
+        if self.__bulk_load_depth:
+            return
+
+        self.__moved_nodes[node] = None
+
+        if not self.__moved_nodes_timer.isActive():
+            self.__moved_nodes_timer.start()
+
+    def __emitNodesMoved(self):
+        moved_nodes = list(self.__moved_nodes)
+        self.__moved_nodes.clear()
+
+        if moved_nodes:
+            self.nodesMoved.emit(moved_nodes)
+
+    def portMoved(self, port: Port):
+        """
+        Called by ports when their scene position changes, so the port index can be updated before the next query.
+        """
+        self.__moved_ports.add(port)
 
-        for connection in connections:
+    def __flushPortIndex(self):
+        moved_ports = self.__moved_ports
+        self.__moved_ports = set()
+
+        for port in moved_ports:
+            if port.scene() is self:
+                pos = port.scenePos()
+                self.__port_index.insert(port, pos.x(), pos.y())
+            else:
+                self.__port_index.remove(port)
+
+    def nearestPort(
+        self,
+        pos: QtCore.QPointF,
+        radius: float,
+        predicate: typing.Callable[[Port], bool] = None,
+    ) -> typing.Optional[Port]:
+        """
+        The nearest port within radius of pos for which predicate returns True, or None.
+
+        Only the ports near pos are tested, so this costs the same however many items are in the scene.
+        """
+        if self.__moved_ports:
+            self.__flushPortIndex()
+
+        def accept(port: Port):
+            # a port removed from its item without the item leaving the scene may still be indexed.
+            return port.scene() is self and (predicate is None or predicate(port))
+
+        return self.__port_index.nearest(pos.x(), pos.y(), radius, accept)
+
+    @profiled_section("flushConnectionUpdates")
+    def flushConnectionUpdates(self):
+        """
+        Rebuild the paths of all connections marked dirty since the last flush.
+        """
+        self.__flush_timer.stop()
+
+        if not self.__dirty_connections:
+            return
+
+        dirty_connections = self.__dirty_connections
+        self.__dirty_connections = set()
+
+        for connection in dirty_connections:
+            self.__updateConnectionGeometry(connection)
+
+    def __updateConnectionGeometry(self, connection: Connection):
+        if self.__connection_layer is None:
             connection.updatePath()
+        elif connection in self.__connections:
+            # connections removed before their update was flushed mustn't be added back to the layer.
+            self.__connection_layer.addConnection(connection)
+
+    def isConnectionLayerEnabled(self) -> bool:
+        return self.__connection_layer is not None
+
+    def connectionLayer(self) -> typing.Optional[ConnectionLayer]:
+        return self.__connection_layer
+
+    def setConnectionLayerEnabled(self, enabled: bool):
+        """
+        Draw every connection with a single ConnectionLayer item rather than one item per connection.
+
+        Connections are moved between the scene and the layer, the graph itself is unchanged. The layer only draws
+        the wires that intersect the exposed rect, and its connectionAt method is used to pick individual connections,
+        so large graphs don't pay for an item, path and index entry per connection.
+        """
+        if enabled == self.isConnectionLayerEnabled():
+            return
+
+        self.flushConnectionUpdates()
+
+        if enabled:
+            self.__connection_layer = ConnectionLayer()
+            super().addItem(self.__connection_layer)
+
+            for connection in self.__connections:
+                super().removeItem(connection)
+                self.__connection_layer.addConnection(connection)
+        else:
+            super().removeItem(self.__connection_layer)
+            self.__connection_layer = None
+
+            for connection in self.__connections:
+                super().addItem(connection)
+                connection.updatePath()
 
     def toDict(self) -> SceneDataDict:
-        result = SceneDataDict(nodes={}, connections=[])
-        nodes = result["nodes"]
-        connections = result["connections"]
+        """
+        Serialize the nodes in the scene and the connections between them.
+
+        Node and connection data is cached (see NodeBase.toDict) so this only does work for nodes that changed since
+        the last call, making it cheap enough to snapshot the scene frequently. The nested dicts are shared with those
+        caches and must be treated as read-only.
+        """
+        for node in self.__dirty_node_data:
+            self.__node_data[node.uniqueId()] = node.toDict()
+        self.__dirty_node_data.clear()
+
+        nodes = self.__node_data.copy()
+        connections = []
 
-        found_connections: typing.Set[Connection] = set()
+        for connection, connection_data in self.__connections.items():
+            if connection_data is None:
+                connection_data = self.__connections[connection] = (
+                    self.__serializeConnection(connection)
+                )
 
-        for node in self.nodes():
-            nodes[node.uniqueId()] = node.toDict()
-            for port in node.inputs().values():
-                found_connections.update(self.getConnections(port))
-            for port in node.outputs().values():
-                found_connections.update(self.getConnections(port))
+            if connection_data:
+                connections.append(connection_data)
 
-        for connection in found_connections:
-            connections.append(connection.toDict())
+        return SceneDataDict(nodes=nodes, connections=connections)
 
-        return result
+    @staticmethod
+    def __serializeConnection(connection: Connection) -> ConnectionDataDict:
+        # only connections between nodes can be serialized, anything else (e.g. dots) is represented by an empty dict.
+        if not isinstance(connection.output_port.node(), Node):
+            return ConnectionDataDict()
+
+        if not isinstance(connection.input_port.node(), Node):
+            return ConnectionDataDict()
+
+        return connection.toDict()
 
     def loadDict(self, data: SceneDataDict, node_factory: "NodeFactory"):
-        nodes = {}
-        for node_id, node_data in data["nodes"].items():
-            node = nodes[node_id] = node_factory.createNode(
-                node_data["node_type"],
-                data=node_data,
-            )
-            self.addItem(node)
+        for _ in self.iterLoadDict(data, node_factory):
+            pass
+
+    def toModel(self, node_factory: "NodeFactory") -> GraphModel:
+        """
+        Return a Qt-free copy of the graph in this scene.
+        """
+        model = GraphModel()
+        model.loadDict(self.toDict(), node_factory.modelFactory())
+        return model
+
+    def loadModel(self, model: GraphModel, node_factory: "NodeFactory"):
+        """
+        Add the graph held by the given model to this scene.
+        """
+        self.loadDict(model.toDict(), node_factory)
+
+    def iterLoadDict(
+        self, data: SceneDataDict, node_factory: "NodeFactory"
+    ) -> typing.Iterator[int]:
+        """
+        Load the given data incrementally inside a bulk load, yielding the number of nodes and connections created
+        so far after each one. This lets callers spread a large load over several event loop iterations.
+
+        Closing the generator early ends the bulk load, leaving whatever has been loaded so far in the scene.
+        """
+        with self.bulkLoad():
+            count = 0
+            nodes = {}
+            for node_id, node_data in data["nodes"].items():
+                node = nodes[node_id] = node_factory.createNode(
+                    node_data["node_type"],
+                    data=node_data,
+                )
+                self.addItem(node)
+                count += 1
+                yield count
 
-        for connection_data in data["connections"]:
-            connection = Connection.fromDict(connection_data, nodes)
-            self.addConnection(connection)
+            for connection_data in data["connections"]:
+                connection = Connection.fromDict(connection_data, nodes)
+                self.addConnection(connection)
+                count += 1
+                yield count
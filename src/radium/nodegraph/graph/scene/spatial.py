@@ -0,0 +1,98 @@
+__all__ = ["SpatialHash"]
+"""
+A uniform grid of buckets for finding items near a point.
+"""
+
+import math
+import typing
+
+Cell = typing.Tuple[int, int]
+
+
+class SpatialHash:
+    """
+    Points bucketed into square cells, so finding the points within a radius only visits the cells the radius
+    overlaps, however many points there are elsewhere.
+
+    cell_size should be around the size of the radius most queries use.
+    """
+
+    def __init__(self, cell_size: float = 64.0):
+        self.__cell_size = float(cell_size)
+        self.__cells: typing.Dict[Cell, typing.Dict[typing.Any, None]] = {}
+        self.__points: typing.Dict[typing.Any, typing.Tuple[float, float, Cell]] = {}
+
+    def __len__(self):
+        return len(self.__points)
+
+    def __contains__(self, item) -> bool:
+        return item in self.__points
+
+    def __cell(self, x: float, y: float) -> Cell:
+        return math.floor(x / self.__cell_size), math.floor(y / self.__cell_size)
+
+    def insert(self, item, x: float, y: float):
+        """
+        Add the item at the given point, or move it there if it has already been added.
+        """
+        cell = self.__cell(x, y)
+
+        point = self.__points.get(item)
+        if point is not None and point[2] != cell:
+            self.__discard(item, point[2])
+
+        self.__points[item] = (x, y, cell)
+        self.__cells.setdefault(cell, {})[item] = None
+
+    def remove(self, item):
+        point = self.__points.pop(item, None)
+        if point is not None:
+            self.__discard(item, point[2])
+
+    def __discard(self, item, cell: Cell):
+        items = self.__cells[cell]
+        del items[item]
+        if not items:
+            del self.__cells[cell]
+
+    def clear(self):
+        self.__cells.clear()
+        self.__points.clear()
+
+    def query(
+        self, x: float, y: float, radius: float
+    ) -> typing.List[typing.Tuple[float, typing.Any]]:
+        """
+        The items within radius of the given point as (distance, item) pairs, nearest first.
+        """
+        min_x, min_y = self.__cell(x - radius, y - radius)
+        max_x, max_y = self.__cell(x + radius, y + radius)
+        radius_squared = radius * radius
+
+        found = []
+        for cell_x in range(min_x, max_x + 1):
+            for cell_y in range(min_y, max_y + 1):
+                for item in self.__cells.get((cell_x, cell_y), ()):
+                    item_x, item_y, _ = self.__points[item]
+                    distance_squared = (item_x - x) ** 2 + (item_y - y) ** 2
+                    if distance_squared <= radius_squared:
+                        found.append((distance_squared, id(item), item))
+
+        found.sort()
+        return [(math.sqrt(d), item) for d, _, item in found]
+
+    def nearest(
+        self,
+        x: float,
+        y: float,
+        radius: float,
+        predicate: typing.Callable[[typing.Any], bool] = None,
+    ):
+        """
+        The nearest item within radius of the given point for which predicate returns True, or None.
+        """
+        for _, item in self.query(x, y, radius):
+            if predicate is None or predicate(item):
+                return item
+
+        return None
@@ -0,0 +1,77 @@
+__all__ = ["NodeStyle", "PortStyle"]
+"""
+Shared, immutable drawing styles for nodes and ports.
+
+Items hold a reference to a style rather than their own pens, brushes and fonts, so every node of a type shares one
+set of Qt objects. Changing a single item's pen or brush replaces its reference with a modified copy, leaving the
+shared style untouched.
+"""
+
+import dataclasses
+import typing
+
+from PySide6 import QtCore, QtGui
+
+
+@dataclasses.dataclass(frozen=True, eq=False)
+class NodeStyle:
+    palette: QtGui.QPalette
+    font: QtGui.QFont
+    pen: QtGui.QPen
+    brush: QtGui.QBrush
+    edited_brush: QtGui.QBrush
+    viewed_brush: QtGui.QBrush
+    selection_pen: QtGui.QPen
+
+    # derived from font.
+    font_metrics: QtGui.QFontMetrics = dataclasses.field(init=False, repr=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "font_metrics", QtGui.QFontMetrics(self.font))
+
+    def replace(self, **changes) -> "NodeStyle":
+        """
+        A copy of this style with the given fields replaced.
+        """
+        return dataclasses.replace(self, **changes)
+
+    @classmethod
+    def default(cls) -> "NodeStyle":
+        """
+        The style shared by nodes which weren't created from a NodeType. This is created on first use, as fonts and
+        palettes need a QGuiApplication.
+        """
+        global _default_node_style
+
+        if _default_node_style is None:
+            palette = QtGui.QPalette()
+            _default_node_style = cls(
+                palette=palette,
+                font=QtGui.QFont(),
+                pen=QtGui.QPen(QtGui.QColor(24, 24, 24, 255), 4),
+                brush=QtGui.QBrush(QtGui.QColor(64, 64, 64, 255)),
+                edited_brush=QtGui.QBrush(QtGui.QColor(255, 64, 64, 255)),
+                viewed_brush=QtGui.QBrush(QtGui.QColor(64, 64, 255, 255)),
+                selection_pen=QtGui.QPen(
+                    palette.color(palette.ColorRole.Highlight),
+                    2.0,
+                    QtCore.Qt.PenStyle.DotLine,
+                ),
+            )
+
+        return _default_node_style
+
+
+@dataclasses.dataclass(frozen=True, eq=False)
+class PortStyle:
+    pen: QtGui.QPen
+    brush: typing.Union[QtGui.QBrush, QtGui.QColor]
+
+    def replace(self, **changes) -> "PortStyle":
+        """
+        A copy of this style with the given fields replaced.
+        """
+        return dataclasses.replace(self, **changes)
+
+
+_default_node_style: typing.Optional[NodeStyle] = None
@@ -1,29 +1,135 @@
-from PySide6 import QtCore, QtGui
+import math
+
+from PySide6 import QtCore, QtGui, QtWidgets
+
+# grid lines are spaced grid_size * _GRID_SUBDIVISIONS ** n apart, with every _GRID_SUBDIVISIONS-th line a major line.
+_GRID_SUBDIVISIONS = 5
+
+# the minor lines fade in as their spacing grows from _GRID_MIN_SPACING to _GRID_FADE_SPACING device pixels, any
+# closer and the next level up becomes the minor lines.
+_GRID_MIN_SPACING = 6.0
+_GRID_FADE_SPACING = _GRID_MIN_SPACING * _GRID_SUBDIVISIONS
+
+_GRID_MINOR_ALPHA = 25
+_GRID_MAJOR_ALPHA = 50
+_GRID_AXIS_COLOR = QtGui.QColor(0, 0, 0, 72)
+
+# zoom levels are rounded to one of this many buckets per doubling, each with its own cached tile.
+_GRID_BUCKET_STEPS = 4
+
+# a major cell larger than this, in device pixels, is drawn with lines instead of a tile.
+_GRID_MAX_TILE_SIZE = 512
+
+
+def grid_levels(grid_size: float, scale: float):
+    """
+    The (minor spacing, major spacing, minor alpha, major alpha) of the grid drawn at the given scale.
+    """
+    minor = float(grid_size)
+    while minor * scale < _GRID_MIN_SPACING:
+        minor *= _GRID_SUBDIVISIONS
+
+    fade = (minor * scale - _GRID_MIN_SPACING) / (
+        _GRID_FADE_SPACING - _GRID_MIN_SPACING
+    )
+    fade = min(max(fade, 0.0), 1.0)
+
+    minor_alpha = round(_GRID_MINOR_ALPHA * fade)
+    major_alpha = round(
+        _GRID_MINOR_ALPHA + (_GRID_MAJOR_ALPHA - _GRID_MINOR_ALPHA) * fade
+    )
+    return minor, minor * _GRID_SUBDIVISIONS, minor_alpha, major_alpha
+
+
+def grid_tile(grid_size: float, bucket: int, ratio: float = 1.0) -> QtGui.QPixmap:
+    """
+    A pixmap of one major grid cell drawn at the scale of the given zoom bucket, cached in the global QPixmapCache.
+    """
+    key = f"radium.grid:{grid_size}:{bucket}:{ratio}"
+    pixmap = QtGui.QPixmapCache.find(key)
+    if pixmap is not None:
+        return pixmap
+
+    scale = 2.0 ** (bucket / _GRID_BUCKET_STEPS)
+    minor, major, minor_alpha, major_alpha = grid_levels(grid_size, scale * ratio)
+    size = max(1, round(major * scale * ratio))
+
+    pixmap = QtGui.QPixmap(size, size)
+    pixmap.fill(QtCore.Qt.GlobalColor.transparent)
+
+    painter = QtGui.QPainter(pixmap)
+    painter.setPen(QtGui.QPen(QtGui.QColor(0, 0, 0, minor_alpha), 0))
+    for i in range(1, _GRID_SUBDIVISIONS):
+        pos = round(size * i / _GRID_SUBDIVISIONS)
+        painter.drawLine(pos, 0, pos, size)
+        painter.drawLine(0, pos, size, pos)
+
+    painter.setPen(QtGui.QPen(QtGui.QColor(0, 0, 0, major_alpha), 0))
+    painter.drawLine(0, 0, 0, size)
+    painter.drawLine(0, 0, size, 0)
+    painter.end()
+
+    QtGui.QPixmapCache.insert(key, pixmap)
+    return pixmap
 
 
 def draw_grid(painter, rect, grid_size):
     """
     Draw a grid in the given rect with the given grid size.
+
+    The grid's density adapts to the painter's scale: as lines get too close together they fade out and a coarser
+    level takes over. The grid is filled from a cached tile for the current zoom bucket so drawing it costs the same
+    however much of the scene is exposed. When zoomed in far enough that a tile would be too large so few lines are
+    visible that they are drawn directly.
     """
-    grid_lines = []
+    scale = QtWidgets.QStyleOptionGraphicsItem.levelOfDetailFromTransform(
+        painter.worldTransform()
+    )
+    device = painter.device()
+    ratio = device.devicePixelRatioF() if device is not None else 1.0
 
-    left = int(rect.left()) - (int(rect.left()) % grid_size)
-    top = int(rect.top()) - (int(rect.top()) % grid_size)
+    bucket = round(math.log2(max(scale, 1e-6)) * _GRID_BUCKET_STEPS)
+    bucket_scale = 2.0 ** (bucket / _GRID_BUCKET_STEPS)
+    _, major, _, _ = grid_levels(grid_size, bucket_scale * ratio)
 
-    x = left
-    while x < rect.right():
-        grid_lines.append(QtCore.QLineF(x, rect.top(), x, rect.bottom()))
-        x += grid_size
+    if major * bucket_scale * ratio <= _GRID_MAX_TILE_SIZE:
+        tile = grid_tile(grid_size, bucket, ratio)
 
-    y = top
-    while y < rect.bottom():
-        grid_lines.append(QtCore.QLineF(rect.left(), y, rect.right(), y))
-        y += grid_size
+        # map the tile's pixels onto one major cell, anchored at the scene origin so lines land on multiples of it.
+        brush = QtGui.QBrush(tile)
+        brush.setTransform(
+            QtGui.QTransform.fromScale(major / tile.width(), major / tile.height())
+        )
 
-    painter.setPen(QtGui.QPen(QtGui.QColor(0, 0, 0, 25)))
-    painter.drawLines(grid_lines)
+        painter.save()
+        painter.setRenderHint(QtGui.QPainter.RenderHint.SmoothPixmapTransform)
+        painter.fillRect(rect, brush)
+        painter.restore()
+    else:
+        _draw_grid_lines(painter, rect, grid_size, scale * ratio)
 
     # draw x and y axis
-    painter.setPen(QtGui.QPen(QtGui.QColor(0, 0, 0, 72)))
+    painter.setPen(QtGui.QPen(_GRID_AXIS_COLOR))
     painter.drawLine(0, rect.top(), 0, rect.bottom())
     painter.drawLine(rect.left(), 0, rect.right(), 0)
+
+
+def _draw_grid_lines(painter, rect, grid_size, scale):
+    minor, major, minor_alpha, major_alpha = grid_levels(grid_size, scale)
+
+    minor_lines = []
+    major_lines = []
+
+    for i in range(math.floor(rect.left() / minor), math.ceil(rect.right() / minor)):
+        lines = minor_lines if i % _GRID_SUBDIVISIONS else major_lines
+        lines.append(QtCore.QLineF(i * minor, rect.top(), i * minor, rect.bottom()))
+
+    for i in range(math.floor(rect.top() / minor), math.ceil(rect.bottom() / minor)):
+        lines = minor_lines if i % _GRID_SUBDIVISIONS else major_lines
+        lines.append(QtCore.QLineF(rect.left(), i * minor, rect.right(), i * minor))
+
+    painter.setPen(QtGui.QPen(QtGui.QColor(0, 0, 0, minor_alpha), 0))
+    painter.drawLines(minor_lines)
+
+    painter.setPen(QtGui.QPen(QtGui.QColor(0, 0, 0, major_alpha), 0))
+    painter.drawLines(major_lines)
@@ -0,0 +1,312 @@
+__all__ = ["Minimap"]
+"""
+A small overview of a NodeGraphView's scene, see NodeGraphView.setMinimapVisible.
+"""
+
+import typing
+
+from PySide6 import QtCore, QtGui, QtWidgets
+
+from radium.nodegraph.graph.scene.node import Node
+
+if typing.TYPE_CHECKING:
+    from radium.nodegraph.graph.scene import NodeGraphScene
+    from radium.nodegraph.graph.view.view import NodeGraphView
+
+
+class Minimap(QtWidgets.QWidget):
+    """
+    Draws every node in the scene as a rect in a cached image, with the view's visible rect on top. Clicking or
+    dragging centers the view on that point.
+
+    The image is patched from the scene's itemAdded, itemsAdded, itemRemoved, itemsRemoved and nodesMoved signals:
+    only the pixels a node left or entered are redrawn. It is re-rendered in full when a node moves outside the area
+    the image covers, or when too many regions are dirty at once. Painting an unchanged minimap just draws the cached
+    image.
+    """
+
+    # when more regions than this are dirty it is cheaper to redraw everything.
+    max_dirty_rects = 256
+
+    # the fraction of the nodes' bounding rect added on each side, so nodes can move a little without a full redraw.
+    margin = 0.1
+
+    def __init__(self, view: "NodeGraphView", parent=None):
+        super().__init__(parent)
+        self.setFixedSize(240, 160)
+        self.setCursor(QtCore.Qt.CursorShape.PointingHandCursor)
+
+        self.__view = view
+        self.__scene: typing.Optional["NodeGraphScene"] = None
+
+        # the scene rect each node was last drawn at.
+        self.__node_rects: typing.Dict[Node, QtCore.QRectF] = {}
+
+        # the part of the scene the image covers and the transform from scene to image coordinates.
+        self.__world = QtCore.QRectF()
+        self.__transform = QtGui.QTransform()
+
+        self.__image = QtGui.QImage()
+        self.__rebuild_required = True
+        self.__dirty_rects: typing.List[QtCore.QRectF] = []
+
+        self.__visible_rect = QtCore.QRectF()
+
+        self.__background = QtGui.QColor(0, 0, 0, 160)
+        self.__visible_rect_pen = QtGui.QPen(QtGui.QColor(255, 255, 255, 200), 1)
+
+    def scene(self) -> typing.Optional["NodeGraphScene"]:
+        return self.__scene
+
+    def setScene(self, scene: typing.Optional["NodeGraphScene"]):
+        """
+        Follow the given scene's changes. The minimap only listens while it is visible.
+        """
+        if scene is self.__scene:
+            return
+
+        if self.__scene is not None:
+            try:
+                self.__scene.itemAdded.disconnect(self.onItemAdded)
+                self.__scene.itemsAdded.disconnect(self.onItemsAdded)
+                self.__scene.itemRemoved.disconnect(self.onItemRemoved)
+                self.__scene.itemsRemoved.disconnect(self.onItemsRemoved)
+                self.__scene.nodesMoved.disconnect(self.onNodesMoved)
+                self.__scene.cleared.disconnect(self.invalidate)
+            except RuntimeError:
+                # the scene was deleted first, e.g. at shutdown, which already dropped the connections.
+                pass
+
+        self.__scene = scene
+
+        if scene is not None:
+            scene.itemAdded.connect(self.onItemAdded)
+            scene.itemsAdded.connect(self.onItemsAdded)
+            scene.itemRemoved.connect(self.onItemRemoved)
+            scene.itemsRemoved.connect(self.onItemsRemoved)
+            scene.nodesMoved.connect(self.onNodesMoved)
+            scene.cleared.connect(self.invalidate)
+
+        self.invalidate()
+
+    def invalidate(self):
+        """
+        Re-render the whole image the next time the minimap is painted.
+        """
+        self.__rebuild_required = True
+        self.__dirty_rects.clear()
+        self.update()
+
+    def setVisibleRect(self, rect: QtCore.QRectF):
+        """
+        Set the part of the scene the view is showing, this is called by the view whenever it paints.
+        """
+        if rect != self.__visible_rect:
+            self.__visible_rect = QtCore.QRectF(rect)
+            self.update()
+
+    def mapToScene(self, pos: QtCore.QPointF) -> QtCore.QPointF:
+        """
+        The scene position under the given point in widget coordinates.
+        """
+        inverted, invertible = self.__transform.inverted()
+        if not invertible:
+            return QtCore.QPointF()
+
+        return inverted.map(pos * self.devicePixelRatioF())
+
+    @QtCore.Slot(QtWidgets.QGraphicsItem)
+    def onItemAdded(self, item: QtWidgets.QGraphicsItem):
+        if isinstance(item, Node):
+            self.__updateNode(item)
+
+    @QtCore.Slot(list)
+    def onItemsAdded(self, items: list):
+        for item in items:
+            if isinstance(item, Node):
+                self.__updateNode(item)
+
+    @QtCore.Slot(QtWidgets.QGraphicsItem)
+    def onItemRemoved(self, item: QtWidgets.QGraphicsItem):
+        rect = self.__node_rects.pop(item, None)
+        if rect is not None:
+            self.__markDirty(rect)
+
+    @QtCore.Slot(list)
+    def onItemsRemoved(self, items: list):
+        for item in items:
+            self.onItemRemoved(item)
+
+    @QtCore.Slot(list)
+    def onNodesMoved(self, nodes: typing.List[Node]):
+        for node in nodes:
+            if node in self.__node_rects:
+                self.__updateNode(node)
+
+    def __updateNode(self, node: Node):
+        if self.__rebuild_required:
+            return
+
+        previous_rect = self.__node_rects.get(node)
+        if previous_rect is not None:
+            self.__markDirty(previous_rect)
+
+        rect = self.__node_rects[node] = node.sceneBoundingRect()
+        if not self.__world.contains(rect):
+            self.invalidate()
+            return
+
+        self.__markDirty(rect)
+
+    def __markDirty(self, rect: QtCore.QRectF):
+        if self.__rebuild_required:
+            return
+
+        if len(self.__dirty_rects) >= self.max_dirty_rects:
+            self.invalidate()
+            return
+
+        self.__dirty_rects.append(rect)
+        self.update()
+
+    def __imageRect(self, rect: QtCore.QRectF) -> QtCore.QRect:
+        # nodes are at least a pixel in size however far the minimap is zoomed out.
+        image_rect = self.__transform.mapRect(rect)
+        if image_rect.width() < 1.0 or image_rect.height() < 1.0:
+            image_rect.setSize(
+                QtCore.QSizeF(
+                    max(image_rect.width(), 1.0), max(image_rect.height(), 1.0)
+                )
+            )
+
+        return image_rect.toAlignedRect()
+
+    def __rebuild(self):
+        self.__rebuild_required = False
+        self.__dirty_rects.clear()
+
+        ratio = self.devicePixelRatioF()
+        self.__image = QtGui.QImage(
+            self.size() * ratio, QtGui.QImage.Format.Format_ARGB32_Premultiplied
+        )
+
+        nodes = self.__scene.nodes() if self.__scene is not None else []
+        self.__node_rects = {node: node.sceneBoundingRect() for node in nodes}
+
+        world = QtCore.QRectF()
+        for rect in self.__node_rects.values():
+            world = world.united(rect)
+
+        if world.isEmpty():
+            world = QtCore.QRectF(self.__visible_rect)
+
+        if world.isEmpty():
+            world = QtCore.QRectF(-500, -500, 1000, 1000)
+
+        world = world.adjusted(
+            -world.width() * self.margin,
+            -world.height() * self.margin,
+            world.width() * self.margin,
+            world.height() * self.margin,
+        )
+
+        # keep the aspect ratio of the scene by growing the world to fit the widget.
+        width, height = self.width() * ratio, self.height() * ratio
+        scale = min(width / world.width(), height / world.height())
+        center = world.center()
+        world.setSize(QtCore.QSizeF(width / scale, height / scale))
+        world.moveCenter(center)
+
+        self.__world = world
+        self.__transform = QtGui.QTransform.fromScale(scale, scale).translate(
+            -world.left(), -world.top()
+        )
+
+        self.__image.fill(QtCore.Qt.GlobalColor.transparent)
+
+        painter = QtGui.QPainter(self.__image)
+        for node, rect in self.__node_rects.items():
+            painter.fillRect(self.__imageRect(rect), node.brush())
+        painter.end()
+
+    def __patch(self):
+        dirty_rects = self.__dirty_rects
+        self.__dirty_rects = []
+
+        painter = QtGui.QPainter(self.__image)
+        inverted, _ = self.__transform.inverted()
+
+        for rect in dirty_rects:
+            image_rect = self.__imageRect(rect)
+
+            painter.setClipRect(image_rect)
+            painter.setCompositionMode(
+                QtGui.QPainter.CompositionMode.CompositionMode_Source
+            )
+            painter.fillRect(image_rect, QtCore.Qt.GlobalColor.transparent)
+            painter.setCompositionMode(
+                QtGui.QPainter.CompositionMode.CompositionMode_SourceOver
+            )
+
+            # redraw every node which covers any of the cleared pixels, including those a moved node was hiding. the
+            # rect is grown by a pixel to catch nodes that were padded out to a whole pixel by __imageRect.
+            scene_rect = inverted.mapRect(
+                QtCore.QRectF(image_rect).adjusted(-1.0, -1.0, 1.0, 1.0)
+            )
+            for item in self.__scene.items(
+                scene_rect,
+                QtCore.Qt.ItemSelectionMode.IntersectsItemBoundingRect,
+                QtCore.Qt.SortOrder.AscendingOrder,
+            ):
+                if item in self.__node_rects:
+                    painter.fillRect(
+                        self.__imageRect(item.sceneBoundingRect()), item.brush()
+                    )
+
+        painter.end()
+
+    def paintEvent(self, event: QtGui.QPaintEvent):
+        if (
+            self.__rebuild_required
+            or self.__image.size() != self.size() * self.devicePixelRatioF()
+        ):
+            self.__rebuild()
+        elif self.__dirty_rects:
+            self.__patch()
+
+        painter = QtGui.QPainter(self)
+        painter.fillRect(self.rect(), self.__background)
+        painter.drawImage(QtCore.QRectF(self.rect()), self.__image)
+
+        ratio = self.devicePixelRatioF()
+        visible_rect = self.__transform.mapRect(self.__visible_rect)
+        painter.setPen(self.__visible_rect_pen)
+        painter.setBrush(QtCore.Qt.BrushStyle.NoBrush)
+        painter.drawRect(
+            QtCore.QRectF(
+                visible_rect.topLeft() / ratio, visible_rect.bottomRight() / ratio
+            )
+        )
+        painter.end()
+
+    def mousePressEvent(self, event: QtGui.QMouseEvent):
+        if event.button() == QtCore.Qt.MouseButton.LeftButton:
+            self.__jumpTo(event.position())
+            event.accept()
+
+    def mouseMoveEvent(self, event: QtGui.QMouseEvent):
+        if event.buttons() & QtCore.Qt.MouseButton.LeftButton:
+            self.__jumpTo(event.position())
+            event.accept()
+
+    def __jumpTo(self, pos: QtCore.QPointF):
+        self.__view.centerOn(self.mapToScene(pos))
+
+    def showEvent(self, event: QtGui.QShowEvent):
+        self.setScene(self.__view.scene())
+        super().showEvent(event)
+
+    def hideEvent(self, event: QtGui.QHideEvent):
+        # stop listening, the whole image is re-rendered when shown again.
+        self.setScene(None)
+        super().hideEvent(event)
@@ -1,15 +1,90 @@
+import time
+import typing
+
 from PySide6 import QtCore, QtWidgets, QtGui, QtOpenGLWidgets
 from radium.nodegraph.graph import util
+from radium.nodegraph.graph.scene.connection import Connection
+from radium.nodegraph.graph.scene.connection_layer import ConnectionLayer
+from radium.nodegraph.graph.scene.node import Node
+from radium.nodegraph.graph.scene.port import Port
+from radium.nodegraph.graph.scene.profiling import PaintProfiler
 
+from radium.nodegraph.graph.view.minimap import Minimap
 from radium.nodegraph.graph.view.event_filter import (
     NavigationEventFilter,
     DragDropEventFilter,
 )
 
+# the scene signals after which the batches drawn by NodeGraphView.paintLowDetail are out of date.
+_LOW_DETAIL_SIGNALS = (
+    "itemAdded",
+    "itemsAdded",
+    "itemRemoved",
+    "itemsRemoved",
+    "nodesMoved",
+    "connectionAdded",
+    "connectionRemoved",
+    "selectionChanged",
+    "cleared",
+)
+
+
+class _LowDetailGeometry:
+    """
+    The items in a region of the scene, batched for NodeGraphView.paintLowDetail.
+    """
+
+    def __init__(self, scene: QtWidgets.QGraphicsScene, rect: QtCore.QRectF):
+        self.rect = rect
+        self.rects_by_color: typing.Dict[int, typing.List[QtCore.QRectF]] = {}
+        self.selected_rects: typing.List[QtCore.QRectF] = []
+        self.lines: typing.List[QtCore.QLineF] = []
+        self.below: typing.List[QtWidgets.QGraphicsItem] = []
+        self.above: typing.List[QtWidgets.QGraphicsItem] = []
+
+        items = scene.items(
+            rect,
+            QtCore.Qt.ItemSelectionMode.IntersectsItemBoundingRect,
+            QtCore.Qt.SortOrder.AscendingOrder,
+        )
+
+        for item in items:
+            if isinstance(item, Node):
+                if item.isSelected():
+                    self.selected_rects.append(item.sceneBoundingRect())
+                else:
+                    color = item.brush().color().rgba()
+                    self.rects_by_color.setdefault(color, []).append(
+                        item.sceneBoundingRect()
+                    )
+            elif isinstance(item, Connection):
+                self.lines.append(
+                    QtCore.QLineF(
+                        item.output_port.scenePos(), item.input_port.scenePos()
+                    )
+                )
+            elif isinstance(item, ConnectionLayer):
+                for connection in item.connectionsIn(rect):
+                    self.lines.append(
+                        QtCore.QLineF(
+                            connection.output_port.scenePos(),
+                            connection.input_port.scenePos(),
+                        )
+                    )
+            elif not isinstance(item, Port) and item.parentItem() is None:
+                if item.isVisible():
+                    if item.zValue() < 0:
+                        self.below.append(item)
+                    else:
+                        self.above.append(item)
+
 
 class NodeGraphView(QtWidgets.QGraphicsView):
     createNodeRequested = QtCore.Signal(str, QtCore.QPointF)
 
+    # below this level of detail nodes are drawn as plain rects and connections as straight lines, see paintLowDetail.
+    low_detail_threshold = 0.25
+
     def __init__(self, parent=None):
         super().__init__(parent=parent)
         self.setTransformationAnchor(self.ViewportAnchor.AnchorUnderMouse)
@@ -30,21 +105,313 @@ class NodeGraphView(QtWidgets.QGraphicsView):
         self.__hovered_item = None
         self.__node_creation_pos = QtCore.QPointF(0, 0)
 
+        self.__low_detail_geometry: typing.Optional[_LowDetailGeometry] = None
+        self.__connection_pen = QtGui.QPen(QtGui.QColor(0, 0, 0), 0)
+        self.__selected_brush = QtGui.QBrush(
+            self.palette().color(self.palette().ColorRole.Highlight)
+        )
+
+        # see setProfilingEnabled. the overlay is refreshed on a timer rather than every frame, so it doesn't cause
+        # the repaints it is measuring.
+        self.__profiler = PaintProfiler()
+        self.__profiler_overlay_visible = False
+        self.__profiler_overlay_rect = QtCore.QRect()
+        self.__profiler_overlay_timer = QtCore.QTimer(self)
+        self.__profiler_overlay_timer.setInterval(500)
+        self.__profiler_overlay_timer.timeout.connect(self.onProfilerOverlayTimeout)
+
+        # created the first time it is shown, see setMinimapVisible.
+        self.__minimap: typing.Optional[Minimap] = None
+
     def onNodeTypeDropped(self, node_type: str):
         cursor = QtGui.QCursor.pos()
         scene_pos = self.mapToScene(self.mapFromGlobal(cursor))
         self.createNodeRequested.emit(node_type, scene_pos)
 
+    def paintEvent(self, event: QtGui.QPaintEvent) -> None:
+        # repaints of just the overlay aren't counted as frames.
+        profiling = self.__profiler.isEnabled() and not (
+            self.__profiler_overlay_visible
+            and self.__profiler_overlay_rect.contains(event.rect())
+        )
+
+        if profiling:
+            self.__profiler.beginFrame()
+
+        try:
+            # make sure any connections invalidated by moving ports are up-to-date before they are drawn.
+            scene = self.scene()
+            if hasattr(scene, "flushConnectionUpdates"):
+                scene.flushConnectionUpdates()  # noqa
+
+            if self.isLowDetail():
+                self.paintLowDetail(event)
+            else:
+                super().paintEvent(event)
+        finally:
+            if profiling:
+                self.__profiler.endFrame()
+
+        if self.__profiler_overlay_visible:
+            self.paintProfilerOverlay(event)
+
+        if self.__minimap is not None and self.__minimap.isVisible():
+            self.__minimap.setVisibleRect(
+                self.mapToScene(self.viewport().rect()).boundingRect()
+            )
+
+    def minimap(self) -> typing.Optional[Minimap]:
+        return self.__minimap
+
+    def isMinimapVisible(self) -> bool:
+        return self.__minimap is not None and self.__minimap.isVisible()
+
+    def setMinimapVisible(self, visible: bool):
+        """
+        Show an overview of the scene in the bottom right corner of the view, see Minimap.
+        """
+        if self.__minimap is None:
+            if not visible:
+                return
+
+            self.__minimap = Minimap(self, parent=self)
+
+        self.__minimap.setVisible(visible)
+        self.__positionMinimap()
+        self.viewport().update()
+
+    def __positionMinimap(self):
+        if self.__minimap is None:
+            return
+
+        margin = 12
+        viewport_rect = self.viewport().geometry()
+        self.__minimap.move(
+            viewport_rect.right() - self.__minimap.width() - margin,
+            viewport_rect.bottom() - self.__minimap.height() - margin,
+        )
+
+    def resizeEvent(self, event: QtGui.QResizeEvent):
+        super().resizeEvent(event)
+        self.__positionMinimap()
+
+    def profiler(self) -> PaintProfiler:
+        return self.__profiler
+
+    def isProfilingEnabled(self) -> bool:
+        return self.__profiler.isEnabled()
+
+    def setProfilingEnabled(self, enabled: bool):
+        """
+        Record frame times, the items painted each frame and the time spent painting each kind of item, see
+        profiler(). The cost is a couple of perf_counter calls per item painted, so it can be left on.
+        """
+        self.__profiler.setEnabled(enabled)
+
+        if not enabled:
+            self.setProfilerOverlayVisible(False)
+
+    def isProfilerOverlayVisible(self) -> bool:
+        return self.__profiler_overlay_visible
+
+    def setProfilerOverlayVisible(self, visible: bool):
+        """
+        Show a summary of the profiler's stats in the top left of the view. This enables profiling.
+        """
+        if visible:
+            self.setProfilingEnabled(True)
+            self.__profiler_overlay_timer.start()
+        else:
+            self.__profiler_overlay_timer.stop()
+
+        self.__profiler_overlay_visible = visible
+        self.viewport().update()
+
+    @QtCore.Slot()
+    def onProfilerOverlayTimeout(self):
+        self.viewport().update(self.__profiler_overlay_rect)
+
+    def profilerOverlayText(self) -> str:
+        stats = self.__profiler.stats()
+        frame_time = stats["frame_time_ms"]
+        items = stats["items_per_frame"]
+
+        lines = [
+            f"frame  p50 {frame_time['p50']:.2f}ms  p95 {frame_time['p95']:.2f}ms",
+            f"items  p50 {items['p50']}  p95 {items['p95']}",
+        ]
+
+        for group in ("paint", "sections"):
+            for name, total in stats[group].items():
+                lines.append(
+                    f"{name}  {total['calls']} x {total['mean_us']:.1f}us = {total['total_ms']:.1f}ms"
+                )
+
+        return "\n".join(lines)
+
+    def paintProfilerOverlay(self, event: QtGui.QPaintEvent):
+        text = self.profilerOverlayText()
+
+        painter = QtGui.QPainter(self.viewport())
+        painter.setFont(
+            QtGui.QFontDatabase.systemFont(QtGui.QFontDatabase.SystemFont.FixedFont)
+        )
+
+        rect = painter.fontMetrics().boundingRect(
+            QtCore.QRect(0, 0, 2000, 2000), QtCore.Qt.AlignmentFlag.AlignLeft, text
+        )
+        rect = rect.translated(12, 12)
+        background = rect.adjusted(-4, -4, 4, 4)
+
+        # the rect may have grown since the last frame, make sure the next refresh covers all of it.
+        self.__profiler_overlay_rect = background.united(self.__profiler_overlay_rect)
+
+        painter.setClipRect(event.rect())
+        painter.fillRect(background, QtGui.QColor(0, 0, 0, 160))
+        painter.setPen(QtGui.QColor(255, 255, 255))
+        painter.drawText(rect, QtCore.Qt.AlignmentFlag.AlignLeft, text)
+        painter.end()
+
+    def levelOfDetail(self) -> float:
+        return QtWidgets.QStyleOptionGraphicsItem.levelOfDetailFromTransform(
+            self.transform()
+        )
+
+    def isLowDetail(self) -> bool:
+        return (
+            self.scene() is not None
+            and self.levelOfDetail() < self.low_detail_threshold
+        )
+
+    def paintLowDetail(self, event: QtGui.QPaintEvent):
+        """
+        Draw the exposed part of the scene without calling each node's or connection's paint method.
+
+        Nodes are batched into one drawRects call per brush and connections into a single drawLines call. Any other
+        top level items e.g. backdrops are drawn as normal, ports aren't drawn at all. The batches are built for a
+        margin around the exposed rect and kept until something in that region changes, so panning and zooming
+        don't revisit every item. See invalidateLowDetail.
+        """
+        exposed = self.mapToScene(event.rect()).boundingRect()
+
+        geometry = self.__low_detail_geometry
+        if geometry is None or not geometry.rect.contains(exposed):
+            margin_x = exposed.width() * 0.5
+            margin_y = exposed.height() * 0.5
+            geometry = self.__low_detail_geometry = _LowDetailGeometry(
+                self.scene(), exposed.adjusted(-margin_x, -margin_y, margin_x, margin_y)
+            )
+
+        painter = QtGui.QPainter(self.viewport())
+        painter.setClipRect(event.rect())
+        painter.setTransform(self.viewportTransform())
+
+        self.drawBackground(painter, exposed)
+
+        self.__paintItems(painter, geometry.below)
+
+        painter.setPen(self.__connection_pen)
+        painter.drawLines(geometry.lines)
+
+        painter.setPen(QtCore.Qt.PenStyle.NoPen)
+        for color, rects in geometry.rects_by_color.items():
+            painter.setBrush(QtGui.QColor.fromRgba(color))
+            painter.drawRects(rects)
+
+        painter.setBrush(self.__selected_brush)
+        painter.drawRects(geometry.selected_rects)
+
+        self.__paintItems(painter, geometry.above)
+
+        self.drawForeground(painter, exposed)
+        painter.end()
+
+        self.__paintRubberBand()
+
+    def __paintRubberBand(self):
+        # QGraphicsView.paintEvent draws the rubber band, paintLowDetail has to do the same.
+        rect = self.rubberBandRect()
+        if self.dragMode() != self.DragMode.RubberBandDrag or rect.isEmpty():
+            return
+
+        option = QtWidgets.QStyleOptionRubberBand()
+        option.initFrom(self.viewport())
+        option.rect = rect
+        option.shape = QtWidgets.QRubberBand.Shape.Rectangle
+
+        painter = QtGui.QPainter(self.viewport())
+        mask = QtWidgets.QStyleHintReturnMask()
+        style = self.style()
+        if style.styleHint(
+            QtWidgets.QStyle.StyleHint.SH_RubberBand_Mask, option, self.viewport(), mask
+        ):
+            painter.setClipRegion(mask.region, QtCore.Qt.ClipOperation.IntersectClip)
+
+        style.drawControl(
+            QtWidgets.QStyle.ControlElement.CE_RubberBand,
+            option,
+            painter,
+            self.viewport(),
+        )
+        painter.end()
+
+    def invalidateLowDetail(self, *args):
+        """
+        Drop the batches built by paintLowDetail, they are rebuilt the next time the view paints at low detail.
+        """
+        if self.__low_detail_geometry is None:
+            return
+
+        self.__low_detail_geometry = None
+        if self.isLowDetail():
+            self.viewport().update()
+
+    def setScene(self, scene: QtWidgets.QGraphicsScene):
+        # the scene's changed signal isn't used, once anything listens to it qt stops updating views directly from
+        # the items which changed, which slows down painting at every zoom level.
+        previous_scene = self.scene()
+        if previous_scene is not None:
+            for name in _LOW_DETAIL_SIGNALS:
+                if hasattr(previous_scene, name):
+                    getattr(previous_scene, name).disconnect(self.invalidateLowDetail)
+
+        super().setScene(scene)
+        self.__low_detail_geometry = None
+
+        if self.isMinimapVisible():
+            self.__minimap.setScene(scene)
+
+        if scene is not None:
+            for name in _LOW_DETAIL_SIGNALS:
+                if hasattr(scene, name):
+                    getattr(scene, name).connect(self.invalidateLowDetail)
+
+    def __paintItems(self, painter: QtGui.QPainter, items):
+        option = QtWidgets.QStyleOptionGraphicsItem()
+        for item in items:
+            painter.save()
+            painter.setTransform(item.sceneTransform(), combine=True)
+            option.exposedRect = item.boundingRect()
+            item.paint(painter, option, self.viewport())
+            painter.restore()
+
     def drawBackground(self, painter: QtGui.QPainter, rect: QtCore.QRectF) -> None:
         """
         Fill in the background of the graph, and draw a grid.
         """
+        profiling = self.__profiler.isEnabled()
+        if profiling:
+            start = time.perf_counter()
+
         super().drawBackground(painter, rect)
         painter.setPen(QtCore.Qt.PenStyle.NoPen)
         painter.setBrush(self.palette().brush(self.palette().ColorRole.Dark))
         painter.drawRect(rect)
         util.draw_grid(painter, rect, 20)
 
+        if profiling:
+            self.__profiler.recordSection("drawBackground", time.perf_counter() - start)
+
     def installEventFilter(self, filterObj):
         if isinstance(filterObj, NavigationEventFilter):
             print(
@@ -17,8 +17,10 @@ class ParameterEditorController(QtCore.QObject):
         self.undo_stack = undo_stack
         self.__node_id_to_widget = {}
 
-    def onEditorValueChanged(self, parameter: Parameter, value: typing.Any):
-        cmd = ChangeParameterCommand(parameter, value)
+    def onEditorValueChanged(
+        self, node: "Node", parameter: Parameter, value: typing.Any
+    ):
+        cmd = ChangeParameterCommand(node, parameter.name(), value)
         self.undo_stack.push(cmd)
 
     def attachView(self, view: "ParameterEditorView"):
@@ -39,15 +41,38 @@ class ParameterEditorController(QtCore.QObject):
 
 
 class ChangeParameterCommand(QtGui.QUndoCommand):
-    def __init__(self, parameter: Parameter, value: typing.Any, parent=None):
+    """
+    Set the value of one of a node's parameters.
+
+    The node is looked up by unique id rather than held directly, so the command keeps working after another command
+    has removed the node and rebuilt it with new Parameter objects.
+    """
+
+    def __init__(self, node: "Node", name: str, value: typing.Any, parent=None):
         super().__init__(parent)
-        self.setText(f"set: {parameter.name()}")
-        self.parameter = parameter
-        self.old_value = parameter.value()
+        self.setText(f"set: {name}")
+        self.scene = node.scene()
+        self.node_id = node.uniqueId()
+        self.name = name
+        self.old_value = node.parameters()[name].value()
         self.value = value
 
+    def parameter(self) -> typing.Optional[Parameter]:
+        if self.scene is None:
+            return None
+
+        node = self.scene.nodeById(self.node_id)
+        if node is None:
+            return None
+
+        return node.parameters().get(self.name)
+
     def redo(self):
-        self.parameter.setValue(self.value)
+        parameter = self.parameter()
+        if parameter is not None:
+            parameter.setValue(self.value)
 
     def undo(self):
-        self.parameter.setValue(self.old_value)
+        parameter = self.parameter()
+        if parameter is not None:
+            parameter.setValue(self.old_value)
@@ -9,7 +9,8 @@ if typing.TYPE_CHECKING:
 
 
 class ParameterEditorView(QtWidgets.QWidget):
-    editorValueChanged = QtCore.Signal(Parameter, object)
+    # the node owning the parameter, the parameter and the new value.
+    editorValueChanged = QtCore.Signal(object, Parameter, object)
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -45,7 +46,7 @@ class ParameterEditorView(QtWidgets.QWidget):
             widget.setup(parameter)
 
             widget.valueChanged.connect(
-                lambda v, p=parameter: self.editorValueChanged.emit(p, v)
+                lambda v, p=parameter: self.editorValueChanged.emit(node, p, v)
             )
 
             parameter.valueChanged.subscribe(widget.onParameterChanged)
@@ -0,0 +1,330 @@
+"""
+A compact, versioned binary container for SceneDataDict.
+
+The JSON representation repeats every node type, port name, datatype and parameter metadata dict for every node. This
+format stores each distinct string once in a string table and refers to it by index from fixed-width records.
+
+Layout (little endian)::
+
+    header      magic: 4s, version: H, flags: H
+    sections    STRINGS, NODES, PORTS, PARAMETERS, CONNECTIONS
+
+Each section is a block prefixed with its raw and stored size (I, I). When FLAG_COMPRESSED is set each block is zlib
+compressed independently.
+
+Records:
+
+    STRINGS      count: I, byte lengths: I * count, utf-8 data
+    NODES        key, node_type, name, unique_id: I, x, y: d, inputs, outputs, parameters: I
+    PORTS        key, name, datatype: I  (each node's inputs then outputs, in node order)
+    PARAMETERS   key, name, datatype, value, default, metadata: I  (in node order)
+    CONNECTIONS  output_node: I (node record index), output_port: I, input_node: I, input_port: I
+
+Parameter values, defaults and metadata are stored as interned JSON strings, so they must be JSON serializable just
+as they are for the JSON format.
+"""
+
+import array
+import json
+import struct
+import sys
+import typing
+import zlib
+
+if typing.TYPE_CHECKING:
+    from radium.model.graph import SceneDataDict
+
+__all__ = ["MAGIC", "VERSION", "dumps", "loads", "dump", "load", "is_binary"]
+
+MAGIC = b"RDMG"
+VERSION = 1
+
+FLAG_COMPRESSED = 0x1
+
+_HEADER = struct.Struct("<4sHH")
+_BLOCK = struct.Struct("<II")
+_NODE = struct.Struct("<IIIIddIII")
+_PORT = struct.Struct("<III")
+_PARAMETER = struct.Struct("<IIIIII")
+_CONNECTION = struct.Struct("<IIII")
+
+
+def is_binary(prefix: bytes) -> bool:
+    """
+    Return True if the given leading bytes of a file belong to this format.
+    """
+    return prefix[: len(MAGIC)] == MAGIC
+
+
+def dumps(data: "SceneDataDict", compress: bool = True, level: int = 6) -> bytes:
+    """
+    Encode scene data to bytes.
+    """
+    strings: typing.Dict[str, int] = {}
+    intern = strings.setdefault
+
+    def intern_json(value):
+        return intern(json.dumps(value, separators=(",", ":")), len(strings))
+
+    node_indices: typing.Dict[str, int] = {}
+    nodes = []
+    ports = []
+    parameters = []
+
+    for key, node in data["nodes"].items():
+        node_indices[key] = len(nodes)
+        x, y = node["position"]
+
+        for port_key, port in node["inputs"].items():
+            ports.append(
+                _PORT.pack(
+                    intern(port_key, len(strings)),
+                    intern(port["name"], len(strings)),
+                    intern(port["datatype"], len(strings)),
+                )
+            )
+
+        for port_key, port in node["outputs"].items():
+            ports.append(
+                _PORT.pack(
+                    intern(port_key, len(strings)),
+                    intern(port["name"], len(strings)),
+                    intern(port["datatype"], len(strings)),
+                )
+            )
+
+        for parameter_key, parameter in node["parameters"].items():
+            parameters.append(
+                _PARAMETER.pack(
+                    intern(parameter_key, len(strings)),
+                    intern(parameter["name"], len(strings)),
+                    intern_json(parameter["datatype"]),
+                    intern_json(parameter["value"]),
+                    intern_json(parameter["default"]),
+                    intern_json(parameter["metadata"]),
+                )
+            )
+
+        nodes.append(
+            _NODE.pack(
+                intern(key, len(strings)),
+                intern(node["node_type"], len(strings)),
+                intern(node["name"], len(strings)),
+                intern(node["unique_id"], len(strings)),
+                x,
+                y,
+                len(node["inputs"]),
+                len(node["outputs"]),
+                len(node["parameters"]),
+            )
+        )
+
+    connections = []
+    for connection in data["connections"]:
+        connections.append(
+            _CONNECTION.pack(
+                node_indices[connection["output_node"]],
+                intern(connection["output_port"], len(strings)),
+                node_indices[connection["input_node"]],
+                intern(connection["input_port"], len(strings)),
+            )
+        )
+
+    encoded = [s.encode("utf-8") for s in strings]
+    lengths = array.array("I", (len(s) for s in encoded))
+    if sys.byteorder != "little":
+        lengths.byteswap()
+
+    sections = (
+        struct.pack("<I", len(encoded)) + lengths.tobytes() + b"".join(encoded),
+        struct.pack("<I", len(nodes)) + b"".join(nodes),
+        struct.pack("<I", len(ports)) + b"".join(ports),
+        struct.pack("<I", len(parameters)) + b"".join(parameters),
+        struct.pack("<I", len(connections)) + b"".join(connections),
+    )
+
+    flags = FLAG_COMPRESSED if compress else 0
+    chunks = [_HEADER.pack(MAGIC, VERSION, flags)]
+
+    for section in sections:
+        stored = zlib.compress(section, level) if compress else section
+        chunks.append(_BLOCK.pack(len(section), len(stored)))
+        chunks.append(stored)
+
+    return b"".join(chunks)
+
+
+def loads(buffer: bytes) -> "SceneDataDict":
+    """
+    Decode scene data from bytes produced by dumps, raising ValueError if the buffer is not a valid radium graph.
+    """
+    view = memoryview(buffer)
+
+    if len(view) < _HEADER.size:
+        raise ValueError("buffer is too small to contain a radium graph")
+
+    magic, version, flags = _HEADER.unpack_from(view, 0)
+    if magic != MAGIC:
+        raise ValueError("buffer is not a radium binary graph")
+
+    if version != VERSION:
+        raise ValueError(f"unsupported radium binary graph version: {version}")
+
+    offset = _HEADER.size
+    sections = []
+
+    for _ in range(5):
+        if offset + _BLOCK.size > len(view):
+            raise ValueError("radium binary graph is truncated")
+
+        raw_size, stored_size = _BLOCK.unpack_from(view, offset)
+        offset += _BLOCK.size
+        stored = view[offset : offset + stored_size]
+        offset += stored_size
+
+        if len(stored) != stored_size:
+            raise ValueError("radium binary graph is truncated")
+
+        try:
+            section = zlib.decompress(stored) if flags & FLAG_COMPRESSED else stored
+        except zlib.error as e:
+            raise ValueError(f"radium binary graph is corrupt: {e}") from e
+
+        if len(section) != raw_size:
+            raise ValueError("radium binary graph section has an unexpected size")
+
+        sections.append(memoryview(section))
+
+    # the sections are complete, so anything going wrong from here on means their contents are corrupt.
+    try:
+        return _decode(sections)
+    except (
+        struct.error,
+        IndexError,
+        KeyError,
+        TypeError,
+        UnicodeDecodeError,
+        json.JSONDecodeError,
+    ) as e:
+        raise ValueError(f"radium binary graph is corrupt: {e}") from e
+
+
+def _decode(sections: typing.List[memoryview]) -> "SceneDataDict":
+    strings = _read_strings(sections[0])
+    values: typing.Dict[int, typing.Any] = {}
+
+    def value(index):
+        try:
+            return values[index]
+        except KeyError:
+            pass
+
+        decoded = json.loads(strings[index])
+
+        # containers are decoded on every access so that nodes never share mutable values.
+        if not isinstance(decoded, (list, dict)):
+            values[index] = decoded
+
+        return decoded
+
+    node_records = _read_records(_NODE, sections[1])
+    ports = _read_records(_PORT, sections[2])
+    parameters = _read_records(_PARAMETER, sections[3])
+    connection_records = _read_records(_CONNECTION, sections[4])
+
+    nodes = {}
+    node_keys = []
+    port_cursor = 0
+    parameter_cursor = 0
+
+    for key, node_type, name, unique_id, x, y, n_in, n_out, n_param in node_records:
+        inputs = {}
+        for port_key, port_name, datatype in ports[port_cursor : port_cursor + n_in]:
+            inputs[strings[port_key]] = {
+                "datatype": strings[datatype],
+                "name": strings[port_name],
+            }
+        port_cursor += n_in
+
+        outputs = {}
+        for port_key, port_name, datatype in ports[port_cursor : port_cursor + n_out]:
+            outputs[strings[port_key]] = {
+                "datatype": strings[datatype],
+                "name": strings[port_name],
+            }
+        port_cursor += n_out
+
+        node_parameters = {}
+        for record in parameters[parameter_cursor : parameter_cursor + n_param]:
+            p_key, p_name, p_datatype, p_value, p_default, p_metadata = record
+            node_parameters[strings[p_key]] = {
+                "name": strings[p_name],
+                "datatype": value(p_datatype),
+                "value": value(p_value),
+                "default": value(p_default),
+                "metadata": value(p_metadata),
+            }
+        parameter_cursor += n_param
+
+        node_keys.append(strings[key])
+        nodes[strings[key]] = {
+            "node_type": strings[node_type],
+            "name": strings[name],
+            "position": [x, y],
+            "unique_id": strings[unique_id],
+            "inputs": inputs,
+            "outputs": outputs,
+            "parameters": node_parameters,
+        }
+
+    connections = [
+        {
+            "output_node": node_keys[output_node],
+            "output_port": strings[output_port],
+            "input_node": node_keys[input_node],
+            "input_port": strings[input_port],
+        }
+        for output_node, output_port, input_node, input_port in connection_records
+    ]
+
+    return {"nodes": nodes, "connections": connections}
+
+
+def dump(data: "SceneDataDict", f: typing.BinaryIO, compress: bool = True):
+    f.write(dumps(data, compress=compress))
+
+
+def load(f: typing.BinaryIO) -> "SceneDataDict":
+    return loads(f.read())
+
+
+def _read_strings(section: memoryview) -> typing.List[str]:
+    (count,) = struct.unpack_from("<I", section, 0)
+    offset = 4 + count * 4
+    if offset > len(section):
+        raise ValueError("radium binary graph string table is truncated")
+
+    lengths = array.array("I")
+    lengths.frombytes(section[4:offset])
+    if sys.byteorder != "little":
+        lengths.byteswap()
+
+    if offset + sum(lengths) > len(section):
+        raise ValueError("radium binary graph string table is truncated")
+
+    strings = []
+    for length in lengths:
+        strings.append(str(section[offset : offset + length], "utf-8"))
+        offset += length
+
+    return strings
+
+
+def _read_records(record: struct.Struct, section: memoryview) -> typing.List[tuple]:
+    (count,) = struct.unpack_from("<I", section, 0)
+    data = section[4 : 4 + count * record.size]
+
+    if len(data) != count * record.size:
+        raise ValueError("radium binary graph section is truncated")
+
+    return list(record.iter_unpack(data))